@@ -0,0 +1,228 @@
+"""
+Benchmark suite for the design, impedance, Gerber and export hot paths.
+
+Times every benchmark over representative bands and substrates and writes
+the results as JSON. With --compare, the run is checked against an earlier
+results file and exits with status 1 when any benchmark got slower by more
+than --threshold percent.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --output current.json --compare baseline.json --threshold 15
+    python benchmarks/run_benchmarks.py --filter gerber --quick
+
+Timings are seconds per call. The comparison uses the fastest repeat
+(--metric min) by default, which is the least noisy statistic.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Representative designs: low, mid and high band on common substrates
+CASES = (
+    ('GPS_L1', 'FR4', 1.6),
+    ('WIFI_2_4GHZ', 'ROGERS_RO4003C', 0.813),
+    ('UWB', 'ALUMINA', 0.635),
+)
+ENGINES = ('quad', 'fast')
+DEFAULT_THRESHOLD = 20.0
+
+
+def case_inputs():
+    from patch_antenna import get_frequency, get_material
+
+    for band, material, thickness_mm in CASES:
+        yield '{}-{}'.format(band, material), get_frequency(band), \
+            get_material(material).dielectric_constant, thickness_mm / 1000
+
+
+def import_time(module, repeat=5):
+    """Fastest cumulative import time of module in a fresh interpreter, in seconds"""
+    best = None
+    for _ in range(repeat):
+        stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                                cwd=ROOT, capture_output=True, text=True, check=True).stderr
+        for line in stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) != 3 or fields[2].strip() != module:
+                continue
+            try:
+                micros = int(fields[1])
+            except ValueError:
+                continue
+            best = micros if best is None else min(best, micros)
+    if best is None:
+        raise RuntimeError('No -X importtime entry for module {}'.format(module))
+    return best / 1e6
+
+
+def benchmarks():
+    """Yield (name, callable) pairs for every timed hot path"""
+    import numpy as np
+    import patch_antenna as pa
+    from patch_antenna.export import format_design_summary, format_manufacturing_notes
+
+    for label, freq, er, h in case_inputs():
+        for engine in ENGINES:
+            yield 'DesignPatch.__init__[{},{}]'.format(label, engine), \
+                lambda freq=freq, er=er, h=h, engine=engine: pa.DesignPatch(freq, er, h, engine)
+            d = pa.DesignPatch(freq, er, h, engine)
+            yield 'getG1[{},{}]'.format(label, engine), d.getG1
+            yield 'getG12[{},{}]'.format(label, engine), d.getG12
+        yield 'design_string[{}]'.format(label), \
+            lambda freq=freq, er=er, h=h: pa.design_string(freq, er, h)
+
+        d = pa.DesignPatch(freq, er, h, 'fast')
+        gw = pa.PatchGerberWriter(d)
+        for feed_type in (pa.FeedType.NORMAL, pa.FeedType.INSET):
+            yield 'PatchGerberWriter.write_gerber[{},{}]'.format(label, feed_type), \
+                lambda gw=gw, feed_type=feed_type: gw.write_gerber(io.StringIO(), feed_type)
+        yield 'export_design_summary[{}]'.format(label), \
+            lambda d=d: pa.export_design_summary(d, io.StringIO())
+        yield 'export_manufacturing_notes[{}]'.format(label), \
+            lambda d=d: pa.export_manufacturing_notes(d, io.StringIO())
+        yield 'format_design_summary[{}]'.format(label), lambda d=d: format_design_summary(d)
+        yield 'format_manufacturing_notes[{}]'.format(label), lambda d=d: format_manufacturing_notes(d)
+
+    with tempfile.TemporaryDirectory() as directory:
+        d = pa.DesignPatch(2.4e9, 4.4, 1.6e-3, 'fast')
+        path = os.path.join(directory, 'bench.gbr')
+        yield 'PatchGerberWriter.write_gerber[file]', lambda: pa.PatchGerberWriter(d).write_gerber(path)
+
+    table = pa.DesignTable.from_batch(pa.design_batch(np.linspace(1e9, 10e9, 250)[:, None],
+                                                      np.array([2.2, 3.38, 4.4, 9.8]), 1.6e-3, engine='fast'))
+    yield 'pattern_metrics[1000 designs,1deg]', lambda: pa.pattern_metrics(table)
+    yield 'radiation_pattern[1deg].directivity', lambda: pa.radiation_pattern(table[0]).directivity()
+
+    # All points on the front: O(n log n) grows about 4.5x from 20k to 80k
+    from patch_antenna.comparison import pareto_front
+    for n in (20000, 80000):
+        x = np.random.default_rng(n).random(n)
+        values = np.column_stack([x, x, -x])
+        yield 'pareto_front[3 objectives,all on front,{}]'.format(n), lambda values=values: pareto_front(values)
+
+    for engine in ENGINES:
+        yield 'find_best_material[2.4GHz,1.6mm,{}]'.format(engine), \
+            lambda engine=engine: pa.find_best_material(2.4e9, 1.6, engine=engine)
+        yield 'find_best_material[2.4GHz,all_thicknesses,{}]'.format(engine), \
+            lambda engine=engine: pa.find_best_material(2.4e9, all_thicknesses=True, engine=engine)
+
+
+def time_callable(fn, repeat=5, min_time=0.2):
+    """Seconds per call: fastest and median of repeat loops of at least min_time"""
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+    times = [t / number for t in timer.repeat(repeat - 1, number)] + [elapsed / number]
+    return {'min': min(times), 'median': statistics.median(times), 'number': number, 'repeat': repeat}
+
+
+def run(pattern=None, repeat=5, min_time=0.2, include_import=True):
+    """Run the suite and return the results document"""
+    import numpy
+    import scipy
+    import patch_antenna
+
+    results = {}
+    if include_import:
+        for module in ('patch_antenna', 'patch_antenna.designer'):
+            name = 'import[{}]'.format(module)
+            if pattern is None or pattern in name:
+                seconds = import_time(module, repeat)
+                results[name] = {'min': seconds, 'median': seconds, 'number': 1, 'repeat': repeat}
+    for name, fn in benchmarks():
+        if pattern is None or pattern in name:
+            results[name] = time_callable(fn, repeat, min_time)
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'patch_antenna': patch_antenna.__version__,
+            'numpy': numpy.__version__,
+            'scipy': scipy.__version__,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, metric='min'):
+    """Compare two results documents
+
+    Returns a list of (name, baseline seconds, current seconds, change in
+    percent, regressed) for benchmarks present in both.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        change = (result[metric] / base[metric] - 1) * 100
+        rows.append((name, base[metric], result[metric], change, change > threshold))
+    return rows
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.3g} {}'.format(seconds / scale, unit)
+    return '{:.3g} ns'.format(seconds / 1e-9)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the patch_antenna hot paths')
+    parser.add_argument('--output', help='Write the results JSON to this file')
+    parser.add_argument('--compare', help='Baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown in percent before failing (default: %(default)s)')
+    parser.add_argument('--metric', choices=('min', 'median'), default='min')
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true', help='Shorter runs, for smoke testing')
+    args = parser.parse_args(argv)
+
+    document = run(args.filter, repeat=2 if args.quick else args.repeat, min_time=0.01 if args.quick else 0.2)
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump(document, outfile, indent=2, sort_keys=True)
+
+    if not args.compare:
+        for name, result in document['results'].items():
+            print('{:<60} {:>12}'.format(name, format_seconds(result[args.metric])))
+        return 0
+
+    with open(args.compare) as infile:
+        baseline = json.load(infile)
+    rows = compare(document, baseline, args.threshold, args.metric)
+    for name, base, current, change, regressed in rows:
+        print('{:<60} {:>12} {:>12} {:>+8.1f}%{}'.format(
+            name, format_seconds(base), format_seconds(current), change, '  REGRESSION' if regressed else ''))
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print('{} benchmark(s) regressed by more than {}%'.format(len(regressions), args.threshold))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
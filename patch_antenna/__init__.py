@@ -13,26 +13,98 @@ __name__ = 'patch_antenna'
 __version__ = '1.0.0'
 __owner__ = 'Leeds SpaceComms'
 
-from .designer import (
-    design,
-    design_result,
-    design_string,
-    design_with_material,
-    design_for_band,
-    quick_design,
-    write_gerber,
-    write_gerber_design,
-    DesignPatch,
-    FeedType,
-    PatchGerberWriter,
-    Result
-)
-
-from .materials import get_material, list_materials, MATERIALS
-from .frequency_bands import get_frequency, list_bands, find_bands_in_range
-from .validation import validate_design
-from .comparison import compare_designs, find_best_material
-from .export import export_design_summary, export_manufacturing_notes
+import importlib
+
+# Pure-Python tables load eagerly; everything else is imported on first
+# access through __getattr__, so `import patch_antenna` does not pull in
+# NumPy, SciPy or gerber_writer until a feature that needs them is used.
+from .materials import get_material, list_materials, MATERIALS, register_material, load_materials, find_materials
+from .frequency_bands import (get_frequency, list_bands, find_bands_in_range, find_overlapping_bands,
+                              nearest_band, register_band, load_bands, FrequencyBand)
+
+# Public name -> submodule defining it
+_LAZY_ATTRIBUTES = {
+    'design': 'designer',
+    'design_result': 'designer',
+    'design_string': 'designer',
+    'design_with_material': 'designer',
+    'design_for_band': 'designer',
+    'quick_design': 'designer',
+    'write_gerber': 'designer',
+    'write_gerber_design': 'designer',
+    'DesignPatch': 'designer',
+    'FeedType': 'designer',
+    'PatchGerberWriter': 'designer',
+    'Result': 'designer',
+    'PanelGerberWriter': 'panel',
+    'write_panel_gerber': 'panel',
+    'write_bundle': 'bundle',
+    'enable_gerber_cache': 'gerber_cache',
+    'disable_gerber_cache': 'gerber_cache',
+    'clear_gerber_cache': 'gerber_cache',
+    'gerber_cache_stats': 'gerber_cache',
+    'enable_design_cache': 'cache',
+    'disable_design_cache': 'cache',
+    'clear_design_cache': 'cache',
+    'design_cache_stats': 'cache',
+    'enable_design_store': 'store',
+    'disable_design_store': 'store',
+    'design_store_stats': 'store',
+    'design_async': 'aio',
+    'design_for_band_async': 'aio',
+    'write_gerber_async': 'aio',
+    'export_design_summary_async': 'aio',
+    'enable_profiling': 'profiling',
+    'disable_profiling': 'profiling',
+    'profiling_stats': 'profiling',
+    'design_scaled': 'scaled',
+    'build_catalog': 'catalog',
+    'enable_design_catalog': 'catalog',
+    'disable_design_catalog': 'catalog',
+    'design_batch': 'batch',
+    'BatchResult': 'batch',
+    'DesignTable': 'table',
+    'sweep': 'sweeps',
+    'SweepResult': 'sweeps',
+    'solve_frequency': 'inverse',
+    'solve_dielectric_constant': 'inverse',
+    'solve_for_edge_impedance': 'inverse',
+    'solve_inset_length': 'inverse',
+    'set_default_engine': 'conductance',
+    'get_default_engine': 'conductance',
+    'validate_design': 'validation',
+    'validate_designs': 'validation',
+    'ValidationRules': 'validation',
+    'compare_designs': 'comparison',
+    'DesignComparison': 'comparison',
+    'find_best_material': 'comparison',
+    'export_design_summary': 'export',
+    'export_manufacturing_notes': 'export',
+    'tolerance_analysis': 'tolerance',
+    'radiation_pattern': 'pattern',
+    'pattern_metrics': 'pattern',
+    'RadiationPattern': 'pattern',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        # Submodules such as patch_antenna.conductance
+        try:
+            return importlib.import_module('.' + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != '{}.{}'.format(__name__, name):
+                raise
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(importlib.import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     'design',
@@ -41,19 +113,70 @@ __all__ = [
     'design_with_material',
     'design_for_band',
     'quick_design',
+    'design_scaled',
     'write_gerber',
     'write_gerber_design',
     'DesignPatch',
     'FeedType',
     'PatchGerberWriter',
+    'PanelGerberWriter',
+    'write_panel_gerber',
+    'write_bundle',
+    'enable_gerber_cache',
+    'disable_gerber_cache',
+    'clear_gerber_cache',
+    'gerber_cache_stats',
     'Result',
     'get_material',
     'list_materials',
+    'register_material',
+    'load_materials',
+    'find_materials',
     'get_frequency',
     'list_bands',
+    'find_overlapping_bands',
+    'nearest_band',
+    'register_band',
+    'load_bands',
+    'FrequencyBand',
     'validate_design',
+    'validate_designs',
+    'ValidationRules',
     'compare_designs',
+    'DesignComparison',
     'find_best_material',
     'export_design_summary',
-    'export_manufacturing_notes'
+    'export_manufacturing_notes',
+    'tolerance_analysis',
+    'enable_design_cache',
+    'disable_design_cache',
+    'clear_design_cache',
+    'design_cache_stats',
+    'enable_design_store',
+    'disable_design_store',
+    'design_store_stats',
+    'design_async',
+    'design_for_band_async',
+    'write_gerber_async',
+    'export_design_summary_async',
+    'enable_profiling',
+    'disable_profiling',
+    'profiling_stats',
+    'build_catalog',
+    'enable_design_catalog',
+    'disable_design_catalog',
+    'design_batch',
+    'BatchResult',
+    'DesignTable',
+    'sweep',
+    'SweepResult',
+    'solve_frequency',
+    'solve_dielectric_constant',
+    'solve_for_edge_impedance',
+    'solve_inset_length',
+    'set_default_engine',
+    'get_default_engine',
+    'radiation_pattern',
+    'pattern_metrics',
+    'RadiationPattern'
 ]
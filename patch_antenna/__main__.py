@@ -0,0 +1,12 @@
+"""
+python -m patch_antenna runs the patch-antenna command.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
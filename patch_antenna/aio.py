@@ -0,0 +1,169 @@
+"""
+asyncio counterparts of the design and output functions.
+
+design_async, design_for_band_async, write_gerber_async and
+export_design_summary_async run the blocking work (impedance integrals,
+Gerber serialization, file I/O) in an executor so the event loop stays
+responsive:
+
+    from patch_antenna import aio
+    aio.configure(executor='process', max_concurrency=8)
+    design = await aio.design_async(2.4e9, 4.4, 1.6e-3)
+
+Work goes to the event loop's default thread pool unless configure() sets
+a thread or process executor. At most max_concurrency calls run in the
+executor at once per event loop; further calls wait. Concurrent calls
+with identical arguments are merged into one computation and every caller
+gets its own copy of the result. Cancelling one caller does not cancel
+the shared computation for the others.
+
+With a process executor, stream targets are still written from a thread,
+since open streams cannot be sent to another process.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import asyncio
+import copy
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import conductance
+from .designer import FeedType, PatchGerberWriter, design, design_for_band, write_gerber_design
+from .export import format_design_summary
+from .output import is_stream, write_text
+
+THREAD = 'thread'
+PROCESS = 'process'
+DEFAULT_CONCURRENCY = os.cpu_count() or 1
+
+_executor = None
+_owned_executor = None
+_max_concurrency = DEFAULT_CONCURRENCY
+_loop_state = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_counters = {'calls': 0, 'merged': 0}
+
+
+def configure(executor=None, max_workers=None, max_concurrency=None):
+    """Choose where blocking work runs and how much of it at once
+
+    Args:
+        executor: 'thread' or 'process' to create a pool, an Executor
+            instance to use as is, or None for the loop's default executor
+        max_workers: Size of a pool created for 'thread' or 'process'
+        max_concurrency: Calls allowed in the executor at once, per event
+            loop (default: os.cpu_count())
+    """
+    global _executor, _owned_executor, _max_concurrency
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("Concurrency limit should be at least 1")
+    if executor is not None and not isinstance(executor, Executor) and executor not in (THREAD, PROCESS):
+        raise ValueError('Executor should be : {}'.format(", ".join([PROCESS, THREAD])))
+
+    with _lock:
+        previous = _owned_executor
+        _owned_executor = None
+        if executor == THREAD:
+            executor = _owned_executor = ThreadPoolExecutor(max_workers)
+        elif executor == PROCESS:
+            executor = _owned_executor = ProcessPoolExecutor(max_workers)
+        _executor = executor
+        _max_concurrency = DEFAULT_CONCURRENCY if max_concurrency is None else max_concurrency
+        # Semaphores are rebuilt with the new limit on next use
+        _loop_state.clear()
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def shutdown():
+    """Shut down an executor created by configure() and return to the defaults"""
+    configure()
+
+
+def stats():
+    """Calls made and how many of them were merged into another in-flight call"""
+    with _lock:
+        return dict(_counters)
+
+
+def _state(loop):
+    with _lock:
+        state = _loop_state.get(loop)
+        if state is None:
+            state = _loop_state[loop] = (asyncio.Semaphore(_max_concurrency), {})
+        return state
+
+
+async def _run(fn, *args):
+    """Run fn(*args) in the executor under the concurrency limit"""
+    loop = asyncio.get_running_loop()
+    semaphore, _ = _state(loop)
+    async with semaphore:
+        return await loop.run_in_executor(_executor, fn, *args)
+
+
+async def _merged(key, factory):
+    """Await factory(), sharing one computation between identical keys"""
+    loop = asyncio.get_running_loop()
+    _, inflight = _state(loop)
+    task = inflight.get(key)
+    with _lock:
+        _counters['calls'] += 1
+        if task is not None:
+            _counters['merged'] += 1
+    if task is None:
+        task = inflight[key] = loop.create_task(factory())
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def design_async(resonant_frequency, dielectric_constant, thickness, engine=None):
+    """Asynchronous design(), see design() for the arguments"""
+    engine = conductance.resolve_engine(engine)
+    key = ('design', float(resonant_frequency), float(dielectric_constant), float(thickness), engine)
+    result = await _merged(key, lambda: _run(design, resonant_frequency, dielectric_constant, thickness, engine))
+    return copy.copy(result)
+
+
+async def design_for_band_async(band_name, material_name, thickness_mm=None, engine=None):
+    """Asynchronous design_for_band(), see design_for_band() for the arguments"""
+    engine = conductance.resolve_engine(engine)
+    key = ('band', band_name.upper(), material_name.upper().replace(' ', '_'), thickness_mm, engine)
+    result = await _merged(key, lambda: _run(design_for_band, band_name, material_name, thickness_mm, engine))
+    return copy.copy(result)
+
+
+def _gerber_text(design_, feed_type):
+    return PatchGerberWriter(design_).dumps_gerber(feed_type)
+
+
+async def write_gerber_async(design_, file_name=None, feed_type=FeedType.NORMAL):
+    """Asynchronous write_gerber_design()
+
+    Returns the Gerber file as bytes when file_name is None. Identical
+    in-flight requests (same artwork and target path) are merged.
+    """
+    FeedType.check(feed_type)
+    if is_stream(file_name):
+        text = await _run(_gerber_text, design_, feed_type)
+        await asyncio.get_running_loop().run_in_executor(None, write_text, file_name, text)
+        return None
+    key = ('gerber', PatchGerberWriter(design_).artwork_key(feed_type), file_name)
+    return await _merged(key, lambda: _run(write_gerber_design, design_, file_name, feed_type))
+
+
+async def export_design_summary_async(design_, filename):
+    """Asynchronous export_design_summary()
+
+    Identical in-flight exports of the same summary to the same path are
+    merged.
+    """
+    text = format_design_summary(design_)
+    if is_stream(filename):
+        await asyncio.get_running_loop().run_in_executor(None, write_text, filename, text, 'utf-8')
+        return
+    await _merged(('summary', text, filename), lambda: _run(write_text, filename, text, 'utf-8'))
@@ -0,0 +1,74 @@
+"""
+ZIP bundles of Gerber layers and design reports, built in memory.
+
+write_bundle() streams Gerber files for every design and feed type, the
+export_* text reports and optionally a panelized layout into one ZIP
+archive. The archive can go to a path, to any writable binary stream
+(an HTTP response, io.BytesIO) or be returned as bytes, so a web service
+never needs a temporary file.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import io
+import zipfile
+
+from .designer import FeedType, PatchGerberWriter
+from .export import format_design_summary, format_manufacturing_notes
+
+
+def _named_designs(designs):
+    """Normalize a dict, (name, design) pairs or bare designs to pairs"""
+    if isinstance(designs, dict):
+        return list(designs.items())
+    named = []
+    for index, item in enumerate(designs):
+        if isinstance(item, tuple):
+            named.append(item)
+        else:
+            named.append(('design_{}'.format(index + 1), item))
+    return named
+
+
+def write_bundle(designs, target=None, feed_types=(FeedType.NORMAL, FeedType.INSET),
+                 reports=True, panel=False, compression=zipfile.ZIP_DEFLATED):
+    """Write Gerber layers and reports for several designs into a ZIP archive
+
+    Archive layout, per design name:
+        <name>/<name>_<feed_type>.gbr
+        <name>/summary.txt              (reports=True)
+        <name>/manufacturing.txt        (reports=True)
+    and, with panel=True, panel_copper.gbr and panel_profile.gbr holding
+    every design with the first feed type.
+
+    Args:
+        designs: Dict of name -> DesignPatch, (name, DesignPatch) pairs or
+            plain DesignPatch objects (named design_1, design_2, ...)
+        target: Path or writable binary stream; None returns the archive bytes
+        feed_types: Feed types to generate Gerber files for
+        reports: Include the design summary and manufacturing notes
+        panel: Include a panelized copper and profile layer
+        compression: zipfile compression method
+    """
+    for feed_type in feed_types:
+        FeedType.check(feed_type)
+    named = _named_designs(designs)
+    buffer = io.BytesIO() if target is None else None
+
+    with zipfile.ZipFile(buffer if target is None else target, 'w', compression) as archive:
+        for name, design in named:
+            gw = PatchGerberWriter(design)
+            for feed_type in feed_types:
+                archive.writestr('{0}/{0}_{1}.gbr'.format(name, feed_type), gw.dumps_gerber(feed_type))
+            if reports:
+                archive.writestr('{}/summary.txt'.format(name), format_design_summary(design))
+                archive.writestr('{}/manufacturing.txt'.format(name), format_manufacturing_notes(design))
+        if panel and named:
+            from .panel import PanelGerberWriter
+            writer = PanelGerberWriter([(design, feed_types[0]) for _, design in named])
+            archive.writestr('panel_copper.gbr', writer.copper_layer().dumps_gerber())
+            archive.writestr('panel_profile.gbr', writer.profile_layer().dumps_gerber())
+
+    if buffer is not None:
+        return buffer.getvalue()
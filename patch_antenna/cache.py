@@ -0,0 +1,108 @@
+"""
+Opt-in memoization of designs keyed on normalized inputs.
+
+When enabled, design() and everything built on it (design_result,
+design_string, design_with_material, design_for_band, find_best_material)
+reuse earlier DesignPatch results for the same (frequency, dielectric
+constant, thickness, engine). The cache is a bounded LRU and every hit
+returns a defensive copy, so callers may modify what they get back.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+_design_cache = None
+
+
+class DesignCache:
+    """Bounded LRU cache of DesignPatch objects with hit/miss counters"""
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("Cache size should be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(freq, er, h, engine):
+        """Normalize design inputs into a hashable key"""
+        return float(freq), float(er), float(h), engine
+
+    def get_or_create(self, key, factory):
+        """Return a copy of the cached value for key, creating it on a miss"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.copy(value)
+            self.misses += 1
+        value = factory()
+        with self._lock:
+            self._entries[key] = copy.copy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Counters as a plain dict, suitable for metrics export"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def enable_design_cache(maxsize=1024):
+    """Turn on design memoization, replacing any existing cache"""
+    global _design_cache
+    _design_cache = DesignCache(maxsize)
+    return _design_cache
+
+
+def disable_design_cache():
+    """Turn off design memoization and drop the cached designs"""
+    global _design_cache
+    _design_cache = None
+
+
+def get_design_cache():
+    """The active DesignCache, or None when memoization is off"""
+    return _design_cache
+
+
+def clear_design_cache():
+    """Empty the active cache, if any"""
+    if _design_cache is not None:
+        _design_cache.clear()
+
+
+def design_cache_stats():
+    """Counters of the active cache, None when memoization is off"""
+    if _design_cache is None:
+        return None
+    return _design_cache.stats()
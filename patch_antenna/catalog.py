@@ -0,0 +1,235 @@
+"""
+Precomputed, memory-mapped catalog of band x material x thickness designs.
+
+build_catalog() designs every combination of FREQUENCY_BANDS, MATERIALS
+and each material's thickness_options once and writes them to a compact
+binary file. DesignCatalog maps that file into memory: opening it reads
+only the header, and a lookup is a binary search over the index followed
+by one record read, so short-lived processes get designs in microseconds.
+
+File layout (little endian):
+    header   HEADER struct: magic, format version, engine, record count,
+             record size, index and record offsets, and a SHA-256
+             fingerprint of the inputs the catalog was built from
+    index    INDEX_DTYPE entries (freq, er, h, record), sorted by
+             (freq, er, h)
+    records  DesignTable rows (table.table_dtype(), 112 bytes each)
+
+A catalog whose fingerprint no longer matches the band and material
+tables, the engine version or the record layout is reported as stale and
+ignored by enable_design_catalog(), which rebuilds it when asked to.
+
+When enabled, design_with_material() and with it design_for_band() and
+quick_design() return catalog designs for combinations it holds and
+compute the rest as before.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from . import conductance
+from .table import COLUMNS, DesignTable, table_dtype
+
+MAGIC = b'PATCHCAT'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sI16sIIQQ32s')
+INDEX_DTYPE = np.dtype([('freq', '<f8'), ('er', '<f8'), ('h', '<f8'), ('record', '<u4'), ('pad', '<u4')])
+RECORD_DTYPE = table_dtype(np.dtype('<f8'))
+
+_design_catalog = None
+
+
+def default_catalog_path(engine=None):
+    from .conductance_table import default_cache_dir
+    return os.path.join(default_cache_dir(), 'design_catalog_v{}_{}.bin'.format(
+        FORMAT_VERSION, conductance.resolve_engine(engine)))
+
+
+def catalog_specs(bands=None, materials=None):
+    """Unique (freq, er, h) inputs of every band x material x thickness combination
+
+    h is thickness_mm / 1000, as design_with_material() computes it.
+    """
+    from .frequency_bands import FREQUENCY_BANDS
+    from .materials import MATERIALS
+
+    bands = FREQUENCY_BANDS if bands is None else bands
+    materials = MATERIALS if materials is None else materials
+    specs = set()
+    for freq in bands.values():
+        for material in materials.values():
+            for thickness_mm in material.thickness_options:
+                specs.add((float(freq), float(material.dielectric_constant), thickness_mm / 1000))
+    return sorted(specs)
+
+
+def fingerprint(specs, engine):
+    """SHA-256 of the catalog inputs, engine version and record layout"""
+    digest = hashlib.sha256()
+    digest.update('{}|{}|{}|{}'.format(FORMAT_VERSION, engine, conductance.ENGINE_VERSIONS[engine],
+                                       ','.join(COLUMNS)).encode('ascii'))
+    for spec in specs:
+        digest.update(struct.pack('<3d', *spec))
+    return digest.digest()
+
+
+def build_catalog(path=None, engine=None, bands=None, materials=None):
+    """Design every catalog combination and write the binary catalog
+
+    Args:
+        path: Output file (default: default_catalog_path(engine))
+        engine: Conductance engine, None for the global default
+        bands: Dict of band name -> frequency (default: FREQUENCY_BANDS)
+        materials: Dict of SubstrateMaterial (default: MATERIALS)
+
+    Combinations that fail the design range checks or have no inset match
+    are left out. Returns the path written.
+    """
+    from .designer import design
+
+    engine = conductance.resolve_engine(engine)
+    path = default_catalog_path(engine) if path is None else path
+    specs = catalog_specs(bands, materials)
+
+    designs = []
+    for freq, er, h in specs:
+        try:
+            designs.append(design(freq, er, h, engine))
+        except (ValueError, ArithmeticError):
+            continue
+    records = DesignTable.from_designs(designs).data.astype(RECORD_DTYPE)
+    index = np.zeros(len(records), dtype=INDEX_DTYPE)
+    for name in ('freq', 'er', 'h'):
+        index[name] = records[name]
+    index['record'] = np.arange(len(records))
+    index.sort(order=['freq', 'er', 'h'])
+
+    index_offset = HEADER.size
+    records_offset = index_offset + index.nbytes
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, engine.encode('ascii'), len(records),
+                         RECORD_DTYPE.itemsize, index_offset, records_offset, fingerprint(specs, engine))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp, 'wb') as outfile:
+        outfile.write(header)
+        outfile.write(index.tobytes())
+        outfile.write(records.tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+class DesignCatalog:
+    """Read-only, memory-mapped view of a catalog file
+
+    Raises ValueError when the file is not a catalog of this format.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as infile:
+            raw = infile.read(HEADER.size)
+        if len(raw) != HEADER.size:
+            raise ValueError("Not a design catalog: {}".format(path))
+        magic, version, engine, count, record_size, index_offset, records_offset, digest = HEADER.unpack(raw)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD_DTYPE.itemsize:
+            raise ValueError("Not a design catalog of format {}: {}".format(FORMAT_VERSION, path))
+        self.engine = engine.rstrip(b'\0').decode('ascii')
+        self.fingerprint = digest
+        if count:
+            with open(path, 'rb') as infile:
+                self._mmap = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = self._mmap
+        else:
+            buffer = b''
+        self.index = np.frombuffer(buffer, INDEX_DTYPE, count, index_offset if count else 0)
+        self.records = np.frombuffer(buffer, RECORD_DTYPE, count, records_offset if count else 0)
+        # Column views into the mapped index, no copies
+        self._freq, self._er, self._h = self.index['freq'], self.index['er'], self.index['h']
+        self._record = self.index['record']
+
+    def __len__(self):
+        return len(self.records)
+
+    def is_current(self, bands=None, materials=None):
+        """True when built from the current band/material tables and engine version"""
+        return self.fingerprint == fingerprint(catalog_specs(bands, materials), self.engine)
+
+    def find(self, freq, er, h):
+        """Record number of the design for exactly these inputs, or None"""
+        lo = int(self._freq.searchsorted(freq, 'left'))
+        hi = int(self._freq.searchsorted(freq, 'right'))
+        # Few entries share a frequency, so scan them
+        for i in range(lo, hi):
+            if self._er[i] == er and self._h[i] == h:
+                return int(self._record[i])
+        return None
+
+    def lookup(self, freq, er, h):
+        """DesignPatch for the inputs, None when the catalog does not hold it"""
+        record = self.find(freq, er, h)
+        if record is None:
+            return None
+        from .designer import DesignPatch
+        return DesignPatch.from_fields(dict(zip(COLUMNS, self.records[record].tolist())), self.engine)
+
+    def table(self):
+        """All catalog designs as a DesignTable over the mapped records"""
+        return DesignTable(self.records, self.engine)
+
+
+def enable_design_catalog(path=None, build=True, engine=None, bands=None, materials=None):
+    """Use a catalog for design_for_band() and quick_design()
+
+    Opens the catalog at path (default: default_catalog_path(engine)).
+    When it is missing or stale it is rebuilt if build is True; otherwise
+    ValueError is raised. Returns the DesignCatalog.
+
+    bands and materials are the tables the catalog should hold, as for
+    build_catalog(); pass the same ones again to reopen a catalog built
+    from custom tables.
+    """
+    global _design_catalog
+    engine = conductance.resolve_engine(engine)
+    path = default_catalog_path(engine) if path is None else path
+    catalog = None
+    try:
+        catalog = DesignCatalog(path)
+    except (OSError, ValueError):
+        if not build:
+            raise
+    if catalog is None or not catalog.is_current(bands, materials):
+        if not build:
+            raise ValueError("Design catalog is out of date: {}".format(path))
+        build_catalog(path, engine, bands, materials)
+        catalog = DesignCatalog(path)
+    _design_catalog = catalog
+    return catalog
+
+
+def disable_design_catalog():
+    """Stop using the catalog"""
+    global _design_catalog
+    _design_catalog = None
+
+
+def get_design_catalog():
+    """The active DesignCatalog, or None"""
+    return _design_catalog
+
+
+def catalog_design(freq, er, h, engine=None):
+    """Design from the active catalog, None when off, engine differs or not held"""
+    catalog = _design_catalog
+    if catalog is None or catalog.engine != conductance.resolve_engine(engine):
+        return None
+    return catalog.lookup(freq, er, h)
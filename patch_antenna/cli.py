@@ -0,0 +1,345 @@
+"""
+Command line interface: the patch-antenna command.
+
+    patch-antenna design --band WIFI_2_4GHZ --material FR4 --thickness-mm 1.6
+    patch-antenna batch specs.csv --output designs.jsonl --workers 8 --gerber-dir gerbers/
+    cat specs.jsonl | patch-antenna batch --engine fast > designs.jsonl
+
+Batch mode reads one design spec per JSONL line or CSV row with the fields
+    freq          Resonant frequency in Hz (or give band)
+    band          Band name from FREQUENCY_BANDS
+    material      Material name from MATERIALS (default FR4)
+    er            Dielectric constant, overrides the material's
+    thickness_mm  Substrate thickness (default: the material's first option)
+    feed_type     normal or inset (default normal), used for Gerber output
+    name          Optional label, also used for Gerber file names
+and writes one result per spec, in input order, as JSONL or CSV. Specs
+that fail, including JSONL lines that are not a JSON object, carry an
+error message instead of dimensions, and the command exits with status 1
+if any failed.
+
+Input is read and processed in chunks with a bounded number of chunks in
+flight, so memory use does not grow with the input size.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+JSONL = 'jsonl'
+CSV = 'csv'
+FORMATS = (CSV, JSONL)
+
+RESULT_FIELDS = (
+    'patch_width', 'patch_length', 'feeder_width', 'feeder_length',
+    'inset_gap_width', 'inset_length', 'ground_length', 'ground_width', 'edge_impedance'
+)
+OUTPUT_FIELDS = (
+    ('index', 'name', 'band', 'material', 'frequency', 'er', 'thickness_mm', 'feed_type')
+    + RESULT_FIELDS + ('gerber', 'error')
+)
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def resolve_spec(spec):
+    """Turn a spec dict into (frequency, er, thickness_mm, material, feed_type)
+
+    Raises ValueError for unknown bands, materials or feed types and for
+    missing values.
+    """
+    from .designer import FeedType
+    from .frequency_bands import get_frequency, list_bands
+    from .materials import get_material, list_materials
+
+    band = spec.get('band')
+    if not _blank(spec.get('freq')):
+        frequency = float(spec['freq'])
+    elif not _blank(band):
+        frequency = get_frequency(band)
+        if not frequency:
+            raise ValueError(f"Unknown band: {band}. Available: {list_bands()}")
+    else:
+        raise ValueError("Give freq or band")
+
+    material_name = spec.get('material')
+    material = None
+    if not _blank(material_name) or _blank(spec.get('er')):
+        material_name = 'FR4' if _blank(material_name) else material_name
+        material = get_material(material_name)
+        if not material:
+            raise ValueError(f"Unknown material: {material_name}. Available: {list_materials()}")
+    er = material.dielectric_constant if _blank(spec.get('er')) else float(spec['er'])
+
+    if not _blank(spec.get('thickness_mm')):
+        thickness_mm = float(spec['thickness_mm'])
+    elif material is not None:
+        thickness_mm = material.thickness_options[0]
+    else:
+        raise ValueError("Give thickness_mm when er is given without a material")
+
+    feed_type = FeedType.NORMAL if _blank(spec.get('feed_type')) else spec['feed_type']
+    FeedType.check(feed_type)
+    return frequency, er, thickness_mm, material_name if material is not None else None, feed_type
+
+
+def _gerber_path(directory, record):
+    label = record['name'] if not _blank(record['name']) else 'design_{}'.format(record['index'])
+    safe = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in str(label))
+    return os.path.join(directory, '{}_{}.gbr'.format(safe, record['feed_type']))
+
+
+def _error(e):
+    return '{}: {}'.format(type(e).__name__, e)
+
+
+class InvalidSpec:
+    """Stands in for an input line that holds no spec, see read_specs()"""
+
+    def __init__(self, line_number, error):
+        self.line_number = line_number
+        self.error = error
+
+
+def design_spec(index, spec, engine=None):
+    """Design one spec, returning (record, design)
+
+    design is None when the spec failed; record['error'] then says why.
+    """
+    from .designer import design
+
+    record = dict.fromkeys(OUTPUT_FIELDS)
+    record['index'] = index
+    if isinstance(spec, InvalidSpec):
+        record['error'] = spec.error
+        return record, None
+    try:
+        if not isinstance(spec, dict):
+            raise TypeError('Spec should be an object, not {}'.format(type(spec).__name__))
+        record.update(name=spec.get('name'), band=spec.get('band'))
+        frequency, er, thickness_mm, material, feed_type = resolve_spec(spec)
+        record.update(frequency=frequency, er=er, thickness_mm=thickness_mm,
+                      material=material, feed_type=feed_type)
+        design_ = design(frequency, er, thickness_mm / 1000, engine)
+        record.update({name: value for name, value in design_.get_result().as_dict().items()
+                       if name in RESULT_FIELDS})
+    except (ValueError, ArithmeticError, TypeError) as e:
+        record['error'] = _error(e)
+        return record, None
+    return record, design_
+
+
+def process_spec(index, spec, engine=None, gerber_dir=None):
+    """Design one spec and return its output record"""
+    from .designer import write_gerber_design
+
+    record, design_ = design_spec(index, spec, engine)
+    if design_ is not None and gerber_dir is not None:
+        record['gerber'] = _gerber_path(gerber_dir, record)
+        try:
+            write_gerber_design(design_, record['gerber'], record['feed_type'])
+        except (ValueError, ArithmeticError, TypeError) as e:
+            record['error'] = _error(e)
+    return record
+
+
+def _process_chunk(chunk, engine, gerber_dir):
+    """Worker entry point: process a list of (index, spec) pairs"""
+    return [process_spec(index, spec, engine, gerber_dir) for index, spec in chunk]
+
+
+def read_specs(stream, input_format):
+    """Yield spec dicts from a JSONL or CSV text stream, lazily
+
+    A JSONL line that is not valid JSON or not an object yields an
+    InvalidSpec naming the line, which becomes an error record, so one
+    bad line does not stop the batch.
+    """
+    if input_format == CSV:
+        yield from csv.DictReader(stream)
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            spec = json.loads(line)
+        except ValueError as e:
+            yield InvalidSpec(line_number, '{}: line {}: {}'.format(type(e).__name__, line_number, e))
+            continue
+        if not isinstance(spec, dict):
+            spec = InvalidSpec(line_number, 'ValueError: line {}: Spec should be a JSON object, not {}'
+                               .format(line_number, type(spec).__name__))
+        yield spec
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(specs, engine=None, workers=None, chunk_size=256, gerber_dir=None):
+    """Yield output records for specs in input order
+
+    With workers > 1 chunks are processed by a process pool, keeping at
+    most two chunks per worker in flight.
+    """
+    from . import conductance
+
+    engine = conductance.resolve_engine(engine)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if gerber_dir is not None:
+        os.makedirs(gerber_dir, exist_ok=True)
+    chunks = _chunks(enumerate(specs), chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _process_chunk(chunk, engine, gerber_dir)
+        return
+
+    from . import store
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=store.init_worker,
+                             initargs=(store.worker_state(),)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_process_chunk, chunk, engine, gerber_dir))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class _RecordWriter:
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.csv = None
+        if output_format == CSV:
+            self.csv = csv.DictWriter(stream, OUTPUT_FIELDS, lineterminator='\n')
+            self.csv.writeheader()
+
+    def write(self, record):
+        if self.csv is not None:
+            self.csv.writerow(record)
+        else:
+            self.stream.write(json.dumps(record) + '\n')
+
+
+def _guess_format(path, default):
+    if path and path != '-':
+        return CSV if path.lower().endswith('.csv') else JSONL
+    return default
+
+
+def _open_input(path):
+    if path is None or path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='') if hasattr(sys.stdin, 'buffer') \
+            else sys.stdin
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _open_output(path):
+    if path is None or path == '-':
+        return sys.stdout
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def batch_command(args):
+    input_format = args.input_format or _guess_format(args.input, JSONL)
+    output_format = args.output_format or _guess_format(args.output, JSONL)
+    infile = _open_input(args.input)
+    outfile = _open_output(args.output)
+    failures = 0
+    try:
+        writer = _RecordWriter(outfile, output_format)
+        records = run_batch(read_specs(infile, input_format), args.engine, args.workers,
+                            args.chunk_size, args.gerber_dir)
+        for record in records:
+            failures += record['error'] is not None
+            writer.write(record)
+        outfile.flush()
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+        if args.input not in (None, '-'):
+            infile.close()
+    if failures:
+        print('{} spec(s) failed'.format(failures), file=sys.stderr)
+    return 1 if failures else 0
+
+
+def design_command(args):
+    spec = {'freq': args.freq, 'band': args.band, 'material': args.material, 'er': args.er,
+            'thickness_mm': args.thickness_mm, 'feed_type': args.feed_type}
+    record, design_ = design_spec(0, spec, args.engine)
+    if design_ is not None and args.gerber:
+        from .designer import write_gerber_design
+        write_gerber_design(design_, args.gerber, record['feed_type'])
+        record['gerber'] = args.gerber
+    if record['error'] is not None:
+        print(record['error'], file=sys.stderr)
+        return 1
+    print(json.dumps({name: value for name, value in record.items() if value is not None and name != 'index'},
+                     indent=4))
+    return 0
+
+
+def build_parser():
+    from . import __version__
+
+    parser = argparse.ArgumentParser(prog='patch-antenna', description='Rectangular patch antenna designer')
+    parser.add_argument('--version', action='version', version='%(prog)s ' + __version__)
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    engine_help = 'Conductance engine: fast, quad or table (default: the library default, quad)'
+
+    single = commands.add_parser('design', help='Design one antenna and print it as JSON')
+    single.add_argument('--freq', type=float, help='Resonant frequency in Hz')
+    single.add_argument('--band', help='Band name, instead of --freq')
+    single.add_argument('--material', help='Material name (default FR4)')
+    single.add_argument('--er', type=float, help='Dielectric constant, overrides the material')
+    single.add_argument('--thickness-mm', type=float, help='Substrate thickness in mm')
+    single.add_argument('--feed-type', default='normal', help='normal or inset')
+    single.add_argument('--gerber', help='Also write the Gerber file here')
+    single.add_argument('--engine', help=engine_help)
+    single.set_defaults(handler=design_command)
+
+    batch = commands.add_parser('batch', help='Design every spec of a JSONL or CSV input')
+    batch.add_argument('input', nargs='?', help='Spec file, - or omitted for stdin')
+    batch.add_argument('--input-format', choices=FORMATS, help='Default: from the file extension, else jsonl')
+    batch.add_argument('--output', '-o', help='Result file, - or omitted for stdout')
+    batch.add_argument('--output-format', choices=FORMATS, help='Default: from the file extension, else jsonl')
+    batch.add_argument('--workers', '-j', type=int, help='Worker processes (default: CPU count)')
+    batch.add_argument('--chunk-size', type=int, default=256, help='Specs per worker task')
+    batch.add_argument('--gerber-dir', help='Also write a Gerber file per design into this directory')
+    batch.add_argument('--engine', help=engine_help)
+    batch.set_defaults(handler=batch_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.engine is not None:
+        from .conductance import check_engine
+        try:
+            check_engine(args.engine)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+    return args.handler(args)
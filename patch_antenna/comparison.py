@@ -5,17 +5,223 @@ This module provides functions to compare multiple antenna designs and find opti
 materials for specific design constraints. Essential for design optimization and 
 material selection workflows.
 
+DesignComparison holds the compared quantities of any number of designs
+as NumPy arrays, from a list of designs, a DesignTable, a BatchResult or
+a SweepResult. It ranks them by several keys at once and extracts the
+Pareto front of any objectives, e.g. ground area vs impedance error vs
+substrate loss, in O(n log n) for up to three objectives.
+
 Added by Al-Musbahi - Leeds SpaceComms
 (Enhancement to original library by Bhanuchander Udhayakumar)
 """
 
+import numpy as np
+
+# Columns read from the designs
+DESIGN_COLUMNS = (
+    'freq', 'er', 'h', 'patch_width', 'patch_length', 'feeder_width', 'feeder_length',
+    'ground_width', 'ground_length', 'input_impedance'
+)
+# Columns derived from them
+DERIVED_METRICS = ('patch_area', 'ground_area', 'impedance_error', 'loss_tangent')
+
+# Relative impedance difference allowed between the fast engine, used to
+# bound find_best_material() candidates, and the engine that designs
+# them; the engines agree to about 1e-9 (see conductance)
+PRUNE_TOLERANCE = 1e-6
+
+# Rows of the compare_designs() table: label and getter; the arithmetic
+# matches the original per-design expressions so rounding is unchanged
+TABLE_ROWS = (
+    ('Frequency (GHz)', lambda c: c['freq'] / 1e9),
+    ('Patch Width (mm)', lambda c: c['patch_width'] * 1000),
+    ('Patch Length (mm)', lambda c: c['patch_length'] * 1000),
+    ('Feeder Width (mm)', lambda c: c['feeder_width'] * 1000),
+    ('Feeder Length (mm)', lambda c: c['feeder_length'] * 1000),
+    ('Input Impedance (Ohm)', lambda c: c['input_impedance']),
+    ('Total Area (mm²)', lambda c: c['ground_area'] * 1e6),
+)
+
+
+def _pareto_2d(points):
+    """Front mask of distinct points sorted lexicographically"""
+    best_before = np.minimum.accumulate(np.concatenate(([np.inf], points[:-1, 1])))
+    return points[:, 1] < best_before
+
+
+def _pareto_3d(points):
+    """Front mask of distinct points sorted lexicographically
+
+    Sweeps in order; a point is dominated when an earlier point has no
+    larger second and third value. A Fenwick tree over the ranks of the
+    second values holds the prefix minimum of the third values seen so
+    far, so each query and insert costs O(log n).
+    """
+    _, ranks = np.unique(points[:, 1], return_inverse=True)
+    ranks = ranks.ravel() + 1
+    size = int(ranks.max())
+    tree = [np.inf] * (size + 1)
+    front = []
+    for rank, third in zip(ranks.tolist(), points[:, 2].tolist()):
+        # Smallest third among earlier points with second <= this one
+        best, i = np.inf, rank
+        while i:
+            if tree[i] < best:
+                best = tree[i]
+            i &= i - 1
+        front.append(best > third)
+        i = rank
+        while i <= size:
+            if third < tree[i]:
+                tree[i] = third
+            i += i & -i
+    return np.array(front, dtype=bool)
+
+
+def _pareto_nd(points):
+    """Front mask of distinct points sorted lexicographically, any dimension"""
+    mask = np.zeros(len(points), dtype=bool)
+    front = np.empty((0, points.shape[1]))
+    for i, point in enumerate(points):
+        # Earlier points can dominate later ones but not the other way round
+        if not np.any(np.all(front <= point, axis=1)):
+            mask[i] = True
+            front = np.vstack([front, point])
+    return mask
+
+
+def pareto_front(values):
+    """Mask of the non-dominated rows of an (n, k) array, all minimized
+
+    A row is dominated when another row is no larger in every column and
+    differs from it. Identical rows share their status, and rows holding
+    NaN are never on the front. Two and three columns take O(n log n);
+    more fall back to comparing against the front found so far.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    finite = ~np.isnan(values).any(axis=1)
+    mask = np.zeros(len(values), dtype=bool)
+    if not finite.any():
+        return mask
+    # Sorted distinct points: earlier points are never dominated by later ones
+    rows = np.flatnonzero(finite)
+    rows = rows[np.lexsort(values[rows].T[::-1])]
+    ordered = values[rows]
+    distinct = np.concatenate(([True], np.any(ordered[1:] != ordered[:-1], axis=1)))
+    points = ordered[distinct]
+    group = np.cumsum(distinct) - 1
+    if points.shape[1] == 1:
+        on_front = np.arange(len(points)) == 0
+    elif points.shape[1] == 2:
+        on_front = _pareto_2d(points)
+    elif points.shape[1] == 3:
+        on_front = _pareto_3d(points)
+    else:
+        on_front = _pareto_nd(points)
+    mask[rows] = on_front[group]
+    return mask
+
+
+class DesignComparison:
+    """Compared quantities of many designs as NumPy arrays
+
+    Metrics are the DESIGN_COLUMNS plus patch_area and ground_area (m²),
+    impedance_error (|input_impedance - target_impedance|) and
+    loss_tangent (from each design's material, NaN when unknown).
+
+    Args:
+        designs: Iterable of DesignPatch or DesignRow objects, a
+            DesignTable, a BatchResult or a SweepResult (its successes)
+        labels: Optional label per design (default: "Design 1", ...)
+        target_impedance: Reference for impedance_error in Ohms
+        loss_tangent: Optional loss tangent per design, overriding the
+            materials
+    """
+
+    def __init__(self, designs, labels=None, target_impedance=50, loss_tangent=None):
+        from .table import design_columns
+
+        columns = design_columns(designs, DESIGN_COLUMNS + ('loss_tangent',))
+        if loss_tangent is not None:
+            columns['loss_tangent'] = np.asarray(loss_tangent, dtype=float)
+        columns['patch_area'] = columns['patch_width'] * columns['patch_length']
+        columns['ground_area'] = columns['ground_width'] * columns['ground_length']
+        columns['impedance_error'] = np.abs(columns['input_impedance'] - target_impedance)
+
+        self.metrics = columns
+        self.target_impedance = target_impedance
+        self.labels = [f"Design {i+1}" for i in range(len(self))] if labels is None else list(labels)
+
+    def __len__(self):
+        return len(self.metrics['freq'])
+
+    def __getitem__(self, name):
+        return self.metric(name)
+
+    def metric(self, name):
+        """Metric values as an array"""
+        try:
+            return self.metrics[name]
+        except KeyError:
+            raise ValueError('Metric should be : {}'.format(", ".join(self.metrics))) from None
+
+    def _keys(self, keys):
+        """Metric arrays of keys, negated for keys prefixed with '-'"""
+        if isinstance(keys, str):
+            keys = [keys]
+        return [-self.metric(key[1:]) if key.startswith('-') else self.metric(key) for key in keys]
+
+    def order(self, keys):
+        """Row indices sorted by keys, the first key most significant
+
+        Prefix a key with '-' to sort it in descending order. The sort is
+        stable and NaN sorts last.
+        """
+        return np.lexsort(self._keys(keys)[::-1])
+
+    def top(self, keys, k):
+        """Indices of the k best rows by keys"""
+        return self.order(keys)[:k]
+
+    def pareto(self, objectives):
+        """Indices of the rows on the Pareto front of objectives
+
+        Objectives are minimized; prefix one with '-' to maximize it.
+        Indices are sorted by the first objective.
+        """
+        values = self._keys(objectives)
+        indices = np.flatnonzero(pareto_front(np.column_stack(values)))
+        return indices[np.lexsort([v[indices] for v in values[::-1]])]
+
+    def select(self, indices):
+        """A DesignComparison of the given rows, in the given order"""
+        subset = DesignComparison.__new__(DesignComparison)
+        subset.metrics = {name: values[indices] for name, values in self.metrics.items()}
+        subset.target_impedance = self.target_impedance
+        subset.labels = [self.labels[i] for i in np.arange(len(self))[indices]]
+        return subset
+
+
+def format_comparison(comparison):
+    """The compare_designs() table of a DesignComparison as a string"""
+    lines = [f"{'Parameter':<20} " + " ".join(f"{label:<15}" for label in comparison.labels),
+             "-" * (20 + 16 * len(comparison))]
+    for param_name, getter in TABLE_ROWS:
+        values = getter(comparison)
+        lines.append(f"{param_name:<20} " + " ".join(f"{val:>14.2f}" for val in values))
+    return "\n".join(lines)
+
+
 def compare_designs(designs, labels=None):
     """
     Compare multiple antenna designs in a formatted table.
     
     Displays key design parameters side-by-side for easy comparison including
     frequency, dimensions, impedance, and total area. Useful for evaluating
-    different design options and trade-offs.
+    different design options and trade-offs. Use DesignComparison to rank
+    or filter the designs programmatically.
     
     Args:
         designs: List of antenna design objects to compare
@@ -24,58 +230,113 @@ def compare_designs(designs, labels=None):
     Returns:
         None (prints comparison table to console)
     """
-    if labels is None:
-        labels = [f"Design {i+1}" for i in range(len(designs))]
-    
-    print(f"{'Parameter':<20} " + " ".join(f"{label:<15}" for label in labels))
-    print("-" * (20 + 16 * len(designs)))
-    
-    # Display comparison table with key parameters
-    params = [
-        ('Frequency (GHz)', lambda d: d.freq / 1e9),
-        ('Patch Width (mm)', lambda d: d.patch_width * 1000),
-        ('Patch Length (mm)', lambda d: d.patch_length * 1000),
-        ('Feeder Width (mm)', lambda d: d.feeder_width * 1000),
-        ('Feeder Length (mm)', lambda d: d.feeder_length * 1000),
-        ('Input Impedance (Ohm)', lambda d: d.input_impedance),
-        ('Total Area (mm²)', lambda d: (d.ground_width * d.ground_length) * 1e6)
-    ]
-    
-    for param_name, getter in params:
-        values = [getter(design) for design in designs]
-        print(f"{param_name:<20} " + " ".join(f"{val:>14.2f}" for val in values))
+    print(format_comparison(DesignComparison(designs, labels)))
 
-def find_best_material(frequency, thickness_mm, target_impedance=50):
+def find_best_material(frequency, thickness_mm=None, target_impedance=50, all_thicknesses=False,
+                       materials=None, top_k=None, max_patch_mm=None, engine=None, workers=1,
+                       dielectric_range=None, max_loss_tangent=None):
     """
     Find the best material for given design constraints.
     
-    Evaluates all available materials to find the best match for impedance
-    requirements. Designs are tested with each material and ranked by how
-    closely they match the target impedance.
+    Evaluates the available materials to find the best match for impedance
+    requirements. Candidates are first screened with the cheap closed-form
+    patch geometry. With top_k, the impedance of every survivor is then
+    bounded with one vectorized fast-engine call, and only candidates
+    whose bound can still reach the top_k get a full design, optionally
+    spread over several processes. Results are ranked by how closely they
+    match the target impedance.
     
     Args:
         frequency: Operating frequency in Hz
-        thickness_mm: Substrate thickness in millimeters
+        thickness_mm: Substrate thickness in millimeters; materials that do
+            not offer it are skipped
         target_impedance: Target input impedance in Ohms (default: 50)
+        all_thicknesses: Try every entry of each material's thickness_options
+            instead of thickness_mm
+        materials: Material keys to consider (default: everything in
+            MATERIALS, including materials added at runtime)
+        top_k: Return only the k best candidates (default: all)
+        max_patch_mm: Skip candidates whose patch width or length exceeds
+            this size in millimeters
+        engine: Conductance engine name, None for the global default
+        workers: Number of worker processes for the impedance calculation
+        dielectric_range: Optional (min, max) dielectric constant, inclusive
+        max_loss_tangent: Skip materials with a larger loss tangent
     
     Returns:
         List of tuples: (material_name, design_object, impedance_error)
-        sorted by impedance matching quality (best first)
+        sorted by impedance matching quality (best first). The thickness
+        used is available as design_object.thickness_mm.
     """
-    from .materials import MATERIALS
-    from .designer import design_with_material
+    import heapq
+    import numpy as np
+    from . import conductance
+    from .batch import check_ranges, evaluate_impedance, length_width_e_eff
+    from .materials import find_materials, get_material_index
+    from .sweeps import SweepRow, resolve_materials, run_rows
+    
+    # Select materials through the property index rather than scanning them
+    er_min, er_max = (None, None) if dielectric_range is None else dielectric_range
+    wanted = None if all_thicknesses else thickness_mm
+    if materials is None:
+        selected = find_materials(er_min, er_max, max_loss_tangent, wanted)
+    else:
+        allowed = set(get_material_index().query(er_min, er_max, max_loss_tangent, wanted))
+        selected = [(name, material) for name, material in resolve_materials(materials) if name in allowed]
+    
+    # Build the candidate list from the selected materials and thicknesses
+    candidates = []
+    for name, material in selected:
+        if all_thicknesses:
+            options = material.thickness_options
+        elif thickness_mm in material.thickness_options:
+            options = [thickness_mm]
+        else:
+            continue
+        for option in options:
+            candidates.append(SweepRow(None, frequency, name, material.dielectric_constant, option))
+    if not candidates:
+        return []
+    
+    # Screen with the closed-form geometry before computing any impedance
+    ers = np.array([c.dielectric_constant for c in candidates], dtype=float)
+    hs = np.array([c.thickness_mm for c in candidates], dtype=float) / 1000
+    freqs = np.full(ers.shape, float(frequency))
+    keep = np.logical_and.reduce(check_ranges(freqs, ers, hs))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        wavelength, patch_width, _, _, _, patch_length = length_width_e_eff(freqs, ers, hs)
+        keep &= patch_length > 0
+        if max_patch_mm is not None:
+            keep &= np.maximum(patch_width, patch_length) * 1000 <= max_patch_mm
+    candidates = [c for c, k in zip(candidates, keep) if k]
+    
+    # Skip candidates whose impedance error, allowing for the difference
+    # between engines, cannot beat the k-th best upper bound
+    deferred = []
+    if top_k is not None and len(candidates) > top_k:
+        k0 = 2 * np.pi / wavelength[keep]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            impedance = evaluate_impedance(k0 * patch_width[keep], k0 * patch_length[keep], conductance.FAST)
+            slack = PRUNE_TOLERANCE * np.abs(impedance)
+            error = np.abs(impedance - target_impedance)
+            cutoff = np.partition(error + slack, top_k - 1)[top_k - 1]
+            # NaN bounds (and a NaN cutoff) keep their candidates
+            skip = error - slack > cutoff
+        deferred = [c for c, s in zip(candidates, skip) if s]
+        candidates = [c for c, s in zip(candidates, skip) if not s]
     
-    # Test each material that supports the required thickness
-    results = []
-    for name, material in MATERIALS.items():
-        if thickness_mm in material.thickness_options:
-            try:
-                design = design_with_material(frequency, name, thickness_mm)
-                impedance_error = abs(design.input_impedance - target_impedance)
-                results.append((name, design, impedance_error))
-            except:
-                continue
+    # Test each remaining candidate, failures are left out of the ranking
+    run_rows(candidates, engine, workers)
+    results = [(c.material, c.design, abs(c.design.input_impedance - target_impedance))
+               for c in candidates if c.error is None]
+    if deferred and len(results) < top_k:
+        # Failures among the shortlist, the skipped candidates may be needed
+        run_rows(deferred, engine, workers)
+        results += [(c.material, c.design, abs(c.design.input_impedance - target_impedance))
+                    for c in deferred if c.error is None]
     
-    # Sort by impedance matching accuracy (lower error is better)
-    results.sort(key=lambda x: x[2])
-    return results
+    # Rank by impedance matching accuracy (lower error is better)
+    if top_k is None:
+        results.sort(key=lambda x: x[2])
+        return results
+    return heapq.nsmallest(top_k, results, key=lambda x: x[2])
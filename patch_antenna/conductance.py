@@ -0,0 +1,214 @@
+"""
+Radiating slot conductance engines for patch antenna design.
+
+The input edge impedance of the transmission line model is built from the
+self conductance G1 of one radiating slot and the mutual conductance G12
+between the two slots. Both depend only on the dimensionless products
+k0*W and k0*L, so every engine here is written in those terms.
+
+Available engines:
+    quad - the original reference implementation using nested adaptive
+           scipy.integrate.quad calls (Si integral, J0 integral).
+    fast - closed-form special functions (scipy.special.sici, scipy.special.j0)
+           and a fixed-order Gauss-Legendre rule for the G12 integral.
+           Accepts NumPy arrays and broadcasts over them.
+    table - bicubic interpolation in a precomputed, disk-cached table
+            (see patch_antenna.conductance_table). Also vectorized.
+
+Accuracy of the fast engine: the input impedance agrees with the quad
+engine to a relative error below 1e-9 for |k0*L| <= 30, which covers every
+design with a positive patch length. Outside that range the quad reference
+itself stops converging (scipy emits IntegrationWarning). The table
+engine records its own measured error in ConductanceTable.max_error
+(about 4e-9 for the default 129 x 129 grid).
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+from math import cos, sin, pi
+
+import numpy as np
+
+from . import profiling
+
+# SciPy is imported inside the functions that use it, so importing this
+# module (and the package) stays cheap until an engine is evaluated
+
+QUAD = 'quad'
+FAST = 'fast'
+TABLE = 'table'
+
+# Gauss-Legendre order used by the fast G12 integral over [0, pi/2]
+GAUSS_ORDER = 64
+
+# Rows evaluated per block by the fast engine to bound temporary memory
+_BLOCK_SIZE = 65536
+
+_nodes, _weights = np.polynomial.legendre.leggauss(GAUSS_ORDER)
+# The G12 integrand is symmetric about pi/2, so integrate half and double
+_THETA = (_nodes + 1) * pi / 4
+_WEIGHTS = _weights * pi / 2
+_COS = np.cos(_THETA)
+_SIN = np.sin(_THETA)
+_SIN3_W = _SIN ** 3 * _WEIGHTS
+
+_default_engine = QUAD
+
+
+def si_quad(a):
+    """Sine integral Si(a) by adaptive quadrature (reference)"""
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        return profiler.quad('Si', lambda x: sin(x)/x, 0, a)
+    from scipy import integrate
+    temp = integrate.quad(lambda x: sin(x)/x, 0, a)
+    return temp[0]
+
+
+def j0_quad(s):
+    """Bessel function J0(s) by adaptive quadrature (reference)"""
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        return (1/pi) * profiler.quad('J0', lambda x: cos(s*sin(x)), 0, pi)
+    from scipy import integrate
+    temp = integrate.quad(lambda x: cos(s*sin(x)), 0, pi)
+    return (1/pi) * temp[0]
+
+
+def quad_g1(k0w):
+    """Slot self conductance G1 using the reference quadrature"""
+    X = k0w
+    I1 = -2 + cos(X) + X * si_quad(X) + sin(X)/X
+    return I1 / (120 * pi**2)
+
+
+def quad_g12(k0w, k0l):
+    """Mutual slot conductance G12 using the reference nested quadrature"""
+    integrand = lambda x: (((sin(k0w * cos(x) / 2) / cos(x)) ** 2) * j0_quad(k0l * sin(x)) * sin(x) ** 3)
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        return (1/(120*pi**2)) * profiler.quad('G12', integrand, 0, pi)
+    from scipy import integrate
+    temp = integrate.quad(integrand, 0, pi)
+    return (1/(120*pi**2))*temp[0]
+
+
+def _as_output(value, scalar):
+    return float(value) if scalar else value
+
+
+def fast_g1(k0w):
+    """Slot self conductance G1 from the sine integral
+
+    Accepts a float or array of k0*W values.
+    """
+    from scipy.special import sici
+    scalar = np.ndim(k0w) == 0
+    X = np.asarray(k0w, dtype=float)
+    I1 = -2 + np.cos(X) + X * sici(X)[0] + np.sin(X)/X
+    return _as_output(I1 / (120 * pi**2), scalar)
+
+
+def fast_g12(k0w, k0l):
+    """Mutual slot conductance G12 by fixed-order Gauss-Legendre quadrature
+
+    Accepts floats or broadcastable arrays of k0*W and k0*L values.
+    """
+    from scipy.special import j0
+    scalar = np.ndim(k0w) == 0 and np.ndim(k0l) == 0
+    X, Y = np.broadcast_arrays(np.asarray(k0w, dtype=float), np.asarray(k0l, dtype=float))
+    shape = X.shape
+    X = X.ravel()
+    Y = Y.ravel()
+    out = np.empty(X.size)
+    for start in range(0, X.size, _BLOCK_SIZE):
+        x = X[start:start + _BLOCK_SIZE, None]
+        y = Y[start:start + _BLOCK_SIZE, None]
+        f = (np.sin(x * _COS / 2) / _COS) ** 2 * j0(y * _SIN)
+        out[start:start + _BLOCK_SIZE] = f @ _SIN3_W
+    G12 = out.reshape(shape) / (120 * pi**2)
+    return _as_output(G12, scalar)
+
+
+def fast_gradient(k0w, k0l):
+    """Partial derivatives of G1 + G12 with respect to k0*W and k0*L
+
+    Differentiates the fast engine analytically (under the integral sign,
+    on the same Gauss-Legendre nodes). Returns (dG/dk0W, dG/dk0L).
+    """
+    from scipy.special import sici, j0, j1
+    scalar = np.ndim(k0w) == 0 and np.ndim(k0l) == 0
+    X, Y = np.broadcast_arrays(np.asarray(k0w, dtype=float), np.asarray(k0l, dtype=float))
+    dg1 = sici(X)[0] + (X * np.cos(X) - np.sin(X)) / X ** 2
+    x = X[..., None]
+    y = Y[..., None]
+    sin_half = np.sin(x * _COS / 2)
+    dg12_dx = (np.sin(x * _COS) / (2 * _COS)) * j0(y * _SIN) @ _SIN3_W
+    dg12_dy = -(sin_half / _COS) ** 2 * j1(y * _SIN) * _SIN @ _SIN3_W
+    d_dx = (dg1 + dg12_dx) / (120 * pi**2)
+    d_dy = dg12_dy / (120 * pi**2)
+    return _as_output(d_dx, scalar), _as_output(d_dy, scalar)
+
+
+def table_g1(k0w):
+    """Slot self conductance G1 from the cached lookup table"""
+    from .conductance_table import get_default_table
+    return get_default_table().g1(k0w)
+
+
+def table_g12(k0w, k0l):
+    """Mutual slot conductance G12 from the cached lookup table"""
+    from .conductance_table import get_default_table
+    return get_default_table().g12(k0w, k0l)
+
+
+ENGINES = {
+    QUAD: (quad_g1, quad_g12),
+    FAST: (fast_g1, fast_g12),
+    TABLE: (table_g1, table_g12),
+}
+
+# Bump an engine's version when its numbers change, so designs kept in a
+# persistent store (patch_antenna.store) are recomputed
+ENGINE_VERSIONS = {
+    QUAD: 1,
+    FAST: 1,
+    TABLE: 1,
+}
+
+
+def check_engine(name):
+    if name not in ENGINES:
+        raise ValueError('Engine should be : {}'.format(", ".join(sorted(ENGINES))))
+
+
+def set_default_engine(name):
+    """Select the conductance engine used when a design does not name one"""
+    global _default_engine
+    check_engine(name)
+    _default_engine = name
+
+
+def get_default_engine():
+    """Name of the conductance engine used by default"""
+    return _default_engine
+
+
+def resolve_engine(name=None):
+    """Return the engine name to use, falling back to the global default"""
+    if name is None:
+        return _default_engine
+    check_engine(name)
+    return name
+
+
+def get_engine(name=None):
+    """Return the (g1, g12) function pair for an engine name"""
+    return ENGINES[resolve_engine(name)]
+
+
+def input_impedance(k0w, k0l, engine=None):
+    """Input edge impedance 1 / (2 (G1 + G12)) for the selected engine"""
+    g1, g12 = get_engine(engine)
+    return 1 / (2 * (g1(k0w) + g12(k0w, k0l)))
@@ -0,0 +1,174 @@
+"""
+Precomputed conductance lookup table keyed on k0*W and k0*L.
+
+G1 and G12 depend only on the dimensionless products k0*W and k0*L, so a
+single 2-D table over the physically reachable region serves every
+frequency, dielectric constant and thickness. The table stores G/(k0*W)^2,
+which stays smooth and finite down to small patches, and is interpolated
+with bicubic splines.
+
+Reachable region: k0*W = pi*sqrt(2/(er+1)) lies in [0.014, pi*sqrt(2)] for
+0 < er <= 1e5, and |k0*L| <= pi whenever er >= 1. G12 is even in k0*L.
+Points outside the table fall back to the fast engine.
+
+The table is built once with the fast engine, saved to a cache file and
+loaded on later runs. Set PATCH_ANTENNA_CACHE_DIR to choose the cache
+directory (default ~/.cache/patch_antenna).
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import os
+
+import numpy as np
+from scipy.interpolate import CubicSpline, RectBivariateSpline
+
+from . import conductance
+
+TABLE_VERSION = 1
+
+K0W_RANGE = (0.01, 4.45)
+K0L_RANGE = (0.0, 3.2)
+GRID_SIZE = (129, 129)
+
+_default_table = None
+
+
+def default_cache_dir():
+    """Directory holding cached conductance tables"""
+    return os.environ.get('PATCH_ANTENNA_CACHE_DIR',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'patch_antenna'))
+
+
+def default_cache_path(grid_size=GRID_SIZE):
+    return os.path.join(default_cache_dir(),
+                        'conductance_table_v{}_{}x{}.npz'.format(TABLE_VERSION, *grid_size))
+
+
+class ConductanceTable:
+    """Interpolation table for G1(k0W) and G12(k0W, k0L)
+
+    Build with ConductanceTable.build() or load_or_build(). max_error holds
+    the largest relative input impedance error measured against the quad
+    reference at cell midpoints (None if never checked).
+    """
+
+    def __init__(self, k0w, k0l, g1, g12, max_error=None):
+        self.k0w = np.asarray(k0w, dtype=float)
+        self.k0l = np.asarray(k0l, dtype=float)
+        self.g1_values = np.asarray(g1, dtype=float)
+        self.g12_values = np.asarray(g12, dtype=float)
+        self.max_error = max_error
+        scale = self.k0w ** 2
+        self._g1_spline = CubicSpline(self.k0w, self.g1_values / scale)
+        self._g12_spline = RectBivariateSpline(self.k0w, self.k0l, self.g12_values / scale[:, None], kx=3, ky=3)
+
+    @classmethod
+    def build(cls, grid_size=GRID_SIZE, k0w_range=K0W_RANGE, k0l_range=K0L_RANGE, check_points=8):
+        """Tabulate the fast engine over the grid
+
+        check_points midpoints per axis are compared against the quad
+        reference to fill max_error; 0 skips the check.
+        """
+        k0w = np.linspace(k0w_range[0], k0w_range[1], grid_size[0])
+        k0l = np.linspace(k0l_range[0], k0l_range[1], grid_size[1])
+        g1 = conductance.fast_g1(k0w)
+        g12 = conductance.fast_g12(k0w[:, None], k0l[None, :])
+        table = cls(k0w, k0l, g1, g12)
+        if check_points:
+            table.max_error = table.check_error(check_points)
+        return table
+
+    def check_error(self, points=8):
+        """Largest relative input impedance error against the quad reference
+
+        Samples points x points cell midpoints spread across the table.
+        """
+        iw = np.linspace(0, self.k0w.size - 2, points).astype(int)
+        il = np.linspace(0, self.k0l.size - 2, points).astype(int)
+        worst = 0.0
+        for i in iw:
+            x = (self.k0w[i] + self.k0w[i + 1]) / 2
+            for j in il:
+                y = (self.k0l[j] + self.k0l[j + 1]) / 2
+                ref = 1 / (2 * (conductance.quad_g1(x) + conductance.quad_g12(x, y)))
+                approx = 1 / (2 * (self.g1(x) + self.g12(x, y)))
+                worst = max(worst, abs(approx - ref) / ref)
+        return worst
+
+    def contains(self, k0w, k0l):
+        """Mask of points inside the tabulated region"""
+        k0l = np.abs(k0l)
+        return ((k0w >= self.k0w[0]) & (k0w <= self.k0w[-1]) &
+                (k0l >= self.k0l[0]) & (k0l <= self.k0l[-1]))
+
+    def g1(self, k0w):
+        scalar = np.ndim(k0w) == 0
+        x = np.asarray(k0w, dtype=float)
+        inside = (x >= self.k0w[0]) & (x <= self.k0w[-1])
+        out = self._g1_spline(np.clip(x, self.k0w[0], self.k0w[-1])) * x ** 2
+        if not np.all(inside):
+            out = np.where(inside, out, conductance.fast_g1(x))
+        return float(out) if scalar else out
+
+    def g12(self, k0w, k0l):
+        scalar = np.ndim(k0w) == 0 and np.ndim(k0l) == 0
+        x, y = np.broadcast_arrays(np.asarray(k0w, dtype=float), np.abs(np.asarray(k0l, dtype=float)))
+        inside = self.contains(x, y)
+        out = self._g12_spline.ev(x, y) * x ** 2
+        if not np.all(inside):
+            out = np.asarray(out)
+            out[~inside] = conductance.fast_g12(x[~inside], y[~inside])
+        return float(out) if scalar else out
+
+    def save(self, path):
+        """Write the table to an .npz cache file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = '{}.{}.tmp.npz'.format(path, os.getpid())
+        np.savez(tmp, version=TABLE_VERSION, k0w=self.k0w, k0l=self.k0l, g1=self.g1_values,
+                 g12=self.g12_values, max_error=np.nan if self.max_error is None else self.max_error)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a table written by save(), None if missing or outdated"""
+        try:
+            with np.load(path) as data:
+                if int(data['version']) != TABLE_VERSION:
+                    return None
+                max_error = float(data['max_error'])
+                return cls(data['k0w'], data['k0l'], data['g1'], data['g12'],
+                           None if np.isnan(max_error) else max_error)
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def load_or_build(path=None, grid_size=GRID_SIZE):
+    """Load the cached table, building and saving it on first use"""
+    if path is None:
+        path = default_cache_path(grid_size)
+    table = ConductanceTable.load(path)
+    if table is None:
+        table = ConductanceTable.build(grid_size)
+        try:
+            table.save(path)
+        except OSError:
+            pass
+    return table
+
+
+def get_default_table():
+    """Table used by the 'table' conductance engine"""
+    global _default_table
+    if _default_table is None:
+        _default_table = load_or_build()
+    return _default_table
+
+
+def set_default_table(table):
+    """Replace the table used by the 'table' engine (None reloads lazily)"""
+    global _default_table
+    _default_table = table
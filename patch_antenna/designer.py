@@ -10,54 +10,70 @@ Supports professional RF design workflows with validation and optimization.
 """
 
 import math
-from math import cos, sin, sqrt, pi
-from scipy import integrate
+from math import sqrt, pi
 import json
-from gerber_writer import DataLayer, Path, set_generation_software
+import threading
+# gerber_writer is imported where Gerber output is generated, so callers
+# that only design antennas never load it
+from . import conductance
+from . import cache
+from . import gerber_cache
+from . import profiling
+from . import store
+from .output import write_text
 
 # Physical constants and design parameters
 light_velocity = 299792458  # Speed of light in m/s
 impedance = 50              # Standard impedance for RF systems
 
+# Valid input ranges checked by DesignPatch and design_batch
+min_frequency = 10 ** 6          # 1 MHz
+max_frequency = 100 * 10 ** 9    # 100 GHz
+max_dielectric_constant = 10 ** 5
+max_thickness = 1                # 1 m
+
 
 class Result:
     """Data structure for antenna design results
     
     Stores all calculated parameters for easy access and export.
     Used by design_result() function for structured output.
+    Uses __slots__ so large numbers of results stay compact.
     """
+    __slots__ = (
+        'frequency', 'patch_width', 'patch_length', 'feeder_width', 'feeder_length',
+        'inset_gap_width', 'inset_length', 'ground_length', 'ground_width',
+        'input_edge_impedance', 'edge_impedance'
+    )
+
     def __init__(self):
-        self.frequency = None
-        self.patch_width = None
-        self.patch_length = None
-        self.feeder_width = None
-        self.feeder_length = None
-        self.inset_gap_width = None
-        self.inset_length = None
-        self.ground_length = None
-        self.ground_width = None
-        self.input_edge_impedance = None
-
-
-def design_string(resonant_frequency, dielectric_constant, thickness):
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+    def as_dict(self):
+        """Return the result fields as a dict, in declaration order"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def design_string(resonant_frequency, dielectric_constant, thickness, engine=None):
     """Generate JSON string of antenna design parameters
     
     Convenience function for API integration and data export.
     Returns all design parameters as formatted JSON string.
     """
-    return json.dumps(design_result(resonant_frequency, dielectric_constant, thickness).__dict__, indent=4)
+    return json.dumps(design_result(resonant_frequency, dielectric_constant, thickness, engine).as_dict(), indent=4)
 
 
-def design_result(resonant_frequency, dielectric_constant, thickness):
+def design_result(resonant_frequency, dielectric_constant, thickness, engine=None):
     """Calculate antenna design and return structured result object
     
     Primary function for getting design parameters as Result object.
     Useful for programmatic access to individual parameters.
     """
-    return design(resonant_frequency, dielectric_constant, thickness).get_result()
+    return design(resonant_frequency, dielectric_constant, thickness, engine).get_result()
 
 
-def design(resonant_frequency, dielectric_constant, thickness):
+def design(resonant_frequency, dielectric_constant, thickness, engine=None):
     """Calculate patch antenna dimensions from basic parameters
     
     Core design function using transmission line model.
@@ -67,13 +83,35 @@ def design(resonant_frequency, dielectric_constant, thickness):
         resonant_frequency: Operating frequency in Hz
         dielectric_constant: Substrate relative permittivity
         thickness: Substrate thickness in meters
-    """
-    return DesignPatch(resonant_frequency, dielectric_constant, thickness)
+        engine: Conductance engine name ('quad', 'fast' or 'table'), None
+            for the global default set with conductance.set_default_engine()
 
-
-def design_with_material(frequency, material_name, thickness_mm=None):
+    Results are memoized when enable_design_cache() has been called and
+    read from / written to the persistent store after enable_design_store().
+    """
+    design_cache = cache.get_design_cache()
+    design_store = store.get_design_store()
+    if design_cache is None and design_store is None:
+        return DesignPatch(resonant_frequency, dielectric_constant, thickness, engine)
+    engine = conductance.resolve_engine(engine)
+
+    def create():
+        if design_store is None:
+            return DesignPatch(resonant_frequency, dielectric_constant, thickness, engine)
+        return design_store.get_or_create(
+            resonant_frequency, dielectric_constant, thickness, engine,
+            lambda: DesignPatch(resonant_frequency, dielectric_constant, thickness, engine))
+
+    if design_cache is None:
+        return create()
+    key = design_cache.make_key(resonant_frequency, dielectric_constant, thickness, engine)
+    return design_cache.get_or_create(key, create)
+
+
+def design_with_material(frequency, material_name, thickness_mm=None, engine=None):
     """Design antenna using material database"""
     from .materials import get_material, list_materials
+    from .catalog import catalog_design
     
     material = get_material(material_name)
     if not material:
@@ -86,16 +124,18 @@ def design_with_material(frequency, material_name, thickness_mm=None):
         print(f"Warning: {thickness_mm}mm not standard for {material_name}")
     
     thickness_m = thickness_mm / 1000  # Convert to meters
-    design = DesignPatch(frequency, material.dielectric_constant, thickness_m)
+    design_ = catalog_design(frequency, material.dielectric_constant, thickness_m, engine)
+    if design_ is None:
+        design_ = design(frequency, material.dielectric_constant, thickness_m, engine)
     
     # Add material info to design
-    design.material = material
-    design.thickness_mm = thickness_mm
+    design_.material = material
+    design_.thickness_mm = thickness_mm
     
-    return design
+    return design_
 
 
-def design_for_band(band_name, material_name, thickness_mm=None):
+def design_for_band(band_name, material_name, thickness_mm=None, engine=None):
     """Design antenna for specific frequency band"""
     from .frequency_bands import get_frequency, list_bands
     
@@ -103,7 +143,7 @@ def design_for_band(band_name, material_name, thickness_mm=None):
     if not frequency:
         raise ValueError(f"Unknown band: {band_name}. Available: {list_bands()}")
     
-    return design_with_material(frequency, material_name, thickness_mm)
+    return design_with_material(frequency, material_name, thickness_mm, engine)
 
 
 def quick_design(band_name, material_name='FR4', thickness_mm=1.6):
@@ -121,49 +161,78 @@ def quick_design(band_name, material_name='FR4', thickness_mm=1.6):
     return design
 
 
+def check_inputs(freq, er, h):
+    """Raise ValueError when design inputs are outside the supported ranges"""
+    if not min_frequency <= freq <= max_frequency:
+        raise ValueError("Frequency value should be in between 1MHz to 100 GHz")
+
+    if not 0 < er <= max_dielectric_constant:
+        raise ValueError("Dielectric constant value should be in greater than 0 and smaller or equals 100,000")
+
+    if not 0 < h <= max_thickness:
+        raise ValueError("Thickness value should be in greater than 0 and smaller or equals 1 meter")
+
+
 class DesignPatch:
-    """All parameter calculations"""
-    freq = None
-    er = None
-    h = None
-    patch_length = None
-    patch_lengthl_eff = None
-    patch_width = None
-    feeder_length = None
-    feeder_width = None
-    inset_gap = None
-    e_eff = None
-    delta_l = None
-    wavelength = None
-    electrical_length = None
-    ground_length = None
-    ground_width = None
-    inset_length = None
-    input_impedance = None
-
-    def __init__(self, freq, er, h):
+    """All parameter calculations
+
+    Attributes live in __slots__ rather than a per-instance __dict__, which
+    keeps millions of designs affordable. See patch_antenna.table.DesignTable
+    for a columnar container.
+    """
+    __slots__ = (
+        'freq', 'er', 'h',
+        'patch_length', 'patch_lengthl_eff', 'patch_width',
+        'feeder_length', 'feeder_width', 'inset_gap',
+        'e_eff', 'delta_l', 'wavelength', 'electrical_length',
+        'ground_length', 'ground_width', 'inset_length', 'input_impedance',
+        'engine', 'material', 'thickness_mm'
+    )
+
+    def __init__(self, freq, er, h, engine=None):
         """
         Designs the patch parameters
         Parameters:
             freq (float): Resonant frequency in Hz.
             er (float): Dielectric constant of the cavity material.
             h (float): Thickness of the cavity in m.
+            engine (str): Conductance engine, see patch_antenna.conductance.
+                None uses the global default.
         """
-        if not 10 ** 6 <= freq <= 100 * 10 ** 9:
-            raise ValueError("Frequency value should be in between 1MHz to 100 GHz")
-
-        if not 0 < er <= 10**5:
-            raise ValueError("Dielectric constant value should be in greater than 0 and smaller or equals 100,000")
-
-        if not 0 < h <= 1:
-            raise ValueError("Thickness value should be in greater than 0 and smaller or equals 1 meter")
+        check_inputs(freq, er, h)
 
         self.freq = freq
         self.er = er
         self.h = h
+        self.engine = conductance.resolve_engine(engine)
+        self.electrical_length = None
+        self.material = None
+        self.thickness_mm = None
         self.set_wavelength()
-        self.set_length_width_e_eff()
-        self.set_feeder_width_length()
+        profiler = profiling.get_profiler()
+        if profiler is None:
+            self.set_length_width_e_eff()
+            self.set_feeder_width_length()
+        else:
+            profiler.call('set_length_width_e_eff', self.set_length_width_e_eff)
+            profiler.call('set_feeder_width_length', self.set_feeder_width_length)
+
+    @classmethod
+    def from_fields(cls, fields, engine=None):
+        """Rebuild a design from stored parameters without recomputing it
+
+        fields maps attribute names to values. wavelength and
+        patch_lengthl_eff are derived when they are not given.
+        """
+        self = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(self, name, fields.get(name))
+        self.engine = fields.get('engine', engine)
+        if self.wavelength is None:
+            self.set_wavelength()
+        if self.patch_lengthl_eff is None:
+            self.patch_lengthl_eff = (self.wavelength / sqrt(self.e_eff)) / 2
+        return self
 
     def set_wavelength(self):
         self.wavelength = light_velocity / self.freq
@@ -209,28 +278,32 @@ class DesignPatch:
         return k0
 
     def S_i(self, a):
-        temp = integrate.quad(lambda x: sin(x)/x, 0, a)
-        return temp[0]
+        return conductance.si_quad(a)
 
     def getG1(self):
         k0 = self.get_k()
-        X = k0 * self.patch_width
-        I1 = -2 + cos(X) + X * self.S_i(X) + sin(X)/X
-        G1 = I1 / (120 * pi**2)
-        return G1
+        g1, _ = conductance.get_engine(self.engine)
+        return g1(k0 * self.patch_width)
 
     def J0(self, s):
-        temp = integrate.quad(lambda x: cos(s*sin(x)), 0, pi)
-        return (1/pi) * temp[0]
+        return conductance.j0_quad(s)
 
     def getG12(self):
         k0 = self.get_k()
-        temp = integrate.quad(lambda x: (((sin(k0 * self.patch_width * cos(x) / 2) / cos(x)) ** 2) * self.J0(k0 * self.patch_length * sin(x)) * sin(x) ** 3), 0, pi)
-        G12 = (1/(120*pi**2))*temp[0]
-        return G12
+        _, g12 = conductance.get_engine(self.engine)
+        return g12(k0 * self.patch_width, k0 * self.patch_length)
+
+    def radiation_pattern(self, theta=None, phi=None):
+        """Far-field pattern of the two-slot model, see patch_antenna.pattern"""
+        from .pattern import radiation_pattern
+        return radiation_pattern(self, theta, phi)
 
     def set_input_impedance(self):
-        G1, G12 = self.getG1(), self.getG12()
+        profiler = profiling.get_profiler()
+        if profiler is None:
+            G1, G12 = self.getG1(), self.getG12()
+        else:
+            G1, G12 = profiler.call('getG1', self.getG1), profiler.call('getG12', self.getG12)
         self.input_impedance = 1 / (2 * (G1 + G12))
 
 
@@ -249,7 +322,34 @@ class FeedType:
             raise ValueError('Type should be : {}'.format(", ".join(_valid_types)))
 
 
+# Use static values to avoid circular import
+GENERATION_SOFTWARE = ('Developed by: Leeds SpaceComms', 'pypi lib: patch_antenna', 'version: 0.1.0')
+_generation_software_lock = threading.Lock()
+_generation_software_set = False
+
+
+def _ensure_generation_software():
+    """Identify this library in Gerber headers, once per process
+
+    set_generation_software writes process-global state in gerber_writer,
+    so it is called a single time under a lock instead of per writer.
+    """
+    global _generation_software_set
+    if _generation_software_set:
+        return
+    from gerber_writer import set_generation_software
+    with _generation_software_lock:
+        if not _generation_software_set:
+            set_generation_software(*GENERATION_SOFTWARE)
+            _generation_software_set = True
+
+
 class PatchGerberWriter:
+    """Gerber artwork for one design
+
+    Writers hold no shared state, so separate threads may generate Gerber
+    files concurrently.
+    """
 
     def __init__(self, pa_design: DesignPatch):
         self.pl = m_to_mm(pa_design.patch_length)
@@ -259,8 +359,7 @@ class PatchGerberWriter:
         self.frl = m_to_mm(pa_design.get_fringing_l())
         self.il = m_to_mm(pa_design.inset_length)
         self.ig = m_to_mm(pa_design.inset_gap)
-        # Use static values to avoid circular import
-        set_generation_software('Developed by: Leeds SpaceComms', 'pypi lib: patch_antenna', 'version: 0.1.0')
+        _ensure_generation_software()
 
     def get_normal_feed_points(self):
         _st = (0, 0)
@@ -304,27 +403,75 @@ class PatchGerberWriter:
         ]
         return _st, pts
 
-    def write_gerber(self, path: str, _type: str = FeedType.NORMAL):
+    def get_feed_points(self, _type: str = FeedType.NORMAL):
+        """Start point and outline of the antenna for a feed type"""
         __type_dict = {
             FeedType.NORMAL: self.get_normal_feed_points,
             FeedType.INSET: self.get_inset_feed_points
         }
-        border_st, border_pts = self.get_border()
-        (init_x, init_y), pts = __type_dict.get(_type)()
+        return __type_dict.get(_type)()
+
+    def artwork_key(self, _type: str = FeedType.NORMAL):
+        """Content hash of the artwork, see gerber_cache.artwork_key"""
+        return gerber_cache.artwork_key(self, _type)
+
+    def get_size(self):
+        """Width and height of the board outline in mm"""
+        return (self.frl*2) + self.fl + self.pl, (self.frl*2) + self.pw
+
+    def add_antenna(self, layer, _type: str = FeedType.NORMAL, offset=(0, 0)):
+        """Add the antenna copper region to a DataLayer, shifted by offset (mm)"""
+        from gerber_writer import Path
+        (init_x, init_y), pts = self.get_feed_points(_type)
+        off_x, off_y = offset
 
-        profile_layer = DataLayer('Copper,L1,Top')
         _ant_prof = Path()
-        _ant_prof.moveto((init_x + self.frl, init_y + self.frl))
-        [_ant_prof.lineto((self.frl + x, self.frl + y)) for x, y in pts]
-        profile_layer.add_region(_ant_prof, 'Other,Antenna')
+        _ant_prof.moveto((init_x + self.frl + off_x, init_y + self.frl + off_y))
+        [_ant_prof.lineto((self.frl + x + off_x, self.frl + y + off_y)) for x, y in pts]
+        layer.add_region(_ant_prof, 'Other,Antenna')
+
+    def add_border(self, layer, offset=(0, 0)):
+        """Add the board outline traces to a DataLayer, shifted by offset (mm)"""
+        from gerber_writer import Path
+        border_st, border_pts = self.get_border()
+        off_x, off_y = offset
 
         _bord_prof = Path()
-        _bord_prof.moveto(border_st)
-        [_bord_prof.lineto(_pts) for _pts in border_pts]
-        profile_layer.add_traces_path(_bord_prof, 0.5, 'Profile')
+        _bord_prof.moveto((border_st[0] + off_x, border_st[1] + off_y))
+        [_bord_prof.lineto((x + off_x, y + off_y)) for x, y in border_pts]
+        layer.add_traces_path(_bord_prof, 0.5, 'Profile')
+
+    def dumps_gerber(self, _type: str = FeedType.NORMAL):
+        """Return the Gerber file for the antenna and its outline as a string
+
+        Served from the artwork cache when enable_gerber_cache() is on.
+        """
+        profiler = profiling.get_profiler()
+        if profiler is not None:
+            with profiler.stage('dumps_gerber'):
+                return self._dumps_gerber(_type)
+        return self._dumps_gerber(_type)
+
+    def _dumps_gerber(self, _type):
+        artwork = gerber_cache.get_gerber_cache()
+        if artwork is None:
+            return self._generate(_type)
+        return artwork.get_or_create(self.artwork_key(_type), lambda: self._generate(_type))
+
+    def _generate(self, _type):
+        from gerber_writer import DataLayer
+        profile_layer = DataLayer('Copper,L1,Top')
+        self.add_antenna(profile_layer, _type)
+        self.add_border(profile_layer)
+        return profile_layer.dumps_gerber()
+
+    def gerber_bytes(self, _type: str = FeedType.NORMAL):
+        """Return the Gerber file as ASCII bytes"""
+        return self.dumps_gerber(_type).encode('ascii')
 
-        with open(path, 'w') as outfile:
-            profile_layer.dump_gerber(outfile)
+    def write_gerber(self, path, _type: str = FeedType.NORMAL):
+        """Write the Gerber file to a path or to a text or binary stream"""
+        write_text(path, self.dumps_gerber(_type))
 
 
 def write_gerber(resonant_frequency, dielectric_constant, thickness, file_name, feed_type):
@@ -333,9 +480,16 @@ def write_gerber(resonant_frequency, dielectric_constant, thickness, file_name,
     write_gerber_design(d, file_name, feed_type)
 
 
-def write_gerber_design(design_: DesignPatch, file_name, feed_type=FeedType.NORMAL):
+def write_gerber_design(design_: DesignPatch, file_name=None, feed_type=FeedType.NORMAL):
+    """Write the Gerber file of a design
+
+    file_name may be a path or a text/binary stream. With file_name None
+    nothing is written and the Gerber file is returned as bytes.
+    """
     FeedType.check(feed_type)
     gw = PatchGerberWriter(design_)
+    if file_name is None:
+        return gw.gerber_bytes(feed_type)
     gw.write_gerber(file_name, feed_type)
 
 
@@ -9,6 +9,51 @@ Added by Al-Musbahi - Leeds SpaceComms
 (Enhancement to original library by Bhanuchander Udhayakumar)
 """
 
+from .output import write_text
+
+# Fabrication tolerances quoted in the manufacturing notes, in meters
+MANUFACTURING_TOLERANCES = {
+    'patch': 0.05e-3,
+    'feed_width': 0.02e-3,
+    'inset': 0.02e-3,
+}
+
+def format_design_summary(design):
+    """
+    Build the design summary document as a string.
+    
+    Contains all key design parameters, dimensions, and electrical
+    properties. Used by export_design_summary() and the bundle writer.
+    
+    Args:
+        design: Antenna design object containing all parameters
+    
+    Returns:
+        Summary text
+    """
+    lines = [
+        "Patch Antenna Design Summary\n",
+        "=" * 30 + "\n\n",
+        
+        f"Operating Frequency: {design.freq/1e9:.3f} GHz\n",
+        f"Substrate Er: {design.er}\n",
+        f"Substrate Thickness: {design.h*1000:.2f} mm\n\n",
+        
+        "Patch Dimensions:\n",
+        f"  Width: {design.patch_width*1000:.2f} mm\n",
+        f"  Length: {design.patch_length*1000:.2f} mm\n\n",
+        
+        "Feed Dimensions:\n",
+        f"  Width: {design.feeder_width*1000:.2f} mm\n",
+        f"  Length: {design.feeder_length*1000:.2f} mm\n",
+        f"  Inset Length: {design.inset_length*1000:.2f} mm\n\n",
+        
+        "Electrical Properties:\n",
+        f"  Input Impedance: {design.input_impedance:.1f} Ohm\n",
+        f"  Effective Dielectric: {design.e_eff:.2f}\n",
+    ]
+    return "".join(lines)
+
 def export_design_summary(design, filename):
     """
     Export a comprehensive design summary to text file.
@@ -19,31 +64,47 @@ def export_design_summary(design, filename):
     
     Args:
         design: Antenna design object containing all parameters
-        filename: Output filename for the summary document
+        filename: Output filename for the summary document, or an open
+            text or binary stream
     
     Returns:
         None (writes summary to specified file)
     """
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write("Patch Antenna Design Summary\n")
-        f.write("=" * 30 + "\n\n")
-        
-        f.write(f"Operating Frequency: {design.freq/1e9:.3f} GHz\n")
-        f.write(f"Substrate Er: {design.er}\n")
-        f.write(f"Substrate Thickness: {design.h*1000:.2f} mm\n\n")
+    write_text(filename, format_design_summary(design), encoding='utf-8')
+
+def format_manufacturing_notes(design):
+    """
+    Build the manufacturing guidelines document as a string.
+    
+    Contains PCB specifications, critical dimensions, and tolerances.
+    Used by export_manufacturing_notes() and the bundle writer.
+    
+    Args:
+        design: Antenna design object containing all parameters
+    
+    Returns:
+        Manufacturing notes text
+    """
+    lines = [
+        "Manufacturing Guidelines\n",
+        "=" * 25 + "\n\n",
         
-        f.write("Patch Dimensions:\n")
-        f.write(f"  Width: {design.patch_width*1000:.2f} mm\n")
-        f.write(f"  Length: {design.patch_length*1000:.2f} mm\n\n")
+        "PCB Specifications:\n",
+        f"  Substrate: Er = {design.er}\n",
+        f"  Thickness: {design.h*1000:.2f} mm\n",
+        f"  Copper: 1 oz (35 micrometers)\n\n",
         
-        f.write("Feed Dimensions:\n")
-        f.write(f"  Width: {design.feeder_width*1000:.2f} mm\n")
-        f.write(f"  Length: {design.feeder_length*1000:.2f} mm\n")
-        f.write(f"  Inset Length: {design.inset_length*1000:.2f} mm\n\n")
+        "Critical Dimensions:\n",
+        f"  Patch: {design.patch_width*1000:.2f} x {design.patch_length*1000:.2f} mm\n",
+        f"  Feed line: {design.feeder_width*1000:.2f} mm wide\n",
+        f"  Inset: {design.inset_length*1000:.2f} mm deep\n\n",
         
-        f.write("Electrical Properties:\n")
-        f.write(f"  Input Impedance: {design.input_impedance:.1f} Ohm\n")
-        f.write(f"  Effective Dielectric: {design.e_eff:.2f}\n")
+        "Tolerances:\n",
+        f"  Patch dimensions: +/-{MANUFACTURING_TOLERANCES['patch']*1000:.2f} mm\n",
+        f"  Feed line width: +/-{MANUFACTURING_TOLERANCES['feed_width']*1000:.2f} mm\n",
+        f"  Inset depth: +/-{MANUFACTURING_TOLERANCES['inset']*1000:.2f} mm\n",
+    ]
+    return "".join(lines)
 
 def export_manufacturing_notes(design, filename):
     """
@@ -55,26 +116,10 @@ def export_manufacturing_notes(design, filename):
     
     Args:
         design: Antenna design object containing all parameters
-        filename: Output filename for the manufacturing guide
+        filename: Output filename for the manufacturing guide, or an open
+            text or binary stream
     
     Returns:
         None (writes manufacturing notes to specified file)
     """
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write("Manufacturing Guidelines\n")
-        f.write("=" * 25 + "\n\n")
-        
-        f.write("PCB Specifications:\n")
-        f.write(f"  Substrate: Er = {design.er}\n")
-        f.write(f"  Thickness: {design.h*1000:.2f} mm\n")
-        f.write(f"  Copper: 1 oz (35 micrometers)\n\n")
-        
-        f.write("Critical Dimensions:\n")
-        f.write(f"  Patch: {design.patch_width*1000:.2f} x {design.patch_length*1000:.2f} mm\n")
-        f.write(f"  Feed line: {design.feeder_width*1000:.2f} mm wide\n")
-        f.write(f"  Inset: {design.inset_length*1000:.2f} mm deep\n\n")
-        
-        f.write("Tolerances:\n")
-        f.write("  Patch dimensions: +/-0.05 mm\n")
-        f.write("  Feed line width: +/-0.02 mm\n")
-        f.write("  Inset depth: +/-0.02 mm\n")
+    write_text(filename, format_manufacturing_notes(design), encoding='utf-8')
@@ -7,8 +7,18 @@ Added by Al-Musbahi for Leeds SpaceComms
 Comprehensive database of standard frequency allocations for wireless
 applications. Enables rapid antenna design for specific use cases
 without manual frequency lookup.
+
+Besides the design frequencies in FREQUENCY_BANDS, every band has lower
+and upper edges and lives in a BandDatabase. Allocation tables with
+thousands of entries (ITU or regional plans) can be loaded from CSV or
+JSON with load_bands() or added with register_band(). The database keeps
+a sorted interval index, so find_overlapping_bands() and nearest_band()
+answer in logarithmic time per band found, however wide or nested the
+allocations are.
 """
 
+from bisect import bisect_left, bisect_right
+
 # Standard frequency allocations for wireless applications
 FREQUENCY_BANDS = {
     'GPS_L1': 1.575e9,
@@ -30,30 +40,288 @@ FREQUENCY_BANDS = {
     'UWB': 6.5e9
 }
 
+# Allocation edges (lower, upper) in Hz of the standard bands
+BAND_EDGES = {
+    'GPS_L1': (1.56342e9, 1.58742e9),
+    'GPS_L2': (1.2156e9, 1.2396e9),
+    'WIFI_2_4GHZ': (2.4e9, 2.4835e9),
+    'WIFI_5GHZ': (5.15e9, 5.85e9),
+    'BLUETOOTH': (2.4e9, 2.4835e9),
+    'ISM_433MHZ': (433.05e6, 434.79e6),
+    'ISM_868MHZ': (863e6, 870e6),
+    'ISM_915MHZ': (902e6, 928e6),
+    'LORA_EU': (863e6, 870e6),
+    'LORA_US': (902e6, 928e6),
+    'CELLULAR_GSM900': (880e6, 960e6),
+    'CELLULAR_GSM1800': (1.71e9, 1.88e9),
+    'CELLULAR_LTE_B1': (1.92e9, 2.17e9),
+    'CELLULAR_LTE_B3': (1.71e9, 1.88e9),
+    'CELLULAR_LTE_B7': (2.5e9, 2.69e9),
+    'ZIGBEE': (2.4e9, 2.4835e9),
+    'UWB': (3.1e9, 10.6e9)
+}
+
+# Frequency units accepted by load_bands()
+UNITS = {'HZ': 1.0, 'KHZ': 1e3, 'MHZ': 1e6, 'GHZ': 1e9}
+
+
+class FrequencyBand:
+    """A named allocation from lower to upper Hz
+
+    frequency is the design frequency returned by get_frequency(); it
+    defaults to the middle of the band.
+    """
+    __slots__ = ('name', 'lower', 'upper', 'frequency', 'service')
+
+    def __init__(self, name, lower, upper=None, frequency=None, service=None):
+        lower = float(lower)
+        upper = lower if upper is None else float(upper)
+        if not 0 <= lower <= upper:
+            raise ValueError(f"Band {name}: edges should satisfy 0 <= lower <= upper")
+        self.name = name
+        self.lower = lower
+        self.upper = upper
+        self.frequency = (lower + upper) / 2 if frequency is None else float(frequency)
+        self.service = service
+
+    @property
+    def bandwidth(self):
+        return self.upper - self.lower
+
+    def distance(self, frequency):
+        """Hz from frequency to the band, 0 inside it"""
+        return max(self.lower - frequency, frequency - self.upper, 0.0)
+
+    def __repr__(self):
+        return 'FrequencyBand({!r}, {!r}, {!r}, {!r})'.format(self.name, self.lower, self.upper, self.frequency)
+
+
+class BandDatabase:
+    """Bands by name with a sorted interval index
+
+    The index holds the bands sorted by lower edge and a max segment tree
+    over them: each node keeps the highest upper edge of its range. An
+    overlap query bisects the lower edges and descends only into nodes
+    reaching the query, so wide or nested allocations do not slow down
+    queries elsewhere; a query costs O((k + 1) log n) for k results.
+
+    The index is rebuilt on the first query after a change; an index built
+    while bands were being added is tagged with the older generation and
+    rebuilt again, so no lock is needed.
+    """
+
+    def __init__(self, bands=()):
+        self._bands = {}
+        self._generation = 0
+        self._index = (-1, None)
+        for band in bands:
+            self.add(band)
+
+    def __len__(self):
+        return len(self._bands)
+
+    def __contains__(self, name):
+        return name.upper() in self._bands
+
+    def __iter__(self):
+        return iter(self._bands.values())
+
+    def add(self, band):
+        """Add a FrequencyBand, replacing any band of the same name"""
+        self._bands[band.name.upper()] = band
+        self._generation += 1
+
+    def get(self, name):
+        """Band by case-insensitive name, or None"""
+        return self._bands.get(name.upper())
+
+    def names(self):
+        return [band.name for band in self._bands.values()]
+
+    def load(self, path, unit='Hz'):
+        """Add the bands of a CSV or JSON allocation table
+
+        CSV files need name, lower and upper columns and may have
+        frequency and service columns. JSON files hold a list of objects
+        with the same keys, or an object with such a list under "bands".
+        Frequencies are in unit (Hz, kHz, MHz or GHz). Returns the number
+        of bands added; a row without name or lower edge, or with a value
+        that is not a number, raises ValueError naming the row and adds
+        nothing.
+        """
+        import csv
+        import json
+
+        scale = UNITS.get(unit.upper())
+        if scale is None:
+            raise ValueError('Unit should be : {}'.format(", ".join(['Hz', 'kHz', 'MHz', 'GHz'])))
+        with open(path, 'r', encoding='utf-8', newline='') as infile:
+            if path.lower().endswith('.json'):
+                rows = json.load(infile)
+                rows = rows['bands'] if isinstance(rows, dict) else rows
+            else:
+                rows = list(csv.DictReader(infile))
+
+        def value(row, key):
+            item = row.get(key)
+            return None if item is None or item == '' else float(item) * scale
+
+        bands = []
+        for number, row in enumerate(rows, 1):
+            try:
+                if not row.get('name') or value(row, 'lower') is None:
+                    raise ValueError('name and lower are required')
+                bands.append(FrequencyBand(row['name'], value(row, 'lower'), value(row, 'upper'),
+                                           value(row, 'frequency'), row.get('service') or None))
+            except (ValueError, TypeError, AttributeError) as e:
+                raise ValueError('Band row {} of {}: {}'.format(number, path, e)) from None
+        for band in bands:
+            self._bands[band.name.upper()] = band
+        self._generation += 1
+        return len(bands)
+
+    def _get_index(self):
+        generation, index = self._index
+        if generation == self._generation:
+            return index
+        generation = self._generation
+        bands = sorted(list(self._bands.values()), key=lambda b: (b.lower, b.upper, b.name))
+        lowers = [band.lower for band in bands]
+        # reach_at[i]: the band reaching furthest among bands[:i + 1]
+        reach_at = []
+        for i, band in enumerate(bands):
+            reach_at.append(i if not reach_at or band.upper > bands[reach_at[-1]].upper else reach_at[-1])
+        # Max segment tree over the upper edges, leaves from node size on
+        size = 1
+        while size < len(bands):
+            size *= 2
+        tree = [float('-inf')] * (2 * size)
+        tree[size:size + len(bands)] = [band.upper for band in bands]
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        by_frequency = sorted(bands, key=lambda b: b.frequency)
+        frequencies = [band.frequency for band in by_frequency]
+        index = (bands, lowers, tree, size, reach_at, by_frequency, frequencies)
+        self._index = (generation, index)
+        return index
+
+    def overlapping(self, min_freq, max_freq):
+        """Bands sharing any frequency with [min_freq, max_freq], by lower edge"""
+        bands, lowers, tree, size, _, _, _ = self._get_index()
+        # Bands from hi on start above max_freq; of the others report those
+        # ending at or above min_freq, skipping subtrees that end below it
+        hi = bisect_right(lowers, max_freq)
+        found = []
+        stack = [(1, 0, size)]
+        while stack:
+            node, start, end = stack.pop()
+            if start >= hi or tree[node] < min_freq:
+                continue
+            if node >= size:
+                found.append(bands[start])
+            else:
+                middle = (start + end) // 2
+                stack.append((2 * node + 1, middle, end))
+                stack.append((2 * node, start, middle))
+        return found
+
+    def containing(self, frequency):
+        """Bands whose edges include frequency"""
+        return self.overlapping(frequency, frequency)
+
+    def nearest(self, frequency):
+        """Band containing frequency, else the one with the closest edge
+
+        Among bands containing frequency the narrowest wins. Returns None
+        for an empty database.
+        """
+        containing = self.containing(frequency)
+        if containing:
+            return min(containing, key=lambda band: band.bandwidth)
+        bands, lowers, _, _, reach_at, _, _ = self._get_index()
+        hi = bisect_right(lowers, frequency)
+        # Nothing contains frequency, so the band reaching furthest among
+        # those starting below it ends below it
+        below = bands[reach_at[hi - 1]] if hi else None
+        above = bands[hi] if hi < len(bands) else None
+        if below is None or (above is not None and above.distance(frequency) < below.distance(frequency)):
+            return above
+        return below
+
+    def in_range(self, min_freq, max_freq):
+        """Bands whose design frequency lies in [min_freq, max_freq]"""
+        _, _, _, _, _, by_frequency, frequencies = self._get_index()
+        return by_frequency[bisect_left(frequencies, min_freq):bisect_right(frequencies, max_freq)]
+
+
+_database = BandDatabase(FrequencyBand(name, *BAND_EDGES[name], frequency=frequency)
+                         for name, frequency in FREQUENCY_BANDS.items())
+
+
+def get_band_database():
+    """The BandDatabase behind the module functions"""
+    return _database
+
+
+def register_band(name, lower, upper=None, frequency=None, service=None):
+    """Add a band to the database and return it
+
+    Registered bands work with get_frequency() and design_for_band().
+    The design frequencies in FREQUENCY_BANDS keep precedence in
+    get_frequency() for their names.
+    """
+    band = FrequencyBand(name, lower, upper, frequency, service)
+    _database.add(band)
+    return band
+
+
+def load_bands(path, unit='Hz'):
+    """Load an allocation table into the database, see BandDatabase.load()"""
+    return _database.load(path, unit)
+
+
 def get_frequency(band_name):
     """Retrieve frequency for specific band
-    
+
     Case-insensitive lookup for predefined frequency bands.
     Returns frequency in Hz or None if band not found.
     """
-    return FREQUENCY_BANDS.get(band_name.upper())
+    frequency = FREQUENCY_BANDS.get(band_name.upper())
+    if frequency is None:
+        band = _database.get(band_name)
+        frequency = None if band is None else band.frequency
+    return frequency
 
 def list_bands():
     """Get list of available frequency bands
-    
+
     Returns list of all bands in the database.
     Use with get_frequency() to access values.
     """
-    return list(FREQUENCY_BANDS.keys())
+    return list(FREQUENCY_BANDS.keys()) + [band.name for band in _database
+                                           if band.name.upper() not in FREQUENCY_BANDS]
 
 def find_bands_in_range(min_freq, max_freq):
     """Find frequency bands within specified range
-    
+
     Useful for identifying relevant bands for broadband applications
     or regulatory analysis.
-    
+
     Args:
         min_freq: Minimum frequency in Hz
         max_freq: Maximum frequency in Hz
+
+    Returns a dict of band name -> frequency for the bands in
+    FREQUENCY_BANDS, including runtime edits of it. Bands added with
+    load_bands() or register_band() are not included; use
+    find_overlapping_bands() to search the whole database by band edges.
     """
     return {k: v for k, v in FREQUENCY_BANDS.items() if min_freq <= v <= max_freq}
+
+def find_overlapping_bands(min_freq, max_freq):
+    """FrequencyBands whose edges overlap [min_freq, max_freq]"""
+    return _database.overlapping(min_freq, max_freq)
+
+def nearest_band(frequency):
+    """FrequencyBand containing frequency, or the closest one"""
+    return _database.nearest(frequency)
@@ -0,0 +1,197 @@
+"""
+Opt-in content-addressed cache of generated Gerber artwork.
+
+A Gerber file is fully determined by its geometry: the feed outline from
+get_normal_feed_points/get_inset_feed_points, the board border and the
+feed type. artwork_key() hashes those points, rounded to the 6 decimals the
+writer emits, so two designs that produce identical copper share one entry
+whatever frequency or material they came from.
+
+When enabled, PatchGerberWriter.dumps_gerber (and everything built on it:
+write_gerber, write_gerber_design, write_bundle) looks the key up before
+generating. With a directory the artwork is also kept on disk as
+<directory>/<key[:2]>/<key>.gbr, so regenerating a large library in a new
+process only redoes the designs whose geometry changed. A cached file keeps
+the CreationDate of the run that first produced it.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+ARTWORK_VERSION = 1
+DECIMALS = 6  # Gerber coordinate resolution used by gerber_writer (%FSLAX36Y36)
+
+_gerber_cache = None
+
+
+def artwork_key(writer, feed_type):
+    """Hex digest identifying the artwork a PatchGerberWriter produces
+
+    Hashes the rounded antenna outline (with its fringing offset), the
+    board border, the feed type and the generation software fields.
+    """
+    from .designer import GENERATION_SOFTWARE
+
+    (st_x, st_y), pts = writer.get_feed_points(feed_type)
+    border_st, border_pts = writer.get_border()
+    outline = [(st_x + writer.frl, st_y + writer.frl)]
+    outline += [(writer.frl + x, writer.frl + y) for x, y in pts]
+    parts = [str(ARTWORK_VERSION), feed_type, '|'.join(GENERATION_SOFTWARE)]
+    for points in (outline, [border_st] + list(border_pts)):
+        # Adding 0.0 folds -0.0 onto 0.0 after rounding
+        parts.append(';'.join('{!r},{!r}'.format(round(x, DECIMALS) + 0.0, round(y, DECIMALS) + 0.0)
+                              for x, y in points))
+    text = '\n'.join(parts)
+    return hashlib.sha256(text.encode('ascii')).hexdigest()
+
+
+class GerberCache:
+    """Bounded in-memory LRU of Gerber text, optionally backed by a directory
+
+    Safe to share between threads. Concurrent misses on the same key may
+    both generate; the artwork is identical, so the last write wins.
+    """
+
+    def __init__(self, directory=None, maxsize=4096):
+        if maxsize < 1:
+            raise ValueError("Cache size should be at least 1")
+        self.directory = directory
+        self.maxsize = maxsize
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def path(self, key):
+        """File holding the artwork for key, None without a directory"""
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, key[:2], key + '.gbr')
+
+    def _remember(self, key, text):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _read(self, key):
+        path = self.path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', newline='') as infile:
+                return infile.read()
+        except OSError:
+            return None
+
+    def _write(self, key, text):
+        path = self.path(key)
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+        with open(tmp, 'w', newline='') as outfile:
+            outfile.write(text)
+        os.replace(tmp, path)
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._entries:
+                return True
+        path = self.path(key)
+        return path is not None and os.path.exists(path)
+
+    def get_or_create(self, key, factory):
+        """Return the artwork for key, calling factory() only on a miss"""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+        text = self._read(key)
+        if text is not None:
+            with self._lock:
+                self.hits += 1
+                self.disk_hits += 1
+            self._remember(key, text)
+            return text
+        with self._lock:
+            self.misses += 1
+        text = factory()
+        self._write(key, text)
+        self._remember(key, text)
+        return text
+
+    def clear(self, remove_files=False):
+        """Drop the in-memory entries and counters, and the files if asked"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+        if remove_files and self.directory is not None:
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith('.gbr'):
+                        os.remove(os.path.join(root, name))
+
+    def stats(self):
+        """Counters as a plain dict, suitable for metrics export"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def enable_gerber_cache(directory=None, maxsize=4096):
+    """Turn on artwork caching, replacing any existing cache
+
+    With a directory, artwork persists across processes.
+    """
+    global _gerber_cache
+    _gerber_cache = GerberCache(directory, maxsize)
+    return _gerber_cache
+
+
+def disable_gerber_cache():
+    """Turn off artwork caching (files on disk are kept)"""
+    global _gerber_cache
+    _gerber_cache = None
+
+
+def get_gerber_cache():
+    """The active GerberCache, or None when caching is off"""
+    return _gerber_cache
+
+
+def clear_gerber_cache(remove_files=False):
+    """Empty the active cache, if any"""
+    if _gerber_cache is not None:
+        _gerber_cache.clear(remove_files)
+
+
+def gerber_cache_stats():
+    """Counters of the active cache, None when caching is off"""
+    if _gerber_cache is None:
+        return None
+    return _gerber_cache.stats()
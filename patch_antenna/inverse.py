@@ -0,0 +1,257 @@
+"""
+Inverse design: solve the transmission line model for a target.
+
+Instead of sweeping design() and filtering, these solvers run Newton
+iterations safeguarded by a bracket (bisection whenever a Newton step
+would leave it). Derivatives come from differentiating the
+set_length_width_e_eff formulas analytically (sizing_jacobian) and, for
+impedance targets, from conductance.fast_gradient, so a solve takes a
+handful of model evaluations. Impedance targets are met with the engine
+the caller asks for.
+
+Supported targets:
+    solve_frequency              - resonant frequency of a given patch length
+    solve_dielectric_constant    - er giving a target patch length or width
+    solve_for_edge_impedance     - er or h giving a target edge impedance
+    solve_inset_length           - inset depth matching a target impedance
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+from math import acos, pi, sqrt
+
+from . import conductance
+from .designer import (
+    DesignPatch, light_velocity, impedance,
+    min_frequency, max_frequency, max_dielectric_constant
+)
+
+VARIABLES = ('freq', 'er', 'h')
+
+
+class InverseSolution:
+    """Outcome of an inverse solve
+
+    value is the solved variable, design the DesignPatch built from it and
+    evaluations the number of model evaluations used.
+    """
+
+    def __init__(self, variable, value, design, iterations, evaluations):
+        self.variable = variable
+        self.value = value
+        self.design = design
+        self.iterations = iterations
+        self.evaluations = evaluations
+
+    def __repr__(self):
+        return 'InverseSolution({}={:g}, iterations={}, evaluations={})'.format(
+            self.variable, self.value, self.iterations, self.evaluations)
+
+
+def sizing_jacobian(freq, er, h):
+    """Closed-form sizing values and their derivatives
+
+    Evaluates the set_length_width_e_eff formulas together with their
+    partial derivatives with respect to freq, er and h.
+
+    Returns:
+        (values, derivatives) where values maps 'patch_width', 'e_eff',
+        'delta_l', 'patch_lengthl_eff' and 'patch_length' to floats and
+        derivatives maps the same names to {'freq': d/dfreq, 'er': d/der,
+        'h': d/dh}.
+    """
+    W = (light_velocity / (2 * freq)) * sqrt(2 / (er + 1))
+    dW = {'freq': -W / freq, 'er': -W / (2 * (er + 1)), 'h': 0.0}
+
+    temp = 1 + 12 * (h / W)
+    e_eff = ((er + 1) / 2) + ((er - 1) / 2) * temp ** -0.5
+    de_dtemp = ((er - 1) / 2) * -0.5 * temp ** -1.5
+    dtemp = {v: -12 * h / W ** 2 * dW[v] for v in VARIABLES}
+    dtemp['h'] += 12 / W
+    de = {v: de_dtemp * dtemp[v] for v in VARIABLES}
+    de['er'] += 0.5 + 0.5 * temp ** -0.5
+
+    r = W / h
+    ratio_e = (e_eff + 0.3) / (e_eff - 0.258)
+    ratio_r = (r + 0.264) / (r + 0.8)
+    delta_l = h * 0.412 * ratio_e * ratio_r
+    dratio_e = -0.558 / (e_eff - 0.258) ** 2
+    dratio_r = 0.536 / (r + 0.8) ** 2
+    dr = {v: dW[v] / h for v in VARIABLES}
+    dr['h'] -= W / h ** 2
+    ddelta = {v: 0.412 * h * (dratio_e * de[v] * ratio_r + ratio_e * dratio_r * dr[v]) for v in VARIABLES}
+    ddelta['h'] += delta_l / h
+
+    wavelength = light_velocity / freq
+    l_eff = (wavelength / sqrt(e_eff)) / 2
+    dl_eff = {v: -l_eff / (2 * e_eff) * de[v] for v in VARIABLES}
+    dl_eff['freq'] -= l_eff / freq
+
+    patch_length = l_eff - 2 * delta_l
+    dL = {v: dl_eff[v] - 2 * ddelta[v] for v in VARIABLES}
+
+    values = {
+        'patch_width': W, 'e_eff': e_eff, 'delta_l': delta_l,
+        'patch_lengthl_eff': l_eff, 'patch_length': patch_length
+    }
+    derivatives = {
+        'patch_width': dW, 'e_eff': de, 'delta_l': ddelta,
+        'patch_lengthl_eff': dl_eff, 'patch_length': dL
+    }
+    return values, derivatives
+
+
+def edge_impedance_and_derivative(freq, er, h, variable, engine=conductance.FAST):
+    """Edge impedance from engine and its derivative
+
+    variable names the input ('freq', 'er' or 'h') to differentiate by.
+    The derivative always comes from the fast engine's gradient, which
+    matches every engine to far better than a Newton step needs.
+    """
+    values, derivatives = sizing_jacobian(freq, er, h)
+    k0 = 2 * pi * freq / light_velocity
+    k0w = k0 * values['patch_width']
+    k0l = k0 * values['patch_length']
+    if engine == conductance.FAST:
+        G = conductance.fast_g1(k0w) + conductance.fast_g12(k0w, k0l)
+    else:
+        G = 1 / (2 * conductance.input_impedance(k0w, k0l, engine))
+    dG_dx, dG_dy = conductance.fast_gradient(k0w, k0l)
+    dk0w = k0 * derivatives['patch_width'][variable]
+    dk0l = k0 * derivatives['patch_length'][variable]
+    if variable == 'freq':
+        dk0w += k0w / freq
+        dk0l += k0l / freq
+    dG = dG_dx * dk0w + dG_dy * dk0l
+    Z = 1 / (2 * G)
+    return Z, -dG / (2 * G ** 2)
+
+
+def _solve_bracketed(fun, lo, hi, x0=None, xtol=1e-12, maxiter=100):
+    """Safeguarded Newton iteration for fun(x) = (residual, derivative)
+
+    Keeps a sign-change bracket [lo, hi] and falls back to bisection when a
+    Newton step would leave it. Returns (root, iterations, evaluations).
+    """
+    f_lo, _ = fun(lo)
+    f_hi, _ = fun(hi)
+    evaluations = 2
+    if f_lo == 0:
+        return lo, 0, evaluations
+    if f_hi == 0:
+        return hi, 0, evaluations
+    if (f_lo > 0) == (f_hi > 0):
+        raise ValueError("Target is not reachable inside the search interval")
+
+    x = (lo + hi) / 2 if x0 is None else min(max(x0, lo), hi)
+    for iteration in range(1, maxiter + 1):
+        f, df = fun(x)
+        evaluations += 1
+        if f == 0:
+            return x, iteration, evaluations
+        if (f > 0) == (f_lo > 0):
+            lo, f_lo = x, f
+        else:
+            hi = x
+        step = f / df if df else None
+        x_new = x - step if step is not None else None
+        if x_new is None or not lo < x_new < hi:
+            x_new = (lo + hi) / 2
+        if abs(x_new - x) <= xtol * max(abs(x_new), 1.0) or hi - lo <= xtol * max(abs(hi), 1.0):
+            return x_new, iteration, evaluations
+        x = x_new
+    raise ValueError("Inverse solve did not converge")
+
+
+def solve_frequency(patch_length, er, h, engine=None):
+    """Resonant frequency at which the designed patch length equals patch_length
+
+    Args:
+        patch_length: Target patch length in meters
+        er: Substrate relative permittivity
+        h: Substrate thickness in meters
+        engine: Conductance engine for the returned design
+    """
+    def residual(freq):
+        values, derivatives = sizing_jacobian(freq, er, h)
+        return values['patch_length'] - patch_length, derivatives['patch_length']['freq']
+
+    # Thin-substrate estimate ignoring fringing as the starting point
+    guess = light_velocity / (2 * patch_length * sqrt(er))
+    freq, iterations, evaluations = _solve_bracketed(residual, min_frequency, max_frequency, guess)
+    return InverseSolution('freq', freq, DesignPatch(freq, er, h, engine), iterations, evaluations)
+
+
+def solve_dielectric_constant(freq, h, patch_length=None, patch_width=None, er_bounds=(1.0, 50.0), engine=None):
+    """Dielectric constant giving a target patch length or width
+
+    Exactly one of patch_length and patch_width (meters) must be given. The
+    width relation inverts in closed form; the length is solved by Newton
+    within er_bounds.
+    """
+    if (patch_length is None) == (patch_width is None):
+        raise ValueError("Give exactly one of patch_length or patch_width")
+
+    if patch_width is not None:
+        er = 2 * (light_velocity / (2 * freq * patch_width)) ** 2 - 1
+        if not 0 < er <= max_dielectric_constant:
+            raise ValueError("Target is not reachable inside the search interval")
+        return InverseSolution('er', er, DesignPatch(freq, er, h, engine), 0, 1)
+
+    def residual(er):
+        values, derivatives = sizing_jacobian(freq, er, h)
+        return values['patch_length'] - patch_length, derivatives['patch_length']['er']
+
+    # Thin-substrate estimate ignoring fringing as the starting point
+    guess = (light_velocity / (2 * freq * patch_length)) ** 2
+    er, iterations, evaluations = _solve_bracketed(residual, *er_bounds, x0=guess)
+    return InverseSolution('er', er, DesignPatch(freq, er, h, engine), iterations, evaluations)
+
+
+def solve_for_edge_impedance(target_impedance, freq, er=None, h=None, bounds=None, engine=None):
+    """Solve for er or h so the edge impedance equals target_impedance
+
+    Give freq and one of er or h; the other is solved for. bounds is the
+    search interval for the unknown. The edge impedance is not monotonic
+    over the whole input range, so the defaults stay on the monotonic
+    branches: er in [2, 50] and h in [1 um, wavelength / 10]. Impedances
+    come from engine throughout, so the returned design meets the target
+    with that engine; Newton steps use the fast engine's gradient.
+    """
+    if (er is None) == (h is None):
+        raise ValueError("Give exactly one of er or h")
+    engine = conductance.resolve_engine(engine)
+
+    if er is None:
+        variable = 'er'
+        bounds = bounds or (2.0, 50.0)
+
+        def residual(x):
+            z, dz = edge_impedance_and_derivative(freq, x, h, 'er', engine)
+            return z - target_impedance, dz
+    else:
+        variable = 'h'
+        bounds = bounds or (1e-6, light_velocity / freq / 10)
+
+        def residual(x):
+            z, dz = edge_impedance_and_derivative(freq, er, x, 'h', engine)
+            return z - target_impedance, dz
+
+    value, iterations, evaluations = _solve_bracketed(residual, *bounds)
+    if variable == 'er':
+        design = DesignPatch(freq, value, h, engine)
+    else:
+        design = DesignPatch(freq, er, value, engine)
+    return InverseSolution(variable, value, design, iterations, evaluations)
+
+
+def solve_inset_length(design, target_impedance=impedance):
+    """Inset feed depth that transforms the edge impedance to target_impedance
+
+    Uses Zin(y0) = Zedge * cos^2(pi * y0 / L). DesignPatch.inset_length is
+    this value for the standard 50 Ohm target.
+    """
+    if not 0 < target_impedance <= design.input_impedance:
+        raise ValueError("Target impedance should be in between 0 and the edge impedance")
+    return (design.patch_length / pi) * acos(sqrt(target_impedance / design.input_impedance))
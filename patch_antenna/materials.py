@@ -7,8 +7,17 @@ Added by Al-Musbahi for Leeds SpaceComms
 Comprehensive database of common PCB substrates with electrical properties
 and standard thickness options. Enables material-based design optimization
 for professional RF applications.
+
+Laminate catalogs of any size can be loaded from CSV or JSON with
+load_materials() or added one by one with register_material().
+find_materials() answers property queries such as "er in [3.0, 3.6],
+tan d <= 0.004, 1.524 mm available" from sorted indexes over dielectric
+constant and loss tangent and a thickness lookup table, without visiting
+every material.
 """
 
+from bisect import bisect_left, bisect_right
+
 class SubstrateMaterial:
     """Data structure for PCB substrate material properties
     
@@ -21,14 +30,58 @@ class SubstrateMaterial:
         self.loss_tangent = loss_tangent
         self.thickness_options = thickness_options  # Available thicknesses in mm
 
+class MaterialDict(dict):
+    """dict that counts its changes in generation
+
+    Every assignment, deletion or update bumps generation, so the
+    material index can tell in constant time whether it is current.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.generation = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.generation += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.generation += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, *args):
+        self.generation += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.generation += 1
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self.generation += 1
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.generation += 1
+
+    def setdefault(self, key, default=None):
+        self.generation += 1
+        return super().setdefault(key, default)
+
+
 # Professional PCB materials for RF applications
-MATERIALS = {
+MATERIALS = MaterialDict({
     'FR4': SubstrateMaterial('FR4', 4.4, 0.02, [0.8, 1.6, 2.4, 3.2]),
     'ROGERS_RO4003C': SubstrateMaterial('Rogers RO4003C', 3.38, 0.0027, [0.508, 0.813, 1.524]),
     'ROGERS_RO4350B': SubstrateMaterial('Rogers RO4350B', 3.48, 0.0037, [0.508, 0.762, 1.524]),
     'PTFE': SubstrateMaterial('PTFE', 2.1, 0.0004, [0.5, 0.8, 1.6, 3.2]),
     'ALUMINA': SubstrateMaterial('Alumina', 9.8, 0.0001, [0.25, 0.635, 1.0])
-}
+})
 
 def get_material(name):
     """Retrieve material properties by name
@@ -45,3 +98,144 @@ def list_materials():
     Use with get_material() to access properties.
     """
     return list(MATERIALS.keys())
+
+
+# Decimal places thicknesses are matched to by find_materials()
+THICKNESS_DECIMALS = 6
+
+_index = None
+
+
+class MaterialIndex:
+    """Sorted indexes over a materials dict
+
+    er and tan_d hold (value, key) pairs in ascending order for range
+    queries by bisection; thicknesses maps each rounded thickness to the
+    keys offering it.
+    """
+
+    def __init__(self, materials):
+        self.materials = materials
+        self.position = {key: i for i, key in enumerate(materials)}
+        self.er = sorted((m.dielectric_constant, key) for key, m in materials.items())
+        self.tan_d = sorted((m.loss_tangent, key) for key, m in materials.items())
+        self._er_values = [value for value, _ in self.er]
+        self._tan_d_values = [value for value, _ in self.tan_d]
+        self.thicknesses = {}
+        for key, material in materials.items():
+            for thickness in material.thickness_options:
+                self.thicknesses.setdefault(round(thickness, THICKNESS_DECIMALS), set()).add(key)
+
+    def query(self, er_min=None, er_max=None, max_loss_tangent=None, thickness_mm=None):
+        """Keys of the materials meeting every given bound, in dict order
+
+        Bounds are inclusive; None leaves a property unconstrained. Only
+        the materials within the most selective bound are visited.
+        """
+        thickness = None if thickness_mm is None else round(thickness_mm, THICKNESS_DECIMALS)
+        sizes = []
+        if thickness is not None:
+            sizes.append((len(self.thicknesses.get(thickness, ())), 'thickness'))
+        if er_min is not None or er_max is not None:
+            lo = 0 if er_min is None else bisect_left(self._er_values, er_min)
+            hi = len(self.er) if er_max is None else bisect_right(self._er_values, er_max)
+            sizes.append((hi - lo, 'er'))
+        if max_loss_tangent is not None:
+            tan_d_hi = bisect_right(self._tan_d_values, max_loss_tangent)
+            sizes.append((tan_d_hi, 'tan_d'))
+        if not sizes:
+            return list(self.materials)
+
+        # Walk the smallest candidate set and check the other bounds directly
+        smallest = min(sizes)[1]
+        if smallest == 'thickness':
+            candidates = self.thicknesses.get(thickness, ())
+        elif smallest == 'er':
+            candidates = (key for _, key in self.er[lo:hi])
+        else:
+            candidates = (key for _, key in self.tan_d[:tan_d_hi])
+
+        def matches(material):
+            return ((er_min is None or material.dielectric_constant >= er_min)
+                    and (er_max is None or material.dielectric_constant <= er_max)
+                    and (max_loss_tangent is None or material.loss_tangent <= max_loss_tangent)
+                    and (thickness is None or any(round(option, THICKNESS_DECIMALS) == thickness
+                                                  for option in material.thickness_options)))
+
+        keys = [key for key in candidates if matches(self.materials[key])]
+        return sorted(keys, key=self.position.__getitem__)
+
+
+def get_material_index():
+    """MaterialIndex over MATERIALS, rebuilt whenever MATERIALS changes
+
+    Registrations and direct edits of MATERIALS (assigning, deleting,
+    updating) all bump MATERIALS.generation, so checking for changes takes
+    constant time. A material whose attributes are changed in place needs
+    register_material() again.
+    """
+    global _index
+    index = _index
+    if index is None or index[0] != MATERIALS.generation:
+        index = _index = (MATERIALS.generation, MaterialIndex(dict(MATERIALS)))
+    return index[1]
+
+
+def material_key(name):
+    """MATERIALS key of a material name, as get_material() looks it up"""
+    return name.upper().replace(' ', '_')
+
+
+def register_material(material, key=None):
+    """Add a SubstrateMaterial to MATERIALS and return its key
+
+    key defaults to the material name in upper case with spaces replaced
+    by underscores; an existing material with that key is replaced.
+    """
+    key = material_key(material.name if key is None else key)
+    MATERIALS[key] = material
+    return key
+
+
+def load_materials(path):
+    """Register every material of a CSV or JSON laminate catalog
+
+    Each entry has name, dielectric_constant, loss_tangent and
+    thickness_options (mm; a list in JSON, separated by spaces or
+    semicolons in CSV) and optionally key. JSON files hold a list of
+    objects or an object with such a list under "materials". Returns the
+    keys registered.
+    """
+    import csv
+    import json
+
+    with open(path, 'r', encoding='utf-8', newline='') as infile:
+        if path.lower().endswith('.json'):
+            rows = json.load(infile)
+            rows = rows['materials'] if isinstance(rows, dict) else rows
+        else:
+            rows = list(csv.DictReader(infile))
+
+    keys = []
+    for row in rows:
+        options = row['thickness_options']
+        if isinstance(options, str):
+            options = options.replace(';', ' ').split()
+        material = SubstrateMaterial(row['name'], float(row['dielectric_constant']), float(row['loss_tangent']),
+                                     [float(option) for option in options])
+        keys.append(register_material(material, row.get('key') or None))
+    return keys
+
+
+def find_materials(er_min=None, er_max=None, max_loss_tangent=None, thickness_mm=None):
+    """Materials meeting all the given bounds
+
+    Args:
+        er_min, er_max: Inclusive dielectric constant range
+        max_loss_tangent: Largest acceptable loss tangent
+        thickness_mm: A thickness the material must be available in
+
+    Returns list of (key, SubstrateMaterial) pairs in MATERIALS order.
+    """
+    index = get_material_index()
+    return [(key, index.materials[key]) for key in index.query(er_min, er_max, max_loss_tangent, thickness_mm)]
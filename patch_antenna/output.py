@@ -0,0 +1,39 @@
+"""
+Output targets shared by the Gerber writers and export functions.
+
+A target is either a filesystem path or an already open stream. Text
+streams receive str, binary streams receive encoded bytes, so callers can
+write into files, sockets, io.BytesIO buffers or ZIP archive members
+without a temporary file.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import io
+
+
+def is_stream(target):
+    return hasattr(target, 'write')
+
+
+def write_text(target, text, encoding=None):
+    """Write text to a path or a text/binary stream
+
+    Paths are opened in text mode with the given encoding (platform default
+    if None). Streams that reject str are sent the encoded bytes.
+    """
+    if not is_stream(target):
+        with open(target, 'w', encoding=encoding) as outfile:
+            outfile.write(text)
+        return
+    if isinstance(target, io.TextIOBase):
+        target.write(text)
+        return
+    if isinstance(target, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(target, 'mode', ''):
+        target.write(text.encode(encoding or 'utf-8'))
+        return
+    try:
+        target.write(text)
+    except TypeError:
+        target.write(text.encode(encoding or 'utf-8'))
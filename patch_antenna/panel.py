@@ -0,0 +1,113 @@
+"""
+Panelized Gerber output for many antennas on one board.
+
+PanelGerberWriter places a list of designs on a fabrication panel and
+emits all of them into one copper DataLayer (and one profile layer), so
+shared apertures are defined once and each layer is written to disk in a
+single buffered write instead of one file per design.
+
+Placement is row by row (shelf packing): designs are laid out left to
+right with the given spacing, starting a new row when the next board
+would exceed the panel width. Rows are as tall as their tallest board.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+from math import ceil, sqrt
+
+from gerber_writer import DataLayer, Path
+
+from .designer import FeedType, PatchGerberWriter
+from .output import write_text
+
+
+class PanelGerberWriter:
+    """Pack several designs onto one panel and write shared Gerber layers
+
+    Args:
+        items: Iterable of DesignPatch objects or (DesignPatch, feed_type) pairs
+        spacing: Gap between neighbouring boards in mm
+        margin: Border between the boards and the panel outline in mm
+        panel_width: Maximum usable row width in mm (default: about square)
+    """
+
+    def __init__(self, items, spacing=2.0, margin=5.0, panel_width=None):
+        self.items = []
+        for item in items:
+            design, feed_type = item if isinstance(item, tuple) else (item, FeedType.NORMAL)
+            FeedType.check(feed_type)
+            self.items.append((PatchGerberWriter(design), feed_type))
+        self.spacing = spacing
+        self.margin = margin
+        self.panel_width = panel_width
+        self.placements, self.size = self._place()
+
+    def _place(self):
+        sizes = [gw.get_size() for gw, _ in self.items]
+        row_width = self.panel_width
+        if row_width is None:
+            # Aim for a roughly square panel
+            per_row = max(1, ceil(sqrt(len(sizes))))
+            widest = max((w for w, _ in sizes), default=0)
+            row_width = per_row * (widest + self.spacing) - self.spacing
+
+        placements = []
+        x = y = 0.0
+        row_height = used_width = 0.0
+        for width, height in sizes:
+            if x > 0 and x + width > row_width:
+                y += row_height + self.spacing
+                x = row_height = 0.0
+            placements.append((self.margin + x, self.margin + y))
+            used_width = max(used_width, x + width)
+            row_height = max(row_height, height)
+            x += width + self.spacing
+        size = (used_width + 2 * self.margin, y + row_height + 2 * self.margin)
+        return placements, size
+
+    def copper_layer(self, include_profile=False):
+        """DataLayer with every antenna region, optionally with board outlines"""
+        layer = DataLayer('Copper,L1,Top')
+        for (gw, feed_type), offset in zip(self.items, self.placements):
+            gw.add_antenna(layer, feed_type, offset)
+        if include_profile:
+            self._add_outlines(layer)
+        return layer
+
+    def profile_layer(self):
+        """DataLayer with every board outline and the panel outline"""
+        layer = DataLayer('Profile,NP')
+        self._add_outlines(layer)
+        return layer
+
+    def _add_outlines(self, layer):
+        for (gw, _), offset in zip(self.items, self.placements):
+            gw.add_border(layer, offset)
+        width, height = self.size
+        outline = Path()
+        outline.moveto((0, 0))
+        [outline.lineto(pt) for pt in ((width, 0), (width, height), (0, height), (0, 0))]
+        layer.add_traces_path(outline, 0.5, 'Profile')
+
+    def write_gerber(self, copper_path, profile_path=None):
+        """Write the panel copper layer and, if given a target, the profile layer
+
+        Targets may be paths or text/binary streams. Without profile_path
+        the outlines go into the copper file, as PatchGerberWriter.write_gerber
+        does for a single design.
+        """
+        write_text(copper_path, self.copper_layer(include_profile=profile_path is None).dumps_gerber())
+        if profile_path is not None:
+            write_text(profile_path, self.profile_layer().dumps_gerber())
+
+
+def write_panel_gerber(items, copper_path, profile_path=None, spacing=2.0, margin=5.0, panel_width=None):
+    """Panelize designs and write the Gerber layers in one pass
+
+    See PanelGerberWriter for the arguments. Returns the writer, whose
+    placements and size describe the layout.
+    """
+    writer = PanelGerberWriter(items, spacing, margin, panel_width)
+    writer.write_gerber(copper_path, profile_path)
+    return writer
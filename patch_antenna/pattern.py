@@ -0,0 +1,217 @@
+"""
+Far-field radiation patterns of the rectangular patch.
+
+Uses the two-slot model behind getG1()/getG12(): two radiating slots of
+width W, a patch length L apart, over an infinite ground plane, with the
+slot height neglected as in the conductance integrals. With the patch in
+the x-y plane, the length along x and broadside along +z, the fields are
+
+    E_theta =  cos(phi)            * F(theta, phi)
+    E_phi   = -cos(theta) sin(phi) * F(theta, phi)
+    F = sinc(k0 W/2 sin(theta) sin(phi)) * cos(k0 L/2 sin(theta) cos(phi))
+
+for theta <= 90 degrees and zero below the ground plane, normalized to 1
+at broadside. The E-plane is phi = 0, the H-plane phi = 90 degrees.
+
+Directivity is 4 pi U_max over the trapezoidal integral of U sin(theta)
+on the theta/phi grid above the ground plane; it agrees with the closed
+form from the slot conductances, 2 (k0 W)^2 / (120 pi^2 (G1 + G12)), to
+within 1e-4 (relative) at 1 degree resolution. Half-power beamwidths come from the
+pattern cuts, interpolated between grid points. A cut that stays above
+half power down to the ground plane, as the E-plane of thin low-er
+patches does in this model, gets a beamwidth of 180 degrees; designs
+holding NaN, such as failed batch rows, get NaN.
+
+Angles are in degrees throughout. pattern_metrics() evaluates many
+designs at once in blocks, so large catalogs stay within bounded memory.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+from math import pi
+
+import numpy as np
+
+from .designer import light_velocity
+
+# Default grid resolution in degrees
+DEFAULT_STEP = 1.0
+
+# Designs evaluated together by pattern_metrics()
+BLOCK_SIZE = 256
+
+
+def slot_fields(k0w, k0l, theta, phi):
+    """(E_theta, E_phi) of the two-slot model, theta and phi in radians
+
+    All arguments broadcast against each other.
+    """
+    sin_theta, cos_theta = np.sin(theta), np.cos(theta)
+    sin_phi, cos_phi = np.sin(phi), np.cos(phi)
+    # np.sinc(x) is sin(pi x) / (pi x)
+    f = np.sinc(k0w / 2 * sin_theta * sin_phi / pi) * np.cos(k0l / 2 * sin_theta * cos_phi)
+    f = np.where(cos_theta >= 0, f, 0.0)
+    return cos_phi * f, -cos_theta * sin_phi * f
+
+
+def angle_grid(step=DEFAULT_STEP, theta_max=180.0):
+    """theta from 0 to theta_max and phi from 0 to 360 degrees, both inclusive"""
+    theta = np.linspace(0.0, theta_max, int(round(theta_max / step)) + 1)
+    phi = np.linspace(0.0, 360.0, int(round(360.0 / step)) + 1)
+    return theta, phi
+
+
+def _trapezoid_weights(x):
+    """Weights w with sum(w * y) equal to the trapezoidal integral of y over x"""
+    x = np.asarray(x, dtype=float)
+    weights = np.zeros_like(x)
+    if x.size > 1:
+        dx = np.diff(x)
+        weights[:-1] += dx / 2
+        weights[1:] += dx / 2
+    return weights
+
+
+def _solid_angle_weights(theta, phi):
+    """(theta, phi) weights of the integral of U sin(theta) dtheta dphi, radians"""
+    theta, phi = np.radians(theta), np.radians(phi)
+    return _trapezoid_weights(theta) * np.sin(theta), _trapezoid_weights(phi)
+
+
+def _wavenumbers(design):
+    k0 = 2 * pi * design.freq / light_velocity
+    return k0 * design.patch_width, k0 * design.patch_length
+
+
+def half_power_angle(theta, power):
+    """Angle from broadside where each row of power first drops below half
+
+    theta runs from 0 (broadside) upwards along the last axis of power,
+    which is normalized to 1 at broadside. Crossings are interpolated
+    linearly; rows that never drop below half give the last angle and
+    rows holding NaN give NaN.
+    """
+    power = np.asarray(power, dtype=float)
+    below = power < 0.5
+    index = np.argmax(below, axis=-1)
+    found = below.any(axis=-1) & (index > 0)
+    index = np.where(found, index, 1)
+    p0 = np.take_along_axis(power, (index - 1)[..., None], axis=-1)[..., 0]
+    p1 = np.take_along_axis(power, index[..., None], axis=-1)[..., 0]
+    t0, t1 = theta[index - 1], theta[index]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        angle = t0 + (p0 - 0.5) / (p0 - p1) * (t1 - t0)
+    angle = np.where(found, angle, theta[-1])
+    return np.where(np.isnan(power).any(axis=-1), np.nan, angle)
+
+
+def e_plane(design, angles=None):
+    """E-plane (phi = 0) power pattern relative to broadside
+
+    Returns (angles, power) for angles from -90 to 90 degrees (default
+    1 degree steps); negative angles lie in the phi = 180 half.
+    """
+    angles = np.arange(-90.0, 90.0 + DEFAULT_STEP / 2, DEFAULT_STEP) if angles is None else np.asarray(angles)
+    k0w, k0l = _wavenumbers(design)
+    e_theta, _ = slot_fields(k0w, k0l, np.radians(angles), 0.0)
+    return angles, e_theta ** 2
+
+
+def h_plane(design, angles=None):
+    """H-plane (phi = 90) power pattern relative to broadside, see e_plane()"""
+    angles = np.arange(-90.0, 90.0 + DEFAULT_STEP / 2, DEFAULT_STEP) if angles is None else np.asarray(angles)
+    k0w, k0l = _wavenumbers(design)
+    _, e_phi = slot_fields(k0w, k0l, np.radians(angles), pi / 2)
+    return angles, e_phi ** 2
+
+
+class RadiationPattern:
+    """3-D far-field pattern of one design on a theta x phi grid
+
+    Args:
+        k0w, k0l: Patch width and length times the free space wavenumber
+        theta, phi: Grid angles in degrees (default: angle_grid())
+
+    power is |E|^2 relative to broadside with shape (len(theta), len(phi)).
+    The grid should cover the upper hemisphere for directivity() to be
+    meaningful; angles below the ground plane hold zero and are left out
+    of the integral.
+    """
+
+    def __init__(self, k0w, k0l, theta=None, phi=None):
+        default_theta, default_phi = angle_grid()
+        self.theta = default_theta if theta is None else np.asarray(theta, dtype=float)
+        self.phi = default_phi if phi is None else np.asarray(phi, dtype=float)
+        self.k0w, self.k0l = k0w, k0l
+        self.e_theta, self.e_phi = slot_fields(k0w, k0l, np.radians(self.theta)[:, None],
+                                               np.radians(self.phi)[None, :])
+        self.power = self.e_theta ** 2 + self.e_phi ** 2
+
+    def directivity(self):
+        """Directivity (linear) by integration over the grid"""
+        # The field drops to zero at the ground plane, do not integrate across it
+        above = self.theta <= 90.0
+        theta_weights, phi_weights = _solid_angle_weights(self.theta[above], self.phi)
+        return 4 * pi * self.power.max() / (theta_weights @ self.power[above] @ phi_weights)
+
+    def directivity_dbi(self):
+        return 10 * np.log10(self.directivity())
+
+    def power_db(self, floor=-40.0):
+        """power in dB relative to the maximum, clipped at floor"""
+        with np.errstate(divide='ignore'):
+            return np.maximum(10 * np.log10(self.power / self.power.max()), floor)
+
+
+def radiation_pattern(design, theta=None, phi=None):
+    """RadiationPattern of a DesignPatch (or DesignRow) on a theta/phi grid in degrees"""
+    return RadiationPattern(*_wavenumbers(design), theta, phi)
+
+
+def pattern_metrics(designs, step=DEFAULT_STEP):
+    """Directivity and beamwidths of many designs
+
+    Integrates each design's pattern over the upper hemisphere at step
+    degrees resolution, using the pattern's symmetry about the E- and
+    H-planes to evaluate one quadrant.
+
+    Args:
+        designs: DesignTable, BatchResult, SweepResult or list of designs
+        step: Grid resolution in degrees
+
+    Returns a dict of arrays: directivity, directivity_dbi,
+    e_plane_beamwidth and h_plane_beamwidth (degrees).
+    """
+    from .table import design_columns
+
+    columns = design_columns(designs, ('freq', 'patch_width', 'patch_length'))
+    k0 = 2 * pi * columns['freq'] / light_velocity
+    k0w, k0l = k0 * columns['patch_width'], k0 * columns['patch_length']
+
+    theta = phi = np.linspace(0.0, 90.0, int(round(90.0 / step)) + 1)
+    theta_weights, phi_weights = _solid_angle_weights(theta, phi)
+    theta_rad = np.radians(theta)[None, :, None]
+    phi_rad = np.radians(phi)[None, None, :]
+
+    integral = np.empty(k0w.shape)
+    e_power = np.empty((k0w.size, theta.size))
+    h_power = np.empty((k0w.size, theta.size))
+    for start in range(0, k0w.size, BLOCK_SIZE):
+        block = slice(start, start + BLOCK_SIZE)
+        w, l = k0w[block, None, None], k0l[block, None, None]
+        e_theta, e_phi = slot_fields(w, l, theta_rad, phi_rad)
+        power = e_theta ** 2 + e_phi ** 2
+        # The quadrant is a quarter of the hemisphere
+        integral[block] = 4 * np.einsum('ntp,t,p->n', power, theta_weights, phi_weights)
+        e_power[block] = power[:, :, 0]
+        h_power[block] = power[:, :, -1]
+
+    # The pattern peaks at broadside with power 1
+    directivity = 4 * pi / integral
+    return {
+        'directivity': directivity,
+        'directivity_dbi': 10 * np.log10(directivity),
+        'e_plane_beamwidth': 2 * half_power_angle(theta, e_power),
+        'h_plane_beamwidth': 2 * half_power_angle(theta, h_power),
+    }
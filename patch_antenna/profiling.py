@@ -0,0 +1,172 @@
+"""
+Opt-in per-stage timing and quadrature counters.
+
+While a Profiler is active, DesignPatch records wall time for its stages
+(set_length_width_e_eff, set_feeder_width_length, getG1, getG12),
+PatchGerberWriter for Gerber serialization (dumps_gerber), and the quad
+engine reports every scipy.integrate.quad call it makes (Si, J0 and the
+outer G12 integral) with its integrand evaluation count and any
+convergence warning. Warnings are still issued as IntegrationWarning.
+
+Counters are aggregated per process and are safe to update from several
+threads. When no profiler is active the instrumented code only checks
+get_profiler() for None.
+
+    with profiling.profile() as profiler:
+        design(2.4e9, 4.4, 1.6e-3)
+    print(profiler.format_stats())
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import threading
+import warnings
+from contextlib import contextmanager
+from time import perf_counter
+
+# Most recent quad warning messages kept by a profiler
+MAX_WARNINGS = 100
+
+_profiler = None
+
+
+class Profiler:
+    """Aggregated stage timings and quad counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop everything recorded so far"""
+        with self._lock:
+            self.stages = {}   # name -> [calls, total seconds, max seconds]
+            self.quads = {}    # name -> [calls, evaluations, max evaluations, warnings, seconds]
+            self.warnings = []
+
+    def record_stage(self, name, seconds):
+        with self._lock:
+            entry = self.stages.get(name)
+            if entry is None:
+                self.stages[name] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def call(self, name, fn, *args):
+        """Run fn(*args) and record its wall time under name"""
+        start = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.record_stage(name, perf_counter() - start)
+
+    @contextmanager
+    def stage(self, name):
+        """Record the wall time of a with-block under name"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, perf_counter() - start)
+
+    def quad(self, name, func, a, b):
+        """scipy.integrate.quad(func, a, b)[0], recording evaluations and warnings"""
+        from scipy import integrate
+
+        start = perf_counter()
+        result = integrate.quad(func, a, b, full_output=1)
+        seconds = perf_counter() - start
+        neval = result[2]['neval']
+        message = result[3] if len(result) > 3 else None
+        with self._lock:
+            entry = self.quads.get(name)
+            if entry is None:
+                entry = self.quads[name] = [0, 0, 0, 0, 0.0]
+            entry[0] += 1
+            entry[1] += neval
+            entry[2] = max(entry[2], neval)
+            entry[4] += seconds
+            if message:
+                entry[3] += 1
+                self.warnings.append('{}: {}'.format(name, message))
+                del self.warnings[:-MAX_WARNINGS]
+        if message:
+            # full_output returns the warning instead of issuing it
+            warnings.warn(message, integrate.IntegrationWarning, stacklevel=3)
+        return result[0]
+
+    def stats(self):
+        """Recorded figures as a plain dict, suitable for metrics export"""
+        with self._lock:
+            return {
+                'stages': {
+                    name: {'calls': calls, 'total_s': total, 'mean_s': total / calls, 'max_s': longest}
+                    for name, (calls, total, longest) in self.stages.items()
+                },
+                'quad': {
+                    name: {'calls': calls, 'neval': neval, 'mean_neval': neval / calls,
+                           'max_neval': most, 'warnings': warned, 'total_s': seconds}
+                    for name, (calls, neval, most, warned, seconds) in self.quads.items()
+                },
+                'warnings': list(self.warnings),
+            }
+
+    def format_stats(self):
+        """Human readable table of stats()"""
+        stats = self.stats()
+        lines = ['{:<26} {:>8} {:>12} {:>12}'.format('Stage', 'Calls', 'Total ms', 'Mean us')]
+        for name, s in sorted(stats['stages'].items(), key=lambda item: -item[1]['total_s']):
+            lines.append('{:<26} {:>8} {:>12.3f} {:>12.1f}'.format(
+                name, s['calls'], s['total_s'] * 1e3, s['mean_s'] * 1e6))
+        if stats['quad']:
+            lines.append('')
+            lines.append('{:<26} {:>8} {:>12} {:>12} {:>9}'.format('Quad', 'Calls', 'Mean neval', 'Max neval',
+                                                                    'Warnings'))
+            for name, q in sorted(stats['quad'].items()):
+                lines.append('{:<26} {:>8} {:>12.1f} {:>12} {:>9}'.format(
+                    name, q['calls'], q['mean_neval'], q['max_neval'], q['warnings']))
+        return '\n'.join(lines)
+
+
+def enable_profiling():
+    """Start recording into a new process-wide Profiler and return it"""
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiling():
+    """Stop recording; returns the Profiler that was active, if any"""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def get_profiler():
+    """The active Profiler, or None when profiling is off"""
+    return _profiler
+
+
+def profiling_stats():
+    """stats() of the active Profiler, None when profiling is off"""
+    if _profiler is None:
+        return None
+    return _profiler.stats()
+
+
+@contextmanager
+def profile():
+    """Profile a with-block into a fresh Profiler
+
+    The previously active profiler, if any, is restored afterwards.
+    """
+    global _profiler
+    previous = _profiler
+    _profiler = Profiler()
+    try:
+        yield _profiler
+    finally:
+        _profiler = previous
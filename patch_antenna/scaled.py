@@ -0,0 +1,110 @@
+"""
+Scale-invariant design kernel.
+
+Every length in the transmission line model (set_length_width_e_eff,
+set_feeder_width_length) is proportional to the free-space wavelength,
+and the conductances depend only on k0*W and k0*L. In units of the
+wavelength a design is therefore a function of er and the electrical
+thickness h / wavelength = h * f / c alone, and so is its input impedance.
+
+normalized_kernel() computes that dimensionless design once per
+(er, h * f, engine) and keeps it in a bounded LRU; design_scaled() rescales
+it to physical dimensions for the requested frequency. Designs that share
+er and h * f - the same substrate family scaled with frequency, or one
+board reused across bands of a frequency plan - evaluate the conductance
+integrals once.
+
+The cache key rounds h * f to 12 significant digits, so h and f that only
+differ by rounding in their product share a kernel. Results agree with
+design() to about 1e-12 relative.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+from math import acos, pi, sqrt
+
+from . import conductance
+from .cache import DesignCache
+from .designer import DesignPatch, check_inputs, light_velocity, impedance
+
+# Dimensionless kernel values, lengths in wavelengths
+KERNEL_FIELDS = (
+    'patch_width', 'patch_length', 'patch_lengthl_eff', 'delta_l',
+    'feeder_length', 'feeder_width', 'inset_gap', 'inset_length',
+    'ground_length', 'ground_width', 'e_eff', 'input_impedance'
+)
+# Kernel values that are not lengths and are not rescaled
+UNSCALED = ('e_eff', 'input_impedance')
+
+_kernel_cache = DesignCache(maxsize=4096)
+
+
+def normalized_kernel(er, hf, engine=None):
+    """Design in units of the wavelength for er and h * f (m*Hz)
+
+    Returns a dict over KERNEL_FIELDS. Lengths are in wavelengths; e_eff
+    and input_impedance (Ohm) are scale free.
+    """
+    t = hf / light_velocity  # h / wavelength
+    patch_width = 0.5 * sqrt(2 / (er + 1))
+    temp = 1 + 12 * (t / patch_width)
+    e_eff = ((er + 1) / 2) + ((er - 1) / 2) * temp ** -0.5
+    f1 = (e_eff + 0.3) * (patch_width / t + 0.264)
+    f2 = (e_eff - 0.258) * (patch_width / t + 0.8)
+    delta_l = t * 0.412 * (f1 / f2)
+    patch_lengthl_eff = (1 / sqrt(e_eff)) / 2
+    patch_length = patch_lengthl_eff - 2 * delta_l
+
+    feeder_length = sqrt(1 / e_eff) / 4
+    feeder_width = patch_width / 5
+    input_impedance = conductance.input_impedance(2 * pi * patch_width, 2 * pi * patch_length, engine)
+    inset_length = (patch_length / pi) * acos(sqrt(impedance / input_impedance))
+    fringing = 6 * t
+    return {
+        'patch_width': patch_width,
+        'patch_length': patch_length,
+        'patch_lengthl_eff': patch_lengthl_eff,
+        'delta_l': delta_l,
+        'feeder_length': feeder_length,
+        'feeder_width': feeder_width,
+        'inset_gap': patch_width / 5,
+        'inset_length': inset_length,
+        'ground_length': patch_length + feeder_length + fringing,
+        'ground_width': patch_width + feeder_width + fringing,
+        'e_eff': e_eff,
+        'input_impedance': input_impedance,
+    }
+
+
+def get_kernel(er, hf, engine=None):
+    """Cached normalized_kernel(), keyed on (er, rounded h * f, engine)"""
+    engine = conductance.resolve_engine(engine)
+    hf = float('{:.12g}'.format(hf))
+    key = (float(er), hf, engine)
+    return _kernel_cache.get_or_create(key, lambda: normalized_kernel(er, hf, engine))
+
+
+def design_scaled(resonant_frequency, dielectric_constant, thickness, engine=None):
+    """Design a patch by rescaling the cached normalized kernel
+
+    Same arguments and result as design(), but designs sharing
+    dielectric_constant and thickness * frequency reuse one kernel.
+    """
+    check_inputs(resonant_frequency, dielectric_constant, thickness)
+    engine = conductance.resolve_engine(engine)
+    kernel = get_kernel(dielectric_constant, thickness * resonant_frequency, engine)
+    wavelength = light_velocity / resonant_frequency
+    fields = {name: value if name in UNSCALED else value * wavelength for name, value in kernel.items()}
+    fields.update(freq=resonant_frequency, er=dielectric_constant, h=thickness, wavelength=wavelength)
+    return DesignPatch.from_fields(fields, engine)
+
+
+def kernel_cache_stats():
+    """Hit/miss counters of the kernel cache"""
+    return _kernel_cache.stats()
+
+
+def clear_kernel_cache():
+    """Drop all cached kernels and reset the counters"""
+    _kernel_cache.clear()
@@ -0,0 +1,286 @@
+"""
+Opt-in persistent design store shared between processes.
+
+DesignStore keeps every computed DesignPatch field in an SQLite database,
+keyed on a stable hash of (frequency, dielectric constant, thickness,
+engine, engine version). When enabled, design() and everything built on
+it, design_batch() and the sweep workers read designs from the store and
+only compute (and write back) the ones that are missing, so a restarted
+worker fleet skips recomputing the impedance integrals.
+
+The database runs in WAL mode, so many processes can read while one
+writes. Each thread and process opens its own connection. Rows written by
+an older engine version are never returned and are removed by prune();
+a database with a different schema version is rebuilt on open.
+
+Setting PATCH_ANTENNA_DESIGN_STORE to a file path enables the store in
+every process that imports the library, including spawned workers.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+
+from . import conductance
+
+SCHEMA_VERSION = 1
+STORE_ENV = 'PATCH_ANTENNA_DESIGN_STORE'
+
+# DesignPatch attributes kept per row (engine is part of the key)
+FIELDS = (
+    'freq', 'er', 'h',
+    'patch_length', 'patch_lengthl_eff', 'patch_width',
+    'feeder_length', 'feeder_width', 'inset_gap',
+    'e_eff', 'delta_l', 'wavelength',
+    'ground_length', 'ground_width', 'inset_length', 'input_impedance'
+)
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+_design_store = None
+_env_checked = False
+
+
+def design_key(freq, er, h, engine):
+    """Stable hex key of design inputs and the engine version
+
+    Inputs are normalized to float and hashed through repr, which round-
+    trips exactly, so every process derives the same key.
+    """
+    engine = conductance.resolve_engine(engine)
+    text = '{!r}|{!r}|{!r}|{}|{}'.format(float(freq), float(er), float(h), engine,
+                                         conductance.ENGINE_VERSIONS[engine])
+    return hashlib.sha256(text.encode('ascii')).hexdigest()
+
+
+class DesignStore:
+    """SQLite-backed table of designs keyed on design_key()
+
+    Args:
+        path: Database file, created if missing
+        max_rows: Keep at most this many designs; older rows are pruned
+            automatically as new ones are written. None keeps everything.
+        timeout: Seconds to wait for a lock held by another writer
+    """
+
+    def __init__(self, path, max_rows=None, timeout=30.0):
+        if max_rows is not None and max_rows < 1:
+            raise ValueError("Store size should be at least 1")
+        self.path = path
+        self.max_rows = max_rows
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_prune = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+    def _connection(self):
+        """Connection of the calling thread, reopened after a fork"""
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.connection = sqlite3.connect(self.path, timeout=self.timeout)
+            local.connection.execute('PRAGMA journal_mode=WAL')
+            local.connection.execute('PRAGMA synchronous=NORMAL')
+            local.pid = os.getpid()
+        return local.connection
+
+    def _create_schema(self):
+        connection = self._connection()
+        with connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+            row = connection.execute("SELECT value FROM meta WHERE name = 'schema_version'").fetchone()
+            if row is not None and int(row[0]) != SCHEMA_VERSION:
+                connection.execute('DROP TABLE IF EXISTS designs')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS designs (key TEXT PRIMARY KEY, engine TEXT, '
+                'engine_version INTEGER, {})'.format(', '.join('{} REAL'.format(name) for name in FIELDS)))
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM designs').fetchone()[0]
+
+    def get(self, freq, er, h, engine=None):
+        """Stored DesignPatch for the inputs, None if missing"""
+        from .designer import DesignPatch
+
+        engine = conductance.resolve_engine(engine)
+        row = self._connection().execute(
+            'SELECT {} FROM designs WHERE key = ?'.format(', '.join(FIELDS)),
+            (design_key(freq, er, h, engine),)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return DesignPatch.from_fields(dict(zip(FIELDS, row)), engine)
+
+    def put(self, design):
+        """Store a DesignPatch, replacing any row with the same key"""
+        self.put_rows([[getattr(design, name) for name in FIELDS]], design.engine)
+
+    def put_rows(self, rows, engine=None):
+        """Store rows of FIELDS values computed with one engine"""
+        engine = conductance.resolve_engine(engine)
+        version = conductance.ENGINE_VERSIONS[engine]
+        records = [(design_key(row[0], row[1], row[2], engine), engine, version) + tuple(map(float, row))
+                   for row in rows]
+        if not records:
+            return
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO designs VALUES ({})'.format(', '.join('?' * (len(FIELDS) + 3))),
+                records)
+        with self._lock:
+            self._writes_since_prune += len(records)
+            due = self.max_rows is not None and self._writes_since_prune > max(1, self.max_rows // 10)
+            if due:
+                self._writes_since_prune = 0
+        if due:
+            self.prune()
+
+    def get_or_create(self, freq, er, h, engine, factory):
+        """Stored design for the inputs, calling factory() and storing it on a miss"""
+        stored = self.get(freq, er, h, engine)
+        if stored is not None:
+            return stored
+        design = factory()
+        self.put(design)
+        return design
+
+    def lookup(self, keys, columns=FIELDS):
+        """Map of key -> tuple of columns for the keys present in the store"""
+        found = {}
+        connection = self._connection()
+        keys = list(keys)
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start:start + _LOOKUP_CHUNK]
+            query = 'SELECT key, {} FROM designs WHERE key IN ({})'.format(
+                ', '.join(columns), ', '.join('?' * len(chunk)))
+            for row in connection.execute(query, chunk):
+                found[row[0]] = row[1:]
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def prune(self, max_rows=None):
+        """Drop rows of outdated engine versions, then the oldest beyond max_rows
+
+        max_rows defaults to the store's max_rows. Returns the number of
+        rows removed.
+        """
+        max_rows = self.max_rows if max_rows is None else max_rows
+        connection = self._connection()
+        with connection:
+            removed = 0
+            for engine, version in conductance.ENGINE_VERSIONS.items():
+                removed += connection.execute(
+                    'DELETE FROM designs WHERE engine = ? AND engine_version != ?', (engine, version)).rowcount
+            if max_rows is not None:
+                # INSERT OR REPLACE gives rewritten rows a new rowid, so rowid order is write order
+                removed += connection.execute(
+                    'DELETE FROM designs WHERE rowid NOT IN '
+                    '(SELECT rowid FROM designs ORDER BY rowid DESC LIMIT ?)', (max_rows,)).rowcount
+        return removed
+
+    def clear(self):
+        """Delete every stored design and reset the counters"""
+        connection = self._connection()
+        with connection:
+            connection.execute('DELETE FROM designs')
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def close(self):
+        """Close the calling thread's connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+        self._local = threading.local()
+
+    def stats(self):
+        """Counters and row count as a plain dict"""
+        rows = len(self)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'rows': rows,
+                'max_rows': self.max_rows,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def enable_design_store(path=None, max_rows=None):
+    """Turn on the persistent store, replacing any existing one
+
+    path defaults to designs.sqlite in the library cache directory
+    (PATCH_ANTENNA_CACHE_DIR or ~/.cache/patch_antenna).
+    """
+    global _design_store, _env_checked
+    if path is None:
+        from .conductance_table import default_cache_dir
+        path = os.path.join(default_cache_dir(), 'designs.sqlite')
+    _design_store = DesignStore(path, max_rows)
+    _env_checked = True
+    return _design_store
+
+
+def disable_design_store():
+    """Turn off the persistent store (the database file is kept)"""
+    global _design_store, _env_checked
+    if _design_store is not None:
+        _design_store.close()
+    _design_store = None
+    _env_checked = True
+
+
+def get_design_store():
+    """The active DesignStore, or None when the store is off
+
+    The first call opens the store named by PATCH_ANTENNA_DESIGN_STORE,
+    if set and no store was enabled or disabled explicitly.
+    """
+    global _env_checked
+    if not _env_checked:
+        _env_checked = True
+        path = os.environ.get(STORE_ENV)
+        if path:
+            enable_design_store(path)
+    return _design_store
+
+
+def design_store_stats():
+    """Counters of the active store, None when the store is off"""
+    store = get_design_store()
+    if store is None:
+        return None
+    return store.stats()
+
+
+def worker_state():
+    """Arguments that reopen the active store in a worker process"""
+    store = get_design_store()
+    if store is None:
+        return None
+    return store.path, store.max_rows
+
+
+def init_worker(state):
+    """ProcessPoolExecutor initializer matching the parent's store"""
+    if state is None:
+        disable_design_store()
+    else:
+        enable_design_store(*state)
@@ -0,0 +1,182 @@
+"""
+Parallel parameter sweeps over frequency, material and thickness.
+
+sweep() evaluates the full Cartesian product of frequencies (band names or
+values in Hz), substrate materials and thicknesses on a process pool. Work
+is sent to the workers in chunks, results come back in input order, and a
+failing combination is recorded on its row instead of aborting the sweep.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import conductance
+from . import store
+from .designer import design
+
+
+class SweepRow:
+    """One evaluated combination of a sweep
+
+    design is None and error holds the reason when the combination failed.
+    """
+    __slots__ = ('band', 'frequency', 'material', 'dielectric_constant', 'thickness_mm', 'design', 'error')
+
+    def __init__(self, band, frequency, material, dielectric_constant, thickness_mm, design=None, error=None):
+        self.band = band
+        self.frequency = frequency
+        self.material = material
+        self.dielectric_constant = dielectric_constant
+        self.thickness_mm = thickness_mm
+        self.design = design
+        self.error = error
+
+    def __repr__(self):
+        outcome = 'error={!r}'.format(self.error) if self.error else 'ok'
+        return 'SweepRow({}, {:g} Hz, {}, {} mm, {})'.format(
+            self.band, self.frequency, self.material, self.thickness_mm, outcome)
+
+
+class SweepResult:
+    """Ordered rows of a sweep with helpers for successes and failures"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    @property
+    def designs(self):
+        return [row.design for row in self.rows]
+
+    def successes(self):
+        return [row for row in self.rows if row.error is None]
+
+    def failures(self):
+        return [row for row in self.rows if row.error is not None]
+
+    def to_table(self, dtype=np.float64):
+        """Successful designs as a DesignTable"""
+        from .table import DesignTable
+        return DesignTable.from_designs([row.design for row in self.successes()], dtype)
+
+
+def resolve_frequencies(frequencies):
+    """Turn band names and values into (band, frequency) pairs"""
+    from .frequency_bands import get_frequency, list_bands
+
+    if isinstance(frequencies, str) or np.ndim(frequencies) == 0:
+        frequencies = [frequencies]
+    resolved = []
+    for item in frequencies:
+        if isinstance(item, str):
+            frequency = get_frequency(item)
+            if not frequency:
+                raise ValueError(f"Unknown band: {item}. Available: {list_bands()}")
+            resolved.append((item.upper(), frequency))
+        else:
+            resolved.append((None, float(item)))
+    return resolved
+
+
+def resolve_materials(materials):
+    """Turn material keys into (key, SubstrateMaterial) pairs, default all"""
+    from .materials import MATERIALS, get_material, list_materials
+
+    if materials is None:
+        return list(MATERIALS.items())
+    if isinstance(materials, str):
+        materials = [materials]
+    resolved = []
+    for name in materials:
+        material = get_material(name)
+        if not material:
+            raise ValueError(f"Unknown material: {name}. Available: {list_materials()}")
+        resolved.append((name.upper().replace(' ', '_'), material))
+    return resolved
+
+
+def sweep_specs(frequencies, materials=None, thicknesses=None):
+    """Cartesian product of the sweep axes as a list of SweepRow
+
+    thicknesses of None uses each material's own thickness_options.
+    """
+    rows = []
+    for (band, frequency), (key, material) in itertools.product(
+            resolve_frequencies(frequencies), resolve_materials(materials)):
+        options = material.thickness_options if thicknesses is None else thicknesses
+        for thickness_mm in options:
+            rows.append(SweepRow(band, frequency, key, material.dielectric_constant, thickness_mm))
+    return rows
+
+
+def _design_chunk(specs, engine):
+    """Worker entry point: design each (frequency, er, thickness_mm) spec"""
+    out = []
+    for frequency, er, thickness_mm in specs:
+        try:
+            out.append((design(frequency, er, thickness_mm / 1000, engine), None))
+        except (ValueError, ArithmeticError) as e:
+            out.append((None, '{}: {}'.format(type(e).__name__, e)))
+    return out
+
+
+def run_rows(rows, engine=None, workers=None, chunk_size=64):
+    """Design every SweepRow in place, in parallel when workers > 1"""
+    from .materials import MATERIALS
+
+    engine = conductance.resolve_engine(engine)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    specs = [(row.frequency, row.dielectric_constant, row.thickness_mm) for row in rows]
+    chunks = [specs[i:i + chunk_size] for i in range(0, len(specs), chunk_size)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        results = map(_design_chunk, chunks, itertools.repeat(engine))
+        outcomes = list(itertools.chain.from_iterable(results))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=store.init_worker,
+                                 initargs=(store.worker_state(),)) as executor:
+            results = executor.map(_design_chunk, chunks, itertools.repeat(engine))
+            outcomes = list(itertools.chain.from_iterable(results))
+
+    for row, (design_, error) in zip(rows, outcomes):
+        row.design, row.error = design_, error
+        if design_ is not None:
+            design_.material = MATERIALS.get(row.material)
+            design_.thickness_mm = row.thickness_mm
+    return rows
+
+
+def sweep(frequencies, materials=None, thicknesses=None, engine=None, workers=None, chunk_size=64):
+    """Design every frequency x material x thickness combination
+
+    Args:
+        frequencies: Band name, frequency in Hz, or an iterable mixing both
+        materials: Material key or list of keys (default: all of MATERIALS)
+        thicknesses: Thicknesses in mm applied to every material
+            (default: each material's thickness_options)
+        engine: Conductance engine name, None for the global default
+        workers: Number of worker processes (default: os.cpu_count()),
+            1 runs in the calling process
+        chunk_size: Combinations sent to a worker per task
+
+    Returns:
+        SweepResult with one SweepRow per combination, in product order
+        (frequency, then material, then thickness)
+    """
+    rows = sweep_specs(frequencies, materials, thicknesses)
+    return SweepResult(run_rows(rows, engine, workers, chunk_size))
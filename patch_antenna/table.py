@@ -0,0 +1,189 @@
+"""
+Compact columnar storage for large numbers of designs.
+
+DesignTable keeps designs in a single NumPy structured array instead of one
+Python object per design. With the default float64 columns a row takes
+112 bytes, about 1.1 GB for ten million designs. Pass dtype=np.float32
+(frequency stays float64) to the constructors for 60 bytes a row, about
+600 MB for ten million designs, at single precision.
+
+Rows come back as lightweight DesignRow views, columns as NumPy arrays,
+and any row can be turned back into a full DesignPatch.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+from math import sqrt
+
+import numpy as np
+
+from .designer import DesignPatch, light_velocity
+
+# Stored columns, wavelength and patch_lengthl_eff are derived on access
+COLUMNS = (
+    'freq', 'er', 'h',
+    'patch_width', 'patch_length', 'e_eff', 'delta_l',
+    'feeder_width', 'feeder_length', 'inset_gap', 'inset_length',
+    'ground_length', 'ground_width', 'input_impedance'
+)
+DERIVED = ('wavelength', 'patch_lengthl_eff')
+
+# SubstrateMaterial attributes design_columns() can read per design
+MATERIAL_COLUMNS = ('loss_tangent',)
+
+
+def table_dtype(dtype=np.float64):
+    """Structured dtype of a DesignTable row
+
+    freq is always float64 so band centre frequencies stay exact. A row
+    takes 112 bytes with float64 columns and 60 bytes with float32.
+    """
+    return np.dtype([('freq', np.float64)] + [(name, dtype) for name in COLUMNS[1:]])
+
+
+def _design_value(design, name):
+    if name in MATERIAL_COLUMNS:
+        material = getattr(design, 'material', None)
+        return np.nan if material is None else getattr(material, name)
+    return getattr(design, name)
+
+
+def design_columns(designs, names):
+    """Named quantities of many designs as a dict of float arrays
+
+    designs may be a DesignTable, a BatchResult (flattened), a SweepResult
+    (its successful designs) or an iterable of DesignPatch or DesignRow
+    objects. names are DesignTable columns, stored or derived, or
+    MATERIAL_COLUMNS, read from each design's material and NaN where it
+    is unknown (always for tables and batch results).
+    """
+    if hasattr(designs, 'successes'):
+        designs = [row.design for row in designs.successes()]
+    if isinstance(designs, DesignTable):
+        column, size = designs.column, len(designs)
+    elif hasattr(designs, 'valid'):
+        column, size = (lambda name: np.ravel(getattr(designs, name))), np.size(designs.valid)
+    else:
+        designs = designs if isinstance(designs, (list, tuple)) else list(designs)
+        return {name: np.array([_design_value(d, name) for d in designs], dtype=float) for name in names}
+    return {name: np.full(size, np.nan) if name in MATERIAL_COLUMNS else np.asarray(column(name), dtype=float)
+            for name in names}
+
+
+class DesignRow:
+    """Read-only attribute view of one DesignTable row"""
+    __slots__ = ('_record',)
+
+    def __init__(self, record):
+        self._record = record
+
+    def __getattr__(self, name):
+        if name in COLUMNS:
+            return float(self._record[name])
+        if name == 'wavelength':
+            return light_velocity / float(self._record['freq'])
+        if name == 'patch_lengthl_eff':
+            return (self.wavelength / sqrt(float(self._record['e_eff']))) / 2
+        raise AttributeError(name)
+
+    def __repr__(self):
+        return 'DesignRow({})'.format(', '.join('{}={:g}'.format(n, getattr(self, n)) for n in COLUMNS))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in COLUMNS + DERIVED}
+
+    def to_design(self, engine=None):
+        """Convert the row into a DesignPatch"""
+        return DesignPatch.from_fields({name: float(self._record[name]) for name in COLUMNS}, engine)
+
+
+class DesignTable:
+    """Columnar container of patch designs backed by a structured array
+
+    Indexing follows NumPy: an int gives a DesignRow, a column name gives
+    the column array, and slices, index arrays or boolean masks give a new
+    DesignTable (a view for slices).
+    """
+
+    def __init__(self, data, engine=None):
+        self.data = data
+        self.engine = engine
+
+    @classmethod
+    def empty(cls, size, dtype=np.float64, engine=None):
+        return cls(np.zeros(size, dtype=table_dtype(dtype)), engine)
+
+    @classmethod
+    def from_designs(cls, designs, dtype=np.float64):
+        """Pack an iterable of DesignPatch objects into a table"""
+        designs = list(designs)
+        table = cls.empty(len(designs), dtype, designs[0].engine if designs else None)
+        for name in COLUMNS:
+            table.data[name] = [getattr(d, name) for d in designs]
+        return table
+
+    @classmethod
+    def from_batch(cls, batch, valid_only=True, dtype=np.float64):
+        """Build a table from a design_batch() BatchResult
+
+        Rows failing the range checks are dropped unless valid_only is False.
+        """
+        keep = batch.valid.ravel() if valid_only else slice(None)
+        columns = {name: getattr(batch, name).ravel()[keep] for name in COLUMNS}
+        table = cls.empty(columns['freq'].size, dtype, batch.engine)
+        for name, values in columns.items():
+            table.data[name] = values
+        return table
+
+    @classmethod
+    def concatenate(cls, tables):
+        tables = list(tables)
+        return cls(np.concatenate([t.data for t in tables]), tables[0].engine if tables else None)
+
+    def __len__(self):
+        return self.data.size
+
+    def __iter__(self):
+        for record in self.data:
+            yield DesignRow(record)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, (int, np.integer)):
+            return DesignRow(self.data[key])
+        return DesignTable(self.data[key], self.engine)
+
+    def __repr__(self):
+        return 'DesignTable({} rows, {} bytes)'.format(len(self), self.nbytes)
+
+    @property
+    def columns(self):
+        return COLUMNS + DERIVED
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def column(self, name):
+        """Column values as an array (a view for stored columns)"""
+        if name in COLUMNS:
+            return self.data[name]
+        if name == 'wavelength':
+            return light_velocity / self.data['freq']
+        if name == 'patch_lengthl_eff':
+            return (self.column('wavelength') / np.sqrt(self.data['e_eff'])) / 2
+        raise KeyError(name)
+
+    def filter(self, mask):
+        """Rows where mask is True, as a new table"""
+        return DesignTable(self.data[np.asarray(mask, dtype=bool)], self.engine)
+
+    def to_design(self, index):
+        return DesignRow(self.data[index]).to_design(self.engine)
+
+    def to_designs(self):
+        """Iterate over the rows as DesignPatch objects"""
+        for record in self.data:
+            yield DesignRow(record).to_design(self.engine)
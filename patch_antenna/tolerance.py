@@ -0,0 +1,168 @@
+"""
+Monte Carlo manufacturing tolerance and yield analysis.
+
+Perturbs a finished design with the fabrication tolerances quoted by
+export_manufacturing_notes for the patch and inset depth plus substrate
+permittivity and thickness spread, and evaluates every sample as a batch:
+the shifted resonant frequency from the transmission line model, the edge
+and inset input impedance from a vectorized conductance engine, and the
+return loss against the reference impedance. Tens of thousands of samples
+take a few tens of milliseconds.
+
+A sample passes when its resonance stays inside the bandwidth around the
+design frequency and its return loss meets the spec. Yield covers the
+patch geometry only: the feed line is sized as a fraction of the patch
+width rather than to the reference impedance, so its width tolerance is
+not part of the analysis.
+
+Added by Leeds SpaceComms
+(Enhancement to original library by Bhanuchander Udhayakumar)
+"""
+
+import numpy as np
+
+from . import conductance
+from .batch import evaluate_impedance
+from .designer import light_velocity, impedance
+from .export import MANUFACTURING_TOLERANCES
+
+UNIFORM = 'uniform'
+NORMAL = 'normal'
+
+
+class ToleranceReport:
+    """Per-sample results and yield of a tolerance analysis
+
+    Arrays have one entry per sample. frequency_yield, match_yield and
+    yield_fraction are fractions of samples in [0, 1].
+    """
+
+    def __init__(self, design, samples, bandwidth, min_return_loss_db, **arrays):
+        self.design = design
+        self.samples = samples
+        self.bandwidth = bandwidth
+        self.min_return_loss_db = min_return_loss_db
+        self.resonant_frequency = arrays['resonant_frequency']
+        self.edge_impedance = arrays['edge_impedance']
+        self.input_impedance = arrays['input_impedance']
+        self.return_loss_db = arrays['return_loss_db']
+        self.frequency_ok = np.abs(self.frequency_shift) <= bandwidth / 2
+        self.match_ok = self.return_loss_db >= min_return_loss_db
+
+    @property
+    def frequency_shift(self):
+        return self.resonant_frequency - self.design.freq
+
+    @property
+    def frequency_yield(self):
+        return float(np.mean(self.frequency_ok))
+
+    @property
+    def match_yield(self):
+        return float(np.mean(self.match_ok))
+
+    @property
+    def yield_fraction(self):
+        return float(np.mean(self.frequency_ok & self.match_ok))
+
+    def summary(self):
+        """Yield figures and spreads as a plain dict"""
+        shift = self.frequency_shift
+        return {
+            'samples': self.samples,
+            'yield': self.yield_fraction,
+            'frequency_yield': self.frequency_yield,
+            'match_yield': self.match_yield,
+            'bandwidth_hz': self.bandwidth,
+            'frequency_shift_mean_hz': float(np.mean(shift)),
+            'frequency_shift_std_hz': float(np.std(shift)),
+            'return_loss_p5_db': float(np.percentile(self.return_loss_db, 5)),
+            'input_impedance_mean': float(np.mean(self.input_impedance)),
+            'input_impedance_std': float(np.std(self.input_impedance)),
+        }
+
+
+def estimate_bandwidth(design):
+    """Approximate VSWR < 2 impedance bandwidth in Hz
+
+    Uses the thin-substrate estimate BW = 3.77 (er - 1) / er^2 * (W / L) * (h / wavelength).
+    """
+    er = design.er
+    fractional = 3.77 * ((er - 1) / er ** 2) * (design.patch_width / design.patch_length) * (design.h / design.wavelength)
+    return fractional * design.freq
+
+
+def _perturbation(rng, distribution, tolerance, size):
+    """Zero-mean offsets: uniform within +/-tolerance or normal with 3 sigma = tolerance"""
+    if distribution == UNIFORM:
+        return rng.uniform(-tolerance, tolerance, size)
+    if distribution == NORMAL:
+        return rng.normal(0.0, tolerance / 3, size)
+    raise ValueError('Distribution should be : {}'.format(", ".join([NORMAL, UNIFORM])))
+
+
+def tolerance_analysis(design, samples=20000, patch_tolerance=None, inset_tolerance=None,
+                       er_tolerance=0.02, h_tolerance=0.05, distribution=UNIFORM,
+                       bandwidth=None, min_return_loss_db=10.0,
+                       reference_impedance=impedance, engine=None, seed=None):
+    """Monte Carlo yield of a design under manufacturing tolerances
+
+    Args:
+        design: DesignPatch to analyse
+        samples: Number of Monte Carlo samples
+        patch_tolerance: Patch width/length tolerance in meters
+            (default: MANUFACTURING_TOLERANCES['patch'])
+        inset_tolerance: Inset depth tolerance in meters
+            (default: MANUFACTURING_TOLERANCES['inset'])
+        er_tolerance: Relative dielectric constant tolerance (0.02 = +/-2%)
+        h_tolerance: Relative substrate thickness tolerance (0.05 = +/-5%)
+        distribution: 'uniform' within the tolerance or 'normal' with the
+            tolerance taken as 3 sigma
+        bandwidth: Allowed resonance window in Hz, centred on the design
+            frequency (default: estimate_bandwidth(design))
+        min_return_loss_db: Return loss spec at the inset feed point
+        reference_impedance: Impedance the inset feed is matched to
+        engine: Conductance engine name; None uses the global default.
+            'fast' and 'table' evaluate the samples as arrays, 'quad'
+            integrates them one by one and is far slower
+        seed: Seed for reproducible sampling
+
+    Returns:
+        ToleranceReport
+    """
+    if patch_tolerance is None:
+        patch_tolerance = MANUFACTURING_TOLERANCES['patch']
+    if inset_tolerance is None:
+        inset_tolerance = MANUFACTURING_TOLERANCES['inset']
+    if bandwidth is None:
+        bandwidth = estimate_bandwidth(design)
+    engine = conductance.resolve_engine(engine)
+
+    rng = np.random.default_rng(seed)
+    W = design.patch_width + _perturbation(rng, distribution, patch_tolerance, samples)
+    L = design.patch_length + _perturbation(rng, distribution, patch_tolerance, samples)
+    inset = design.inset_length + _perturbation(rng, distribution, inset_tolerance, samples)
+    er = design.er * (1 + _perturbation(rng, distribution, er_tolerance, samples))
+    h = design.h * (1 + _perturbation(rng, distribution, h_tolerance, samples))
+
+    # Resonance of the perturbed geometry from the set_length_width_e_eff relations
+    e_eff = ((er + 1) / 2) + ((er - 1) / 2) * (1 + 12 * (h / W)) ** -0.5
+    f1 = (e_eff + 0.3) * (W / h + 0.264)
+    f2 = (e_eff - 0.258) * (W / h + 0.8)
+    delta_l = h * 0.412 * (f1 / f2)
+    resonant_frequency = light_velocity / (2 * (L + 2 * delta_l) * np.sqrt(e_eff))
+
+    k0 = 2 * np.pi * resonant_frequency / light_velocity
+    edge_impedance = evaluate_impedance(k0 * W, k0 * L, engine)
+    input_impedance = edge_impedance * np.cos(np.pi * inset / L) ** 2
+    gamma = np.abs((input_impedance - reference_impedance) / (input_impedance + reference_impedance))
+    with np.errstate(divide='ignore'):
+        return_loss_db = -20 * np.log10(gamma)
+
+    return ToleranceReport(
+        design, samples, bandwidth, min_return_loss_db,
+        resonant_frequency=resonant_frequency,
+        edge_impedance=edge_impedance,
+        input_impedance=input_impedance,
+        return_loss_db=return_loss_db,
+    )
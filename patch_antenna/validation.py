@@ -5,41 +5,153 @@ This module provides comprehensive validation functions to check design paramete
 and identify potential issues before fabrication. Essential for ensuring optimal
 antenna performance and manufacturability.
 
+ValidationRules evaluates every rule over whole arrays of designs and
+returns one integer bitmask per design, built from the rule flags below,
+so millions of designs can be screened without creating any strings.
+Thresholds are configurable, e.g. a fab's minimum feature size or a 75
+Ohm target impedance; messages() renders the warnings of a code on
+demand.
+
+    rules = ValidationRules(min_feature_size=0.15e-3)
+    codes = rules.evaluate(table)
+    clean = table.filter(codes == 0)
+
 Added by Al-Musbahi - Leeds SpaceComms
 (Enhancement to original library by Bhanuchander Udhayakumar)
 """
 
-def validate_design(design):
+# Rule flags, combined into a design's validation code
+ASPECT_RATIO = 1 << 0
+THICK_SUBSTRATE = 1 << 1
+NARROW_FEEDER = 1 << 2
+IMPEDANCE_MISMATCH = 1 << 3
+# Not a rule: set whenever an input is NaN, such as on failed BatchResult rows
+INVALID = 1 << 4
+
+RULES = (
+    (ASPECT_RATIO, 'aspect_ratio'),
+    (THICK_SUBSTRATE, 'thick_substrate'),
+    (NARROW_FEEDER, 'narrow_feeder'),
+    (IMPEDANCE_MISMATCH, 'impedance_mismatch'),
+)
+ALL_RULES = ASPECT_RATIO | THICK_SUBSTRATE | NARROW_FEEDER | IMPEDANCE_MISMATCH
+
+# Every flag a validation code can hold
+FLAGS = RULES + ((INVALID, 'invalid'),)
+
+# Design quantities the rules read
+INPUTS = ('patch_width', 'patch_length', 'wavelength', 'e_eff', 'h', 'feeder_width', 'input_impedance')
+
+
+class ValidationRules:
+    """Configurable design rules evaluated as bitmasks
+
+    Args:
+        max_aspect_ratio: Largest patch width/length ratio
+        wavelength_divisor: Flag substrates thicker than the wavelength in
+            the substrate divided by this
+        min_feature_size: Narrowest manufacturable feeder in meters
+        target_impedance: Desired input impedance in Ohms
+        impedance_tolerance: Allowed |input impedance - target| in Ohms
+        enabled: Flags of the rules to apply (default: all); INVALID is
+            set regardless
+    """
+
+    def __init__(self, max_aspect_ratio=2.0, wavelength_divisor=10, min_feature_size=0.1e-3,
+                 target_impedance=50, impedance_tolerance=10, enabled=ALL_RULES):
+        self.max_aspect_ratio = max_aspect_ratio
+        self.wavelength_divisor = wavelength_divisor
+        self.min_feature_size = min_feature_size
+        self.target_impedance = target_impedance
+        self.impedance_tolerance = impedance_tolerance
+        self.enabled = enabled
+
+    def code(self, patch_width, patch_length, wavelength, e_eff, h, feeder_width, input_impedance):
+        """Validation code from design quantities, floats or NumPy arrays alike"""
+        # NaN is the only value not equal to itself
+        invalid = False
+        for value in (patch_width, patch_length, wavelength, e_eff, h, feeder_width, input_impedance):
+            invalid = invalid | (value != value)
+        wavelength_in_substrate = wavelength / (e_eff ** 0.5)
+        code = (patch_width / patch_length > self.max_aspect_ratio) * ASPECT_RATIO
+        code = code | (h > wavelength_in_substrate / self.wavelength_divisor) * THICK_SUBSTRATE
+        code = code | (feeder_width < self.min_feature_size) * NARROW_FEEDER
+        code = code | (abs(input_impedance - self.target_impedance) > self.impedance_tolerance) * IMPEDANCE_MISMATCH
+        return (code & self.enabled) | invalid * INVALID
+
+    def check(self, design):
+        """Validation code of one design as an int"""
+        return int(self.code(*(getattr(design, name) for name in INPUTS)))
+
+    def evaluate(self, designs):
+        """Validation codes of many designs as a uint32 array
+
+        designs may be a DesignTable, a BatchResult, a SweepResult or a
+        list of designs. Rows holding NaN (such as failed BatchResult
+        rows) get the INVALID flag and no other.
+        """
+        import numpy as np
+        from .table import design_columns
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            codes = self.code(**design_columns(designs, INPUTS))
+        return np.asarray(codes, dtype=np.uint32)
+
+    def messages(self, code, design):
+        """Warning strings for the flags set in code
+
+        design supplies the values quoted in the messages.
+        """
+        messages = []
+        if code & ASPECT_RATIO:
+            messages.append(f"Warning: Patch width/length ratio > {self.max_aspect_ratio} may reduce efficiency")
+        if code & THICK_SUBSTRATE:
+            messages.append(f"Warning: Substrate thickness > λ/{self.wavelength_divisor:g} may cause surface waves")
+        if code & NARROW_FEEDER:
+            messages.append(f"Warning: Feeder width < {self.min_feature_size * 1000:g}mm "
+                            f"may be difficult to manufacture")
+        if code & IMPEDANCE_MISMATCH:
+            messages.append(f"Warning: Input impedance ({design.input_impedance:.1f}Ohm) deviates significantly "
+                            f"from {self.target_impedance:g}Ohm")
+        if code & INVALID:
+            messages.append("Warning: Design has undefined (NaN) values and could not be validated")
+        return messages
+
+    def counts(self, codes):
+        """Number of designs flagged by each rule (and INVALID), by name"""
+        import numpy as np
+
+        codes = np.asarray(codes)
+        return {name: int(np.count_nonzero(codes & flag)) for flag, name in FLAGS}
+
+
+DEFAULT_RULES = ValidationRules()
+
+
+def rule_names(code):
+    """Names of the rules (and INVALID) flagged in a validation code"""
+    return [name for flag, name in FLAGS if code & flag]
+
+
+def validate_designs(designs, rules=None):
+    """Validation codes of many designs, see ValidationRules.evaluate()"""
+    return (DEFAULT_RULES if rules is None else rules).evaluate(designs)
+
+
+def validate_design(design, rules=None):
     """
     Validate design parameters and provide optimization warnings.
-    
+
     Performs comprehensive checks on antenna design parameters including
     efficiency, manufacturability, and impedance matching. Provides actionable
     warnings to help optimize the design before fabrication.
-    
+
     Args:
         design: Antenna design object containing all parameters
-    
+        rules: Optional ValidationRules with custom thresholds
+
     Returns:
         List of warning strings describing potential issues
     """
-    warnings = []
-    
-    # Check patch aspect ratio for optimal efficiency
-    if design.patch_width / design.patch_length > 2.0:
-        warnings.append("Warning: Patch width/length ratio > 2.0 may reduce efficiency")
-    
-    # Check substrate thickness relative to wavelength
-    wavelength_in_substrate = design.wavelength / (design.e_eff ** 0.5)
-    if design.h > wavelength_in_substrate / 10:
-        warnings.append("Warning: Substrate thickness > λ/10 may cause surface waves")
-    
-    # Check manufacturability constraints
-    if design.feeder_width < 0.1e-3:  # 0.1mm minimum feature size
-        warnings.append("Warning: Feeder width < 0.1mm may be difficult to manufacture")
-    
-    # Check impedance matching quality
-    if abs(design.input_impedance - 50) > 10:
-        warnings.append(f"Warning: Input impedance ({design.input_impedance:.1f}Ohm) deviates significantly from 50Ohm")
-    
-    return warnings
+    rules = DEFAULT_RULES if rules is None else rules
+    return rules.messages(rules.check(design), design)
@@ -21,9 +21,13 @@ setup(
     zip_safe=False,
     python_requires='>=3.7',
     install_requires=[
+        'numpy>=1.17',
         'scipy>=1.9.0',
         'gerber-writer>=0.3.4'
     ],
+    entry_points={
+        'console_scripts': ['patch-antenna=patch_antenna.cli:main'],
+    },
     extras_require={
         'dev': ['pytest', 'pytest-cov', 'flake8'],
         'docs': ['sphinx', 'sphinx-rtd-theme']
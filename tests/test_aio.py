@@ -0,0 +1,90 @@
+import asyncio
+import io
+
+import pytest
+
+import patch_antenna as pa
+from patch_antenna import aio
+
+
+@pytest.fixture(autouse=True)
+def default_executor():
+    yield
+    aio.shutdown()
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_design_async_matches_and_merges():
+    async def main():
+        return await asyncio.gather(*[aio.design_async(2.4e9, 4.4, 1.6e-3, engine='fast') for _ in range(8)])
+
+    before = aio.stats()
+    designs = _run(main())
+    after = aio.stats()
+    assert after['calls'] - before['calls'] == 8
+    assert after['merged'] - before['merged'] == 7
+    assert len({id(d) for d in designs}) == 8
+    assert designs[0].input_impedance == pa.design(2.4e9, 4.4, 1.6e-3, engine='fast').input_impedance
+
+
+def test_concurrency_limit():
+    import threading
+    import time
+
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work(i):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return i
+
+    aio.configure('thread', max_workers=8, max_concurrency=2)
+
+    async def main():
+        return await asyncio.gather(*[aio._run(work, i) for i in range(8)])
+
+    assert _run(main()) == list(range(8))
+    assert peak[0] == 2
+
+
+def test_band_gerber_and_export(tmp_path):
+    aio.configure('thread', max_concurrency=4)
+
+    async def main():
+        design = await aio.design_for_band_async('wifi_2_4ghz', 'fr4', 1.6, engine='fast')
+        data = await aio.write_gerber_async(design, feed_type='inset')
+        stream = io.StringIO()
+        await aio.write_gerber_async(design, stream)
+        path = str(tmp_path / 'summary.txt')
+        await asyncio.gather(aio.export_design_summary_async(design, path),
+                             aio.export_design_summary_async(design, path))
+        return design, data, stream.getvalue(), path
+
+    design, data, text, path = _run(main())
+    assert design.thickness_mm == 1.6
+    assert data.endswith(b'M02*')
+    assert text.endswith('M02*')
+    with open(path, encoding='utf-8') as infile:
+        assert infile.read() == pa.export.format_design_summary(design)
+
+
+def test_process_executor_and_errors():
+    aio.configure('process', max_workers=2)
+
+    async def main():
+        design = await aio.design_async(5.8e9, 3.38, 0.813e-3, engine='fast')
+        with pytest.raises(ValueError):
+            await aio.design_async(1e3, 4.4, 1.6e-3)
+        return design
+
+    assert _run(main()).patch_width > 0
+    with pytest.raises(ValueError):
+        aio.configure('fibers')
@@ -0,0 +1,31 @@
+import patch_antenna as pa
+import numpy as np
+import pytest
+
+
+def test_batch_matches_design():
+    freqs = np.array([433e6, 2.4e9, 5e9])
+    result = pa.design_batch(freqs, 4.4, 1.6e-3)
+    assert len(result) == 3
+    for i, freq in enumerate(freqs):
+        d = pa.design(freq, 4.4, 1.6e-3, engine='fast')
+        for name in ('patch_width', 'patch_length', 'e_eff', 'delta_l', 'feeder_width',
+                     'feeder_length', 'inset_length', 'ground_length', 'ground_width',
+                     'input_impedance'):
+            assert getattr(result, name)[i] == pytest.approx(getattr(d, name), rel=1e-12)
+
+
+def test_batch_broadcasts():
+    result = pa.design_batch(np.array([1e9, 2e9])[:, None], np.array([2.1, 4.4, 9.8]), 1e-3)
+    assert result.shape == (2, 3)
+    assert result.valid.all()
+
+
+def test_batch_range_masks():
+    result = pa.design_batch([0, 2.4e9, 2.4e9, 2.4e9], [4.4, 0, 4.4, 4.4], [1e-3, 1e-3, 2, 1e-3])
+    assert result.freq_valid.tolist() == [False, True, True, True]
+    assert result.er_valid.tolist() == [True, False, True, True]
+    assert result.h_valid.tolist() == [True, True, False, True]
+    assert result.valid.tolist() == [False, False, False, True]
+    assert np.isnan(result.patch_width[:3]).all()
+    assert np.isfinite(result.input_impedance[3])
@@ -0,0 +1,50 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'run_benchmarks.py')
+
+
+@pytest.fixture(scope='module')
+def bench():
+    spec = importlib.util.spec_from_file_location('run_benchmarks', PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _document(**timings):
+    return {'results': {name: {'min': t, 'median': t} for name, t in timings.items()}}
+
+
+def test_compare_flags_regressions(bench):
+    rows = bench.compare(_document(a=1.3, b=1.05, c=1.0), _document(a=1.0, b=1.0, d=1.0), threshold=20)
+    assert [(name, round(change), regressed) for name, _, _, change, regressed in rows] == \
+        [('a', 30, True), ('b', 5, False)]
+
+
+def test_quick_run_and_compare(bench, tmp_path):
+    output = str(tmp_path / 'results.json')
+    assert bench.main(['--quick', '--filter', 'format_design_summary', '--output', output]) == 0
+    with open(output) as infile:
+        document = json.load(infile)
+    assert len(document['results']) == len(bench.CASES)
+    assert all(result['min'] > 0 for result in document['results'].values())
+
+    # Pretend the baseline was ten times faster
+    for result in document['results'].values():
+        result['min'] /= 10
+    with open(output, 'w') as outfile:
+        json.dump(document, outfile)
+    assert bench.main(['--quick', '--filter', 'format_design_summary', '--compare', output]) == 1
+
+
+def test_import_time_names_missing_module(bench, monkeypatch):
+    class Completed:
+        stderr = 'import time: self [us] | cumulative | imported package\nimport time: bad | x | other\n'
+
+    monkeypatch.setattr(bench.subprocess, 'run', lambda *args, **kwargs: Completed)
+    with pytest.raises(RuntimeError, match='patch_antenna'):
+        bench.import_time('patch_antenna', repeat=1)
@@ -0,0 +1,34 @@
+import patch_antenna as pa
+import pytest
+
+
+@pytest.fixture
+def design_cache():
+    cache = pa.cache.enable_design_cache(maxsize=2)
+    yield cache
+    pa.disable_design_cache()
+
+
+def test_cache_disabled_by_default():
+    assert pa.design_cache_stats() is None
+
+
+def test_cache_hits_and_copies(design_cache):
+    first = pa.design_with_material(2.4e9, 'FR4', 1.6, engine='fast')
+    first.patch_width = 0
+    second = pa.design_with_material(2.4e9, 'FR4', 1.6, engine='fast')
+    assert second.patch_width > 0
+    assert second.thickness_mm == 1.6
+    stats = pa.design_cache_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['hit_rate'] == 0.5
+
+
+def test_cache_lru_eviction(design_cache):
+    for freq in (1e9, 2e9, 1e9, 3e9, 2e9):
+        pa.design(freq, 4.4, 1.6e-3, engine='fast')
+    stats = pa.design_cache_stats()
+    assert stats == {'hits': 1, 'misses': 4, 'evictions': 2, 'size': 2, 'maxsize': 2, 'hit_rate': 0.2}
+    pa.clear_design_cache()
+    assert pa.design_cache_stats()['size'] == 0
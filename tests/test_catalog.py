@@ -0,0 +1,63 @@
+import pytest
+
+import patch_antenna as pa
+from patch_antenna import catalog
+from patch_antenna.materials import MATERIALS
+from patch_antenna.store import FIELDS
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = str(tmp_path / 'catalog.bin')
+    yield path
+    pa.disable_design_catalog()
+
+
+def test_build_and_lookup(catalog_path):
+    pa.build_catalog(catalog_path, engine='fast')
+    reader = catalog.DesignCatalog(catalog_path)
+    assert reader.engine == 'fast'
+    assert reader.is_current()
+    assert len(reader) == len(catalog.catalog_specs())
+
+    direct = pa.design(1.575e9, 3.38, 0.813 / 1000, engine='fast')
+    stored = reader.lookup(1.575e9, 3.38, 0.813 / 1000)
+    for name in FIELDS:
+        assert getattr(stored, name) == getattr(direct, name)
+    assert reader.lookup(1.575e9, 3.38, 0.7e-3) is None
+
+
+def test_design_for_band_uses_catalog(catalog_path, monkeypatch):
+    pa.enable_design_catalog(catalog_path, engine='fast')
+    monkeypatch.setattr(pa.designer, 'design', None)  # computing a design would fail
+    design = pa.design_for_band('WIFI_2_4GHZ', 'FR4', 1.6, engine='fast')
+    assert design.material is MATERIALS['FR4']
+    assert design.thickness_mm == 1.6
+    assert design.engine == 'fast'
+
+
+def test_stale_catalog_is_rebuilt(catalog_path, monkeypatch):
+    pa.build_catalog(catalog_path, engine='fast')
+    monkeypatch.setitem(pa.conductance.ENGINE_VERSIONS, 'fast', 2)
+    assert not catalog.DesignCatalog(catalog_path).is_current()
+    with pytest.raises(ValueError):
+        pa.enable_design_catalog(catalog_path, build=False, engine='fast')
+    assert pa.enable_design_catalog(catalog_path, engine='fast').is_current()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a catalog' * 10)
+    with pytest.raises(ValueError):
+        catalog.DesignCatalog(str(path))
+
+
+def test_reopen_custom_catalog(catalog_path, monkeypatch):
+    bands = {'GPS_L1': 1.575e9}
+    materials = {'FR4': MATERIALS['FR4']}
+    pa.build_catalog(catalog_path, engine='fast', bands=bands, materials=materials)
+    monkeypatch.setattr(catalog, 'build_catalog', None)  # rebuilding would fail
+    reopened = pa.enable_design_catalog(catalog_path, build=False, engine='fast', bands=bands, materials=materials)
+    assert len(reopened) == len(MATERIALS['FR4'].thickness_options)
+    with pytest.raises(ValueError):
+        pa.enable_design_catalog(catalog_path, build=False, engine='fast')
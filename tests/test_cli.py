@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+
+import patch_antenna as pa
+from patch_antenna import cli
+
+SPECS = [
+    {'band': 'GPS_L1', 'material': 'FR4', 'thickness_mm': 1.6, 'name': 'gps'},
+    {'freq': 2.4e9, 'er': 3.55, 'thickness_mm': 0.813, 'feed_type': 'inset'},
+    {'freq': 200e9, 'material': 'FR4'},
+    {'band': 'NOT_A_BAND'},
+    {'freq': 5.8e9, 'material': 'ROGERS_RO4003C'},
+]
+
+
+def _write_jsonl(path, specs):
+    path.write_text(''.join(json.dumps(spec) + '\n' for spec in specs))
+
+
+def test_batch_jsonl_in_order(tmp_path, capsys):
+    infile = tmp_path / 'specs.jsonl'
+    _write_jsonl(infile, SPECS)
+    assert cli.main(['batch', str(infile), '--engine', 'fast', '--workers', '1']) == 1
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [r['index'] for r in records] == list(range(len(SPECS)))
+    assert '2 spec(s) failed' in err
+
+    gps = records[0]
+    expected = pa.design_with_material(pa.get_frequency('GPS_L1'), 'FR4', 1.6, engine='fast').get_result()
+    assert gps['name'] == 'gps' and gps['error'] is None
+    assert gps['patch_width'] == expected.patch_width
+    assert records[1]['material'] is None and records[1]['er'] == 3.55
+    assert records[2]['error'].startswith('ValueError: Frequency value')
+    assert records[3]['error'].startswith('ValueError: Unknown band: NOT_A_BAND')
+    assert records[4]['thickness_mm'] == pa.get_material('ROGERS_RO4003C').thickness_options[0]
+
+
+def test_batch_csv_process_pool_matches_serial(tmp_path):
+    specs = [{'freq': 1e9 + i * 5e7, 'material': 'FR4', 'thickness_mm': 1.6} for i in range(40)]
+    infile = tmp_path / 'specs.csv'
+    with open(infile, 'w', newline='') as f:
+        writer = csv.DictWriter(f, ['freq', 'material', 'thickness_mm'])
+        writer.writeheader()
+        writer.writerows(specs)
+
+    serial = list(cli.run_batch(cli.read_specs(open(infile, newline=''), cli.CSV), 'fast', workers=1))
+    outfile = tmp_path / 'out.csv'
+    assert cli.main(['batch', str(infile), '-o', str(outfile), '--engine', 'fast',
+                     '--workers', '2', '--chunk-size', '3']) == 0
+    with open(outfile, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [int(r['index']) for r in rows] == list(range(40))
+    assert [float(r['patch_length']) for r in rows] == [r['patch_length'] for r in serial]
+
+
+def test_batch_reads_stdin_and_writes_gerbers(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', io.StringIO(json.dumps(SPECS[0]) + '\n\n' + json.dumps(SPECS[1]) + '\n'))
+    gerbers = tmp_path / 'gerbers'
+    assert cli.main(['batch', '--engine', 'fast', '--workers', '1', '--gerber-dir', str(gerbers)]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r['gerber'] for r in records] == [str(gerbers / 'gps_normal.gbr'), str(gerbers / 'design_1_inset.gbr')]
+    assert (gerbers / 'gps_normal.gbr').read_text().rstrip().endswith('M02*')
+
+
+def test_design_command(capsys):
+    assert cli.main(['design', '--band', 'WIFI_2_4GHZ', '--material', 'FR4', '--thickness-mm', '1.6',
+                     '--engine', 'fast']) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result['patch_width'] == pa.design_for_band('WIFI_2_4GHZ', 'FR4', 1.6, engine='fast') \
+        .get_result().patch_width
+    assert cli.main(['design', '--freq', '2.4e9', '--engine', 'nope']) == 2
+
+
+def test_batch_reports_bad_lines_and_continues(tmp_path, capsys):
+    infile = tmp_path / 'specs.jsonl'
+    infile.write_text(json.dumps(SPECS[0]) + '\n{"freq": 2.4e9,\n\n[1, 2]\n' + json.dumps(SPECS[4]) + '\n')
+    assert cli.main(['batch', str(infile), '--engine', 'fast', '--workers', '1']) == 1
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r['index'] for r in records] == [0, 1, 2, 3]
+    assert records[1]['error'].startswith('JSONDecodeError: line 2: ')
+    assert records[2]['error'] == 'ValueError: line 4: Spec should be a JSON object, not list'
+    assert records[0]['error'] is None and records[3]['error'] is None
+    assert cli.process_spec(0, [1, 2])['error'] == 'TypeError: Spec should be an object, not list'
+
+
+def test_batch_workers_share_the_design_store(tmp_path):
+    path = str(tmp_path / 'designs.sqlite')
+    pa.store.enable_design_store(path)
+    try:
+        specs = [{'freq': 1e9 + i * 5e7, 'material': 'FR4', 'thickness_mm': 1.6} for i in range(8)]
+        records = list(cli.run_batch(specs, 'fast', workers=2, chunk_size=2))
+        assert all(r['error'] is None for r in records)
+        assert pa.design_store_stats()['rows'] == len(specs)
+    finally:
+        pa.disable_design_store()
+
+
+def test_design_command_writes_gerber(tmp_path, capsys):
+    gerber = tmp_path / 'wifi.gbr'
+    assert cli.main(['design', '--band', 'WIFI_2_4GHZ', '--material', 'FR4', '--engine', 'fast',
+                     '--feed-type', 'inset', '--gerber', str(gerber)]) == 0
+    assert json.loads(capsys.readouterr().out)['gerber'] == str(gerber)
+    assert gerber.read_text().rstrip().endswith('M02*')
@@ -0,0 +1,143 @@
+import numpy as np
+
+import patch_antenna as pa
+from patch_antenna.comparison import DesignComparison, format_comparison, pareto_front
+from patch_antenna.materials import MATERIALS, SubstrateMaterial
+
+
+def test_find_best_material_default():
+    results = pa.find_best_material(2.4e9, 1.6, engine='fast')
+    assert [name for name, _, _ in results] == ['PTFE', 'FR4']
+    errors = [error for _, _, error in results]
+    assert errors == sorted(errors)
+
+
+def test_find_best_material_all_thicknesses_top_k():
+    results = pa.find_best_material(2.4e9, all_thicknesses=True, top_k=3, engine='fast')
+    assert len(results) == 3
+    everything = pa.find_best_material(2.4e9, all_thicknesses=True, engine='fast')
+    assert len(everything) == sum(len(m.thickness_options) for m in MATERIALS.values())
+    assert [r[2] for r in results] == [r[2] for r in everything[:3]]
+    assert results[0][1].thickness_mm in MATERIALS[results[0][0]].thickness_options
+
+
+def test_find_best_material_pruning_and_registered_materials():
+    MATERIALS['TEST_LAMINATE'] = SubstrateMaterial('Test', 6.15, 0.002, [1.6])
+    try:
+        results = pa.find_best_material(2.4e9, 1.6, engine='fast')
+        assert 'TEST_LAMINATE' in [r[0] for r in results]
+        small = pa.find_best_material(2.4e9, 1.6, max_patch_mm=35, engine='fast')
+        assert [r[0] for r in small] == ['TEST_LAMINATE']
+    finally:
+        del MATERIALS['TEST_LAMINATE']
+
+
+def test_find_best_material_top_k_bounds_candidates(monkeypatch):
+    from patch_antenna import sweeps
+    rng = np.random.default_rng(11)
+    keys = ['TEST_BOUND_{}'.format(i) for i in range(120)]
+    evaluated = []
+    run_rows = sweeps.run_rows
+
+    def counting_run_rows(rows, *args):
+        evaluated.extend(rows)
+        return run_rows(rows, *args)
+
+    try:
+        for key, er in zip(keys, rng.uniform(2, 10, len(keys))):
+            MATERIALS[key] = SubstrateMaterial(key, round(er, 3), 0.002, [0.8, 1.6])
+        everything = pa.find_best_material(2.4e9, all_thicknesses=True, engine='fast')
+        monkeypatch.setattr(sweeps, 'run_rows', counting_run_rows)
+        best = pa.find_best_material(2.4e9, all_thicknesses=True, top_k=5, engine='fast')
+        assert [(r[0], r[1].thickness_mm, r[2]) for r in best] == \
+            [(r[0], r[1].thickness_mm, r[2]) for r in everything[:5]]
+        assert len(evaluated) < 10
+    finally:
+        for key in keys:
+            MATERIALS.pop(key, None)
+
+
+def _brute_pareto(values):
+    values = np.asarray(values, dtype=float)
+    return np.array([not np.isnan(v).any() and not any(
+        np.all(w <= v) and np.any(w < v) for w in values if not np.isnan(w).any()) for v in values])
+
+
+def test_pareto_front_matches_brute_force():
+    rng = np.random.default_rng(7)
+    for k in (1, 2, 3, 4):
+        values = rng.integers(0, 12, size=(300, k)).astype(float)
+        values[::37, 0] = np.nan
+        assert np.array_equal(pareto_front(values), _brute_pareto(values))
+
+
+def test_design_comparison_ranking_and_pareto():
+    table = pa.design_batch(np.linspace(1e9, 6e9, 60)[:, None], np.array([2.2, 3.5, 4.4, 9.8]), 1.6e-3,
+                            engine='fast')
+    comparison = DesignComparison(pa.DesignTable.from_batch(table))
+    assert len(comparison) == 240
+    order = comparison.order(['impedance_error', '-freq'])
+    errors = comparison['impedance_error'][order]
+    assert np.all(np.diff(errors) >= 0)
+    assert list(comparison.top('ground_area', 3)) == list(np.argsort(comparison['ground_area'], kind='stable')[:3])
+
+    front = comparison.pareto(['ground_area', 'impedance_error', '-er'])
+    values = np.column_stack([comparison['ground_area'], comparison['impedance_error'], -comparison['er']])
+    assert set(front) == set(np.flatnonzero(_brute_pareto(values)))
+    assert np.all(np.diff(comparison['ground_area'][front]) >= 0)
+
+    subset = comparison.select(front)
+    assert len(subset) == len(front)
+    assert subset.labels == ['Design {}'.format(i + 1) for i in front]
+
+
+def test_design_comparison_from_designs(capsys):
+    designs = [pa.design_with_material(2.4e9, name, 1.6, engine='fast') for name in ('FR4', 'PTFE')]
+    comparison = DesignComparison(designs, target_impedance=200)
+    assert list(comparison['loss_tangent']) == [0.02, 0.0004]
+    assert comparison['impedance_error'][0] == abs(designs[0].input_impedance - 200)
+    pa.compare_designs(designs, ['fr4', 'ptfe'])
+    assert capsys.readouterr().out == format_comparison(DesignComparison(designs, ['fr4', 'ptfe'])) + '\n'
+
+
+def _baseline_table(designs, labels):
+    # The table as compare_designs() printed it before DesignComparison
+    lines = [f"{'Parameter':<20} " + " ".join(f"{label:<15}" for label in labels),
+             "-" * (20 + 16 * len(designs))]
+    params = [
+        ('Frequency (GHz)', lambda d: d.freq / 1e9),
+        ('Patch Width (mm)', lambda d: d.patch_width * 1000),
+        ('Patch Length (mm)', lambda d: d.patch_length * 1000),
+        ('Feeder Width (mm)', lambda d: d.feeder_width * 1000),
+        ('Feeder Length (mm)', lambda d: d.feeder_length * 1000),
+        ('Input Impedance (Ohm)', lambda d: d.input_impedance),
+        ('Total Area (mm²)', lambda d: (d.ground_width * d.ground_length) * 1e6),
+    ]
+    for param_name, getter in params:
+        lines.append(f"{param_name:<20} " + " ".join(f"{getter(d):>14.2f}" for d in designs))
+    return "\n".join(lines) + "\n"
+
+
+def test_compare_designs_output_matches_baseline(capsys):
+    designs = [pa.design(freq, 4.4, 1.6e-3, engine='fast') for freq in (1.575e9, 2.405e9, 2.425e9, 2.445e9)]
+    labels = ['GPS_L1', 'WiFi 1', 'WiFi 4', 'WiFi 8']
+    pa.compare_designs(designs, labels)
+    out = capsys.readouterr().out
+    assert out == _baseline_table(designs, labels)
+    assert out.splitlines()[2].split()[2] == '1.57'
+
+
+def test_pareto_3d_matches_brute_force_with_ties():
+    from patch_antenna.comparison import _pareto_3d
+
+    rng = np.random.default_rng(23)
+    for high in (3, 6, 50):
+        values = rng.integers(0, high, size=(400, 3)).astype(float)
+        assert np.array_equal(pareto_front(values), _brute_pareto(values))
+        # _pareto_3d takes sorted distinct points
+        points = np.unique(values, axis=0)
+        assert np.array_equal(_pareto_3d(points), _brute_pareto(points))
+
+    # Every point on the front, the worst case for the sweep
+    x = rng.random(300)
+    assert pareto_front(np.column_stack([x, x, -x])).all()
@@ -0,0 +1,66 @@
+import os
+
+import patch_antenna as pa
+from patch_antenna import conductance, conductance_table
+import numpy as np
+import pytest
+
+
+def test_fast_engine_matches_quad():
+    for freq, er, h in [(2.4e9, 4.4, 1.6e-3), (433e6, 2.1, 0.8e-3), (10e9, 9.8, 0.635e-3)]:
+        ref = pa.design(freq, er, h, engine='quad')
+        fast = pa.design(freq, er, h, engine='fast')
+        assert fast.input_impedance == pytest.approx(ref.input_impedance, rel=1e-9)
+        assert fast.inset_length == pytest.approx(ref.inset_length, rel=1e-9)
+
+
+def test_fast_engine_broadcasts():
+    k0w = np.array([0.5, 1.0, 2.0])
+    k0l = np.array([[1.0], [2.5]])
+    g12 = conductance.fast_g12(k0w, k0l)
+    assert g12.shape == (2, 3)
+    assert g12[1, 2] == pytest.approx(conductance.quad_g12(2.0, 2.5), rel=1e-9)
+    assert conductance.fast_g1(1.5) == pytest.approx(conductance.quad_g1(1.5), rel=1e-9)
+
+
+def test_default_engine():
+    assert pa.get_default_engine() == 'quad'
+    pa.set_default_engine('fast')
+    try:
+        assert pa.design(2.4e9, 4.4, 1.6e-3).engine == 'fast'
+    finally:
+        pa.set_default_engine('quad')
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError) as execinfo:
+        pa.design(2.4e9, 4.4, 1.6e-3, engine='dummy')
+    assert execinfo.value.args[0] == 'Engine should be : fast, quad, table'
+
+
+def test_table_cache_round_trip(tmp_path):
+    path = str(tmp_path / 'table.npz')
+    built = conductance_table.load_or_build(path, grid_size=(65, 65))
+    assert built.max_error < 1e-6
+    loaded = conductance_table.ConductanceTable.load(path)
+    assert loaded.max_error == built.max_error
+    assert loaded.g12(1.2, -2.0) == pytest.approx(conductance.fast_g12(1.2, 2.0), rel=1e-6)
+
+
+def test_table_engine(tmp_path, monkeypatch):
+    # Keep the cache out of the user's home directory
+    monkeypatch.setenv('PATCH_ANTENNA_CACHE_DIR', str(tmp_path))
+    path = conductance_table.default_cache_path()
+    conductance_table.ConductanceTable.build(check_points=0).save(path)
+    conductance_table.set_default_table(None)
+    try:
+        ref = pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')
+        table = pa.design(2.4e9, 4.4, 1.6e-3, engine='table')
+        # The unchecked table saved above was loaded, nothing else was written
+        assert conductance_table.get_default_table().max_error is None
+        assert os.listdir(str(tmp_path)) == [os.path.basename(path)]
+        assert table.input_impedance == pytest.approx(ref.input_impedance, rel=1e-7)
+        # Outside the tabulated region the fast engine is used
+        assert conductance.table_g12(2.0, 40.0) == conductance.fast_g12(2.0, 40.0)
+    finally:
+        conductance_table.set_default_table(None)
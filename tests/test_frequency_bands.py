@@ -0,0 +1,119 @@
+import json
+import random
+
+import pytest
+
+import patch_antenna as pa
+from patch_antenna import frequency_bands
+from patch_antenna.frequency_bands import FREQUENCY_BANDS, BandDatabase, FrequencyBand
+
+
+@pytest.fixture
+def band_database(monkeypatch):
+    """A copy of the module database, so registered bands do not leak"""
+    database = BandDatabase(frequency_bands.get_band_database())
+    monkeypatch.setattr(frequency_bands, '_database', database)
+    return database
+
+
+def test_builtin_bands_unchanged():
+    assert pa.get_frequency('gps_l1') == 1.575e9
+    assert pa.get_frequency('NOT_A_BAND') is None
+    assert pa.find_bands_in_range(2.4e9, 2.45e9) == {'WIFI_2_4GHZ': 2.4e9, 'ZIGBEE': 2.4e9, 'BLUETOOTH': 2.45e9}
+    assert {band.name for band in pa.find_overlapping_bands(2.45e9, 2.46e9)} == {'WIFI_2_4GHZ', 'BLUETOOTH', 'ZIGBEE'}
+    assert pa.nearest_band(1.58e9).name == 'GPS_L1'
+    assert pa.nearest_band(1.4e9).name == 'GPS_L2'
+
+
+def test_overlap_and_nearest_match_linear_scan():
+    rng = random.Random(3)
+    bands = []
+    for i in range(2000):
+        lower = rng.uniform(1e6, 1e10)
+        bands.append(FrequencyBand('B{}'.format(i), lower, lower + rng.expovariate(1 / 5e7)))
+    bands.append(FrequencyBand('WIDE', 2e9, 8e9))
+    database = BandDatabase(bands)
+
+    for _ in range(200):
+        f1 = rng.uniform(0, 1.1e10)
+        f2 = f1 + rng.choice([0, 1e6, 1e8])
+        expected = {b.name for b in bands if b.lower <= f2 and b.upper >= f1}
+        assert {b.name for b in database.overlapping(f1, f2)} == expected
+        nearest = database.nearest(f1)
+        assert nearest.distance(f1) == min(b.distance(f1) for b in bands)
+
+
+class _CountingBand(FrequencyBand):
+    __slots__ = ()
+    reads = 0
+
+    def __getattribute__(self, name):
+        _CountingBand.reads += 1
+        return super().__getattribute__(name)
+
+
+def test_wide_band_does_not_make_queries_linear():
+    rng = random.Random(4)
+    bands = []
+    for i in range(20000):
+        lower = rng.uniform(1e6, 1e10)
+        bands.append(_CountingBand('B{}'.format(i), lower, lower + rng.uniform(0, 1e5)))
+    bands.append(_CountingBand('WIDE', 1e6, 1e10))
+    database = BandDatabase(bands)
+    database.overlapping(0, 0)
+
+    for frequency in (1e7, 5e9, 9e9):
+        _CountingBand.reads = 0
+        found = database.overlapping(frequency, frequency)
+        assert 'WIDE' in [band.name for band in found]
+        # Only the bands found are touched
+        assert _CountingBand.reads <= 2 * len(found)
+
+
+def test_load_and_register_bands(tmp_path, band_database):
+    csv_path = tmp_path / 'bands.csv'
+    csv_path.write_text('name,lower,upper,service\nTEST_ISM_24G,24000,24250,ISM\nTEST_RADAR,76000,81000,\n')
+    database = BandDatabase()
+    assert database.load(str(csv_path), unit='MHz') == 2
+    assert database.get('test_ism_24g').frequency == 24.125e9
+    assert database.get('TEST_ISM_24G').service == 'ISM'
+    assert [b.name for b in database.overlapping(80e9, 90e9)] == ['TEST_RADAR']
+
+    json_path = tmp_path / 'bands.json'
+    json_path.write_text(json.dumps({'bands': [{'name': 'TEST_S', 'lower': 2.2e9, 'upper': 2.3e9,
+                                                'frequency': 2.25e9}]}))
+    assert database.load(str(json_path)) == 1
+    with pytest.raises(ValueError):
+        database.load(str(json_path), unit='THz')
+
+    band = pa.register_band('TEST_REGISTERED', 3.3e9, 3.4e9)
+    assert pa.get_frequency('test_registered') == band.frequency == 3.35e9
+    assert 'TEST_REGISTERED' in pa.list_bands()
+    assert pa.design_for_band('TEST_REGISTERED', 'FR4', 1.6, engine='fast').freq == 3.35e9
+    assert band_database.get('TEST_REGISTERED') is band
+
+
+def test_find_bands_in_range_reads_frequency_bands(band_database):
+    pa.register_band('TEST_IN_RANGE', 2.41e9, 2.42e9)
+    FREQUENCY_BANDS['TEST_EDITED'] = 2.43e9
+    try:
+        assert pa.find_bands_in_range(2.4e9, 2.45e9) == {'WIFI_2_4GHZ': 2.4e9, 'BLUETOOTH': 2.45e9,
+                                                        'ZIGBEE': 2.4e9, 'TEST_EDITED': 2.43e9}
+    finally:
+        del FREQUENCY_BANDS['TEST_EDITED']
+
+
+@pytest.mark.parametrize('rows', ['name,lower,upper\nTEST_OK,1,2\nTEST_NO_LOWER,,3\n',
+                                  'name,lower,upper\nTEST_OK,1,2\n,2,3\n',
+                                  'name,lower,upper\nTEST_OK,1,2\nTEST_BAD,low,3\n'])
+def test_load_rejects_incomplete_rows(tmp_path, rows):
+    path = tmp_path / 'bands.csv'
+    path.write_text(rows)
+    database = BandDatabase()
+    with pytest.raises(ValueError, match='Band row 2 of '):
+        database.load(str(path))
+    assert len(database) == 0
+
+
+def test_registered_bands_do_not_leak():
+    assert not [name for name in pa.list_bands() if name.startswith('TEST_')]
@@ -0,0 +1,55 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import patch_antenna as pa
+import pytest
+
+
+def _strip_date(text):
+    return [line for line in text.splitlines() if 'CreationDate' not in line]
+
+
+def _designs():
+    return [pa.design(freq, er, 1.6e-3, engine='fast')
+            for freq in (1e9, 2.4e9, 5.8e9) for er in (2.2, 3.48, 4.4)]
+
+
+@pytest.fixture
+def gerber_cache(tmp_path):
+    cache = pa.gerber_cache.enable_gerber_cache(str(tmp_path))
+    yield cache
+    pa.disable_gerber_cache()
+
+
+def test_concurrent_generation_matches_serial():
+    jobs = [(d, feed) for d in _designs() for feed in ('normal', 'inset')] * 4
+    serial = [pa.write_gerber_design(d, feed_type=feed) for d, feed in jobs]
+    with ThreadPoolExecutor(8) as executor:
+        threaded = list(executor.map(lambda job: pa.write_gerber_design(job[0], feed_type=job[1]), jobs))
+    assert [_strip_date(t.decode()) for t in threaded] == [_strip_date(s.decode()) for s in serial]
+
+
+def test_artwork_key_is_geometry_based():
+    design = _designs()[0]
+    gw = pa.PatchGerberWriter(design)
+    assert gw.artwork_key('normal') == pa.PatchGerberWriter(design).artwork_key('normal')
+    assert gw.artwork_key('normal') != gw.artwork_key('inset')
+    moved = pa.design(design.freq * 1.001, design.er, design.h, engine='fast')
+    assert pa.PatchGerberWriter(moved).artwork_key('normal') != gw.artwork_key('normal')
+
+
+def test_cache_regenerates_only_changed_designs(gerber_cache, tmp_path):
+    designs = _designs()
+    first = [pa.write_gerber_design(d) for d in designs]
+    assert pa.gerber_cache_stats()['misses'] == len(designs)
+
+    # A fresh process-wide cache on the same directory finds the artwork on disk
+    pa.gerber_cache.enable_gerber_cache(str(tmp_path))
+    designs[4] = pa.design(3e9, 4.4, 1.6e-3, engine='fast')
+    second = [pa.write_gerber_design(d) for d in designs]
+    stats = pa.gerber_cache_stats()
+    assert (stats['misses'], stats['disk_hits']) == (1, len(designs) - 1)
+    assert [s for i, s in enumerate(second) if i != 4] == [f for i, f in enumerate(first) if i != 4]
+
+    pa.clear_gerber_cache(remove_files=True)
+    assert not any(name.endswith('.gbr') for _, _, files in os.walk(str(tmp_path)) for name in files)
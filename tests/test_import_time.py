@@ -0,0 +1,46 @@
+"""Import-time regression guards, run in fresh interpreters"""
+
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ('numpy', 'scipy', 'gerber_writer', 'sqlite3')
+# The only package modules `import patch_antenna` may load
+EAGER_MODULES = ['patch_antenna', 'patch_antenna.frequency_bands', 'patch_antenna.materials']
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code, *options):
+    return subprocess.run([sys.executable] + list(options) + ['-c', code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+
+
+def _loaded_after(code):
+    probe = '{}\nimport json, sys\nprint(json.dumps([m for m in {!r} if m in sys.modules]))'.format(
+        code, HEAVY_MODULES)
+    return json.loads(_run(probe).stdout)
+
+
+def test_package_import_is_light():
+    assert _loaded_after('import patch_antenna') == []
+    assert _loaded_after("import patch_antenna as pa; pa.get_frequency('GPS_L1'); pa.get_material('FR4')") == []
+
+
+def test_design_does_not_load_gerber_writer():
+    loaded = _loaded_after("import patch_antenna as pa; pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')")
+    assert 'gerber_writer' not in loaded
+
+
+def test_lazy_attributes_resolve():
+    out = _run("import patch_antenna as pa, patch_antenna.comparison\n"
+               "print(all(getattr(pa, name) is not None for name in pa.__all__), pa.sweep.__module__)").stdout
+    assert out.split() == ['True', 'patch_antenna.sweeps']
+
+
+def test_import_loads_only_the_tables():
+    # Timing depends on the machine, so check what gets imported instead
+    stderr = _run('import patch_antenna', '-X', 'importtime').stderr
+    imported = [line.split('|')[2].strip() for line in stderr.splitlines() if line.startswith('import time:')]
+    assert sorted(name for name in imported if name.startswith('patch_antenna')) == EAGER_MODULES
+    assert not {'csv', 'json', 'threading'} & set(imported)
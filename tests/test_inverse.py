@@ -0,0 +1,53 @@
+import patch_antenna as pa
+from patch_antenna import conductance, inverse
+import pytest
+
+
+def test_sizing_jacobian_matches_finite_differences():
+    point = {'freq': 2.4e9, 'er': 4.4, 'h': 1.6e-3}
+    values, derivatives = inverse.sizing_jacobian(**point)
+    for variable, step in (('freq', 1e3), ('er', 1e-6), ('h', 1e-9)):
+        up = dict(point, **{variable: point[variable] + step})
+        down = dict(point, **{variable: point[variable] - step})
+        for name in values:
+            numeric = (inverse.sizing_jacobian(**up)[0][name] - inverse.sizing_jacobian(**down)[0][name]) / (2 * step)
+            assert derivatives[name][variable] == pytest.approx(numeric, rel=1e-6, abs=1e-12)
+
+
+def test_solve_frequency_round_trip():
+    reference = pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')
+    solution = inverse.solve_frequency(reference.patch_length, 4.4, 1.6e-3, engine='fast')
+    assert solution.value == pytest.approx(2.4e9, rel=1e-10)
+    assert solution.evaluations < 20
+
+
+def test_solve_dielectric_constant():
+    reference = pa.design(2.4e9, 3.38, 0.813e-3, engine='fast')
+    by_length = inverse.solve_dielectric_constant(2.4e9, 0.813e-3, patch_length=reference.patch_length)
+    assert by_length.value == pytest.approx(3.38, rel=1e-9)
+    by_width = inverse.solve_dielectric_constant(2.4e9, 0.813e-3, patch_width=reference.patch_width)
+    assert by_width.value == pytest.approx(3.38, rel=1e-12)
+
+
+def test_solve_for_edge_impedance():
+    solution = inverse.solve_for_edge_impedance(400, 2.4e9, h=1.6e-3, engine='fast')
+    assert solution.design.input_impedance == pytest.approx(400, rel=1e-9)
+    assert solution.evaluations < 20
+    with pytest.raises(ValueError):
+        inverse.solve_for_edge_impedance(100, 2.4e9, h=1.6e-3)
+
+
+def test_solve_for_edge_impedance_uses_the_requested_engine(monkeypatch):
+    # An engine 2% off the fast one: the solve must meet the target with it
+    g1, g12 = conductance.get_engine('quad')
+    monkeypatch.setitem(conductance.ENGINES, 'quad', (lambda x: 1.02 * g1(x), lambda x, y: 1.02 * g12(x, y)))
+    solution = inverse.solve_for_edge_impedance(300, 2.4e9, er=4.4, engine='quad')
+    assert solution.design.engine == 'quad'
+    assert solution.design.input_impedance == pytest.approx(300, rel=1e-9)
+    assert solution.evaluations < 20
+
+
+def test_solve_inset_length():
+    design = pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')
+    assert inverse.solve_inset_length(design) == pytest.approx(design.inset_length)
+    assert inverse.solve_inset_length(design, 75) < design.inset_length
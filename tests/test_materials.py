@@ -0,0 +1,89 @@
+import json
+import random
+
+import patch_antenna as pa
+from patch_antenna.materials import MATERIALS, MaterialIndex, SubstrateMaterial, find_materials, get_material_index
+
+
+def test_find_materials_builtin():
+    assert [key for key, _ in find_materials(3.0, 3.6, 0.004, 1.524)] == ['ROGERS_RO4003C', 'ROGERS_RO4350B']
+    assert [key for key, _ in find_materials(thickness_mm=1.6)] == ['FR4', 'PTFE']
+    assert [key for key, _ in find_materials()] == list(MATERIALS)
+    assert find_materials(er_min=20) == []
+
+
+def test_index_matches_linear_scan():
+    rng = random.Random(5)
+    thicknesses = [0.254, 0.508, 0.762, 0.813, 1.524, 1.6, 3.175]
+    materials = {'M{}'.format(i): SubstrateMaterial('M{}'.format(i), round(rng.uniform(2, 11), 2),
+                                                    round(rng.uniform(1e-4, 2e-2), 5), rng.sample(thicknesses, 3))
+                 for i in range(500)}
+    index = MaterialIndex(materials)
+    for _ in range(50):
+        er_min = rng.uniform(2, 8)
+        er_max = er_min + rng.uniform(0, 3)
+        tan_d = rng.uniform(1e-4, 2e-2)
+        thickness = rng.choice(thicknesses)
+        expected = [key for key, m in materials.items() if er_min <= m.dielectric_constant <= er_max
+                    and m.loss_tangent <= tan_d and thickness in m.thickness_options]
+        assert index.query(er_min, er_max, tan_d, thickness) == expected
+
+
+def test_load_and_register_materials(tmp_path):
+    csv_path = tmp_path / 'laminates.csv'
+    csv_path.write_text('name,dielectric_constant,loss_tangent,thickness_options\n'
+                        'Test Laminate A,3.0,0.0013,0.508;1.524\n')
+    json_path = tmp_path / 'laminates.json'
+    json_path.write_text(json.dumps({'materials': [
+        {'key': 'TEST_B', 'name': 'Test B', 'dielectric_constant': 6.15, 'loss_tangent': 0.0027,
+         'thickness_options': [0.635, 1.27]}]}))
+    try:
+        assert pa.load_materials(str(csv_path)) == ['TEST_LAMINATE_A']
+        assert pa.load_materials(str(json_path)) == ['TEST_B']
+        assert pa.get_material('test laminate a').thickness_options == [0.508, 1.524]
+        assert 'TEST_LAMINATE_A' in [key for key, _ in find_materials(2.9, 3.1, thickness_mm=1.524)]
+        assert [key for key, _ in find_materials(6, 7)] == ['TEST_B']
+
+        results = pa.find_best_material(2.4e9, 1.524, dielectric_range=(2.9, 3.1), engine='fast')
+        assert [name for name, _, _ in results] == ['TEST_LAMINATE_A']
+        low_loss = pa.find_best_material(2.4e9, all_thicknesses=True, max_loss_tangent=0.001, engine='fast')
+        assert {name for name, _, _ in low_loss} == {'PTFE', 'ALUMINA'}
+    finally:
+        MATERIALS.pop('TEST_LAMINATE_A', None)
+        MATERIALS.pop('TEST_B', None)
+    assert find_materials(6, 7) == []
+
+
+def test_index_follows_direct_edits():
+    fr4, ptfe = MATERIALS['FR4'], MATERIALS['PTFE']
+    keys = list(MATERIALS)
+    try:
+        assert pa.find_best_material(2.4e9, 1.6, engine='fast')
+        MATERIALS['FR4'] = SubstrateMaterial('FR4', 4.3, fr4.loss_tangent, fr4.thickness_options)
+        results = dict((name, design) for name, design, _ in pa.find_best_material(2.4e9, 1.6, engine='fast'))
+        assert results['FR4'].er == 4.3
+
+        del MATERIALS['PTFE']
+        MATERIALS['NEWMAT'] = SubstrateMaterial('New Mat', 2.5, 0.001, [1.6])
+        assert [key for key, _ in find_materials(thickness_mm=1.6)] == ['FR4', 'NEWMAT']
+        results = pa.find_best_material(2.4e9, 1.6, engine='fast')
+        assert {name for name, _, _ in results} == {'FR4', 'NEWMAT'}
+        assert all(design.material is not None for _, design, _ in results)
+    finally:
+        MATERIALS.pop('NEWMAT', None)
+        MATERIALS['FR4'], MATERIALS['PTFE'] = fr4, ptfe
+        for key in keys:
+            MATERIALS[key] = MATERIALS.pop(key)
+    assert [key for key, _ in find_materials(thickness_mm=1.6)] == ['FR4', 'PTFE']
+
+
+def test_index_reused_until_materials_change():
+    index = get_material_index()
+    assert get_material_index() is index
+    MATERIALS['TEST_GEN'] = SubstrateMaterial('Test', 3.0, 0.001, [1.6])
+    try:
+        assert get_material_index() is not index
+        assert 'TEST_GEN' in get_material_index().query(thickness_mm=1.6)
+    finally:
+        MATERIALS.pop('TEST_GEN', None)
+    assert 'TEST_GEN' not in get_material_index().query(thickness_mm=1.6)
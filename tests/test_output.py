@@ -0,0 +1,48 @@
+import io
+import zipfile
+
+import patch_antenna as pa
+
+
+def _design():
+    return pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')
+
+
+def test_gerber_to_streams_and_bytes():
+    design = _design()
+    data = pa.write_gerber_design(design, feed_type='inset')
+    assert isinstance(data, bytes)
+    assert data.endswith(b'M02*')
+
+    text_stream, binary_stream = io.StringIO(), io.BytesIO()
+    pa.write_gerber_design(design, text_stream, 'inset')
+    pa.write_gerber_design(design, binary_stream, 'inset')
+    strip = lambda s: [l for l in s.splitlines() if 'CreationDate' not in l]
+    assert strip(text_stream.getvalue()) == strip(data.decode('ascii'))
+    assert strip(binary_stream.getvalue().decode('ascii')) == strip(data.decode('ascii'))
+
+
+def test_export_to_stream(tmp_path):
+    design = _design()
+    stream = io.BytesIO()
+    pa.export_design_summary(design, stream)
+    path = str(tmp_path / 'summary.txt')
+    pa.export_design_summary(design, path)
+    assert stream.getvalue() == open(path, 'rb').read().replace(b'\r\n', b'\n')
+
+
+def test_bundle_in_memory():
+    data = pa.write_bundle({'wifi': _design()}, panel=True)
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert sorted(archive.namelist()) == [
+            'panel_copper.gbr', 'panel_profile.gbr',
+            'wifi/manufacturing.txt', 'wifi/summary.txt',
+            'wifi/wifi_inset.gbr', 'wifi/wifi_normal.gbr']
+        assert archive.read('wifi/summary.txt').decode('utf-8') == pa.export.format_design_summary(_design())
+
+
+def test_bundle_to_path(tmp_path):
+    path = str(tmp_path / 'bundle.zip')
+    assert pa.write_bundle([_design()], path, reports=False) is None
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == ['design_1/design_1_inset.gbr', 'design_1/design_1_normal.gbr']
@@ -0,0 +1,37 @@
+import patch_antenna as pa
+from patch_antenna.panel import PanelGerberWriter, write_panel_gerber
+
+
+def _designs():
+    return [(pa.design(freq, 4.4, 1.6e-3, engine='fast'), feed)
+            for freq in (1.575e9, 2.4e9, 5e9) for feed in ('normal', 'inset')]
+
+
+def test_panel_placements_do_not_overlap():
+    writer = PanelGerberWriter(_designs(), spacing=2.0, margin=5.0, panel_width=150)
+    boxes = []
+    for (gw, _), (x, y) in zip(writer.items, writer.placements):
+        w, h = gw.get_size()
+        boxes.append((x, y, x + w, y + h))
+        assert x + w <= writer.size[0] - 5.0 + 1e-9
+    for i, a in enumerate(boxes):
+        for b in boxes[i + 1:]:
+            assert a[2] + 2.0 <= b[0] + 1e-9 or b[2] + 2.0 <= a[0] + 1e-9 or \
+                a[3] + 2.0 <= b[1] + 1e-9 or b[3] + 2.0 <= a[1] + 1e-9
+
+
+def test_panel_single_layer_output(tmp_path):
+    copper, profile = str(tmp_path / 'panel_copper.gbr'), str(tmp_path / 'panel_profile.gbr')
+    write_panel_gerber(_designs(), copper, profile)
+    copper_text = open(copper).read()
+    profile_text = open(profile).read()
+    assert copper_text.count('G36*') == 6
+    assert profile_text.count('%ADD') == 1
+    assert 'TF.FileFunction,Profile,NP' in profile_text
+
+
+def test_panel_accepts_plain_designs(tmp_path):
+    writer = PanelGerberWriter([pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')])
+    assert writer.items[0][1] == 'normal'
+    writer.write_gerber(str(tmp_path / 'single.gbr'))
+    assert open(str(tmp_path / 'single.gbr')).read().count('%ADD') == 1
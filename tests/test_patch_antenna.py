@@ -26,13 +26,13 @@ def test_thickness_limit():
     assert execinfo.value.args[0] == 'Thickness value should be in greater than 0 and smaller or equals 1 meter'
 
 
-def test_type():
+def test_type(tmp_path):
 
     with pytest.raises(ValueError) as execinfo:
         freq = 2.4 * 10 ** 9
         er = 4.4
         h = 1.6 * 10 ** -3
-        pa.write_gerber(freq, er, h, 'test.gbr', "dummy")
+        pa.write_gerber(freq, er, h, str(tmp_path / 'test.gbr'), "dummy")
     assert execinfo.value.args[0] == 'Type should be : inset, normal'
 
 
@@ -44,29 +44,29 @@ def test_design_string():
     assert isinstance(result, str)
 
 
-def test_gerber():
+def test_gerber(tmp_path):
     freq = 2.4 * 10 ** 9
     er = 4.4
     h = 1.6 * 10 ** -3
-    pa.write_gerber(freq, er, h, 'test.gbr', "normal")
+    pa.write_gerber(freq, er, h, str(tmp_path / 'test.gbr'), "normal")
     assert True
 
 
-def test_gerber2():
+def test_gerber2(tmp_path):
     freq = 2.4 * 10 ** 9
     er = 4.4
     h = 1.6 * 10 ** -3
     pa_design = pa.design(freq, er, h)
-    pa.write_gerber_design(pa_design, "test1.gbr", feed_type="normal")
+    pa.write_gerber_design(pa_design, str(tmp_path / "test1.gbr"), feed_type="normal")
     assert True
 
 
-def test_gerber_inset():
+def test_gerber_inset(tmp_path):
     freq = 2.4 * 10 ** 9
     er = 4.4
     h = 1.6 * 10 ** -3
     pa_design = pa.design(freq, er, h)
-    pa.write_gerber_design(pa_design, "test1.gbr", feed_type="inset")
+    pa.write_gerber_design(pa_design, str(tmp_path / "test1.gbr"), feed_type="inset")
     assert True
 
 
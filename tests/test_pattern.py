@@ -0,0 +1,65 @@
+from math import asin, degrees, pi
+
+import numpy as np
+import pytest
+
+import patch_antenna as pa
+from patch_antenna import pattern
+
+
+def _closed_form_directivity(design):
+    k0 = design.get_k()
+    return 2 * (k0 * design.patch_width) ** 2 / (120 * pi ** 2 * (design.getG1() + design.getG12()))
+
+
+@pytest.mark.parametrize('freq, er, h', [(2.4e9, 4.4, 1.6e-3), (1.575e9, 2.2, 0.8e-3), (10e9, 9.8, 0.635e-3)])
+def test_directivity_matches_slot_conductances(freq, er, h):
+    design = pa.design(freq, er, h, engine='fast')
+    expected = _closed_form_directivity(design)
+    assert design.radiation_pattern().directivity() == pytest.approx(expected, rel=1e-4)
+    metrics = pa.pattern_metrics([design])
+    assert metrics['directivity'][0] == pytest.approx(expected, rel=1e-4)
+    assert metrics['directivity_dbi'][0] == pytest.approx(10 * np.log10(expected), abs=1e-3)
+
+
+def test_beamwidths():
+    design = pa.design(2.4e9, 2.2, 1.6e-3, engine='fast')
+    k0l = design.get_k() * design.patch_length
+    metrics = pa.pattern_metrics([design])
+    # E-plane power is cos^2(k0 L / 2 sin(theta))
+    assert metrics['e_plane_beamwidth'][0] == pytest.approx(2 * degrees(asin(pi / (2 * k0l))), abs=0.05)
+    fine = pa.pattern_metrics([design], step=0.05)
+    assert metrics['h_plane_beamwidth'][0] == pytest.approx(fine['h_plane_beamwidth'][0], abs=0.05)
+
+    # A thin FR4 patch stays above half power down to the ground plane in the E-plane
+    assert pa.pattern_metrics([pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')])['e_plane_beamwidth'][0] == 180
+
+    angles, power = pattern.h_plane(design)
+    assert power[angles == 0][0] == pytest.approx(1.0)
+    assert np.allclose(power, power[::-1])
+    assert power[0] == pytest.approx(0.0, abs=1e-30)
+
+
+def test_pattern_metrics_vectorized_over_tables():
+    batch = pa.design_batch(np.linspace(1e9, 10e9, 40)[:, None], np.array([2.2, 3.38, 4.4, 9.8]), 1.6e-3,
+                            engine='fast')
+    table = pa.DesignTable.from_batch(batch)
+    metrics = pattern.pattern_metrics(table, step=2.0)
+    assert metrics['directivity'].shape == (len(table),)
+    for i in (0, 57, len(table) - 1):
+        row = table[i]
+        single = pattern.RadiationPattern(row.freq * 2 * pi / pa.designer.light_velocity * row.patch_width,
+                                          row.freq * 2 * pi / pa.designer.light_velocity * row.patch_length,
+                                          *pattern.angle_grid(2.0, theta_max=90.0))
+        assert metrics['directivity'][i] == pytest.approx(single.directivity(), rel=1e-9)
+    pattern_3d = pa.radiation_pattern(table[0], theta=np.arange(0, 181, 5), phi=np.arange(0, 361, 5))
+    assert pattern_3d.power.shape == (37, 73)
+    assert pattern_3d.power[19:].max() == 0
+    assert pattern_3d.power_db().max() == 0
+
+
+def test_failed_designs_have_no_beamwidth():
+    metrics = pa.pattern_metrics(pa.design_batch([2.4e9, 1e3], 4.4, 1.6e-3, engine='fast'))
+    assert metrics['e_plane_beamwidth'][0] == 180
+    assert np.isnan(metrics['e_plane_beamwidth'][1]) and np.isnan(metrics['h_plane_beamwidth'][1])
+    assert np.isnan(metrics['directivity'][1])
@@ -0,0 +1,52 @@
+import warnings
+
+import patch_antenna as pa
+from patch_antenna import profiling
+
+
+def test_disabled_by_default():
+    assert pa.profiling_stats() is None
+
+
+def test_stages_and_quad_counters():
+    with profiling.profile() as profiler:
+        design = pa.design(2.4e9, 4.4, 1.6e-3, engine='quad')
+        pa.write_gerber_design(design)
+    assert profiling.get_profiler() is None
+
+    stats = profiler.stats()
+    assert set(stats['stages']) == {'set_length_width_e_eff', 'set_feeder_width_length',
+                                    'getG1', 'getG12', 'dumps_gerber'}
+    assert all(s['calls'] == 1 and s['total_s'] > 0 for s in stats['stages'].values())
+    quad = stats['quad']
+    assert (quad['Si']['calls'], quad['G12']['calls']) == (1, 1)
+    # One J0 quadrature per outer G12 integrand evaluation
+    assert quad['J0']['calls'] == quad['G12']['neval']
+    assert quad['Si']['neval'] > 0 and quad['G12']['warnings'] == 0
+    assert 'getG12' in profiler.format_stats()
+
+
+def test_fast_engine_makes_no_quad_calls():
+    profiler = pa.enable_profiling()
+    try:
+        pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')
+        assert pa.profiling_stats()['quad'] == {}
+        assert pa.profiling_stats()['stages']['getG12']['calls'] == 1
+    finally:
+        assert pa.disable_profiling() is profiler
+
+
+def test_quad_warnings_recorded_and_still_issued():
+    def issued(fn):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            fn()
+        return len(caught)
+
+    plain = issued(lambda: pa.conductance.quad_g12(3, 300))
+    with profiling.profile() as profiler:
+        profiled = issued(lambda: pa.conductance.quad_g12(3, 300))
+    assert profiled == plain > 0
+    stats = profiler.stats()
+    assert stats['quad']['G12']['warnings'] == 1
+    assert stats['warnings'] and len(stats['warnings']) <= profiling.MAX_WARNINGS
@@ -0,0 +1,37 @@
+import pytest
+
+import patch_antenna as pa
+from patch_antenna import scaled
+from patch_antenna.store import FIELDS
+
+
+@pytest.fixture(autouse=True)
+def fresh_kernels():
+    scaled.clear_kernel_cache()
+    yield
+    scaled.clear_kernel_cache()
+
+
+@pytest.mark.parametrize('engine', ['quad', 'fast'])
+def test_matches_design(engine):
+    direct = pa.design(2.4e9, 4.4, 1.6e-3, engine=engine)
+    rescaled = pa.design_scaled(2.4e9, 4.4, 1.6e-3, engine=engine)
+    for name in FIELDS:
+        assert getattr(rescaled, name) == pytest.approx(getattr(direct, name), rel=1e-10)
+    assert rescaled.engine == engine
+
+
+def test_kernel_shared_across_equal_thickness_frequency():
+    low = pa.design_scaled(1.2e9, 3.48, 1.524e-3, engine='fast')
+    high = pa.design_scaled(2.4e9, 3.48, 0.762e-3, engine='fast')
+    stats = scaled.kernel_cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert high.input_impedance == low.input_impedance
+    assert high.patch_width == pytest.approx(low.patch_width / 2, rel=1e-14)
+    pa.design_scaled(2.4e9, 4.4, 0.762e-3, engine='fast')
+    assert scaled.kernel_cache_stats()['misses'] == 2
+
+
+def test_range_checks():
+    with pytest.raises(ValueError):
+        pa.design_scaled(1e3, 4.4, 1.6e-3)
@@ -0,0 +1,81 @@
+import sqlite3
+
+import numpy as np
+import patch_antenna as pa
+import pytest
+from patch_antenna import store
+
+
+@pytest.fixture
+def design_store(tmp_path):
+    path = str(tmp_path / 'designs.sqlite')
+    yield pa.store.enable_design_store(path)
+    pa.disable_design_store()
+
+
+def test_store_disabled_by_default():
+    assert pa.design_store_stats() is None
+
+
+def test_design_round_trip(design_store):
+    first = pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')
+    assert pa.design_store_stats()['misses'] == 1
+
+    # A second store on the same file, as another process would open it
+    reopened = store.DesignStore(design_store.path)
+    stored = reopened.get(2.4e9, 4.4, 1.6e-3, 'fast')
+    for name in store.FIELDS:
+        assert getattr(stored, name) == getattr(first, name)
+    assert stored.engine == 'fast'
+    assert reopened.get(2.4e9, 4.4, 1.6e-3, 'quad') is None
+
+    again = pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')
+    assert pa.design_store_stats()['hits'] == 1
+    assert again.input_impedance == first.input_impedance
+
+
+def test_batch_uses_store(design_store):
+    freqs = np.array([1e9, 2e9, 3e9, 1e3])
+    first = pa.design_batch(freqs, 4.4, 1.6e-3)
+    assert pa.design_store_stats()['rows'] == 3
+    second = pa.design_batch(freqs[::-1], 4.4, 1.6e-3)
+    assert pa.design_store_stats()['hits'] == 3
+    np.testing.assert_array_equal(second.input_impedance[::-1], first.input_impedance)
+    single = pa.design(2e9, 4.4, 1.6e-3, engine='fast')
+    assert single.input_impedance == first.input_impedance[1]
+
+
+def test_batch_does_not_store_unmatched_rows(design_store, monkeypatch):
+    # Edge impedance below 50 Ohm: no inset match, so design() would raise
+    monkeypatch.setattr(pa.batch, 'evaluate_impedance', lambda k0w, k0l, engine: np.full(np.shape(k0w), 30.0))
+    result = pa.design_batch(np.array([2e9, 3e9]), 4.4, 1.6e-3)
+    assert np.isnan(result.inset_length).all()
+    assert pa.design_store_stats()['rows'] == 0
+    assert design_store.get(2e9, 4.4, 1.6e-3, 'fast') is None
+
+    def set_input_impedance(self):
+        self.input_impedance = 30.0
+
+    monkeypatch.setattr(pa.DesignPatch, 'set_input_impedance', set_input_impedance)
+    with pytest.raises(ValueError):
+        pa.design(2e9, 4.4, 1.6e-3, engine='fast')
+
+
+def test_engine_version_and_pruning(design_store, monkeypatch):
+    for freq in (1e9, 2e9, 3e9, 4e9):
+        pa.design(freq, 4.4, 1.6e-3, engine='fast')
+    assert design_store.prune(max_rows=3) == 1
+    assert design_store.get(1e9, 4.4, 1.6e-3, 'fast') is None
+
+    monkeypatch.setitem(pa.conductance.ENGINE_VERSIONS, 'fast', 2)
+    assert design_store.get(2e9, 4.4, 1.6e-3, 'fast') is None
+    assert design_store.prune() == 3
+    assert len(design_store) == 0
+
+
+def test_schema_version_rebuilds(tmp_path):
+    path = str(tmp_path / 'designs.sqlite')
+    store.DesignStore(path).put(pa.design(2.4e9, 4.4, 1.6e-3, engine='fast'))
+    with sqlite3.connect(path) as connection:
+        connection.execute("UPDATE meta SET value = '0' WHERE name = 'schema_version'")
+    assert len(store.DesignStore(path)) == 0
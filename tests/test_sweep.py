@@ -0,0 +1,48 @@
+import patch_antenna as pa
+import pytest
+
+
+def test_sweep_product_order():
+    result = pa.sweep(['GPS_L1', 2.4e9], ['FR4', 'PTFE'], [0.8, 1.6], engine='fast', workers=1)
+    assert len(result) == 8
+    assert [(r.band, r.material, r.thickness_mm) for r in result[:4]] == [
+        ('GPS_L1', 'FR4', 0.8), ('GPS_L1', 'FR4', 1.6), ('GPS_L1', 'PTFE', 0.8), ('GPS_L1', 'PTFE', 1.6)]
+    row = result[5]
+    expected = pa.design_with_material(2.4e9, 'FR4', 1.6, engine='fast')
+    assert row.design.input_impedance == expected.input_impedance
+    assert row.design.thickness_mm == 1.6
+    assert row.design.material.name == 'FR4'
+
+
+def test_sweep_material_thickness_options():
+    result = pa.sweep('WIFI_5GHZ', 'ALUMINA', engine='fast', workers=1)
+    assert [r.thickness_mm for r in result] == [0.25, 0.635, 1.0]
+
+
+def test_sweep_captures_row_errors():
+    result = pa.sweep([2.4e9, 200e9], 'FR4', [1.6], engine='fast', workers=1)
+    assert result[0].error is None
+    assert result[1].design is None
+    assert result[1].error == 'ValueError: Frequency value should be in between 1MHz to 100 GHz'
+    assert len(result.to_table()) == 1
+
+
+def test_sweep_process_pool_matches_serial():
+    serial = pa.sweep(['GPS_L1', 'UWB'], thicknesses=[1.6], engine='fast', workers=1)
+    parallel = pa.sweep(['GPS_L1', 'UWB'], thicknesses=[1.6], engine='fast', workers=2, chunk_size=3)
+    assert [r.design.patch_width for r in serial] == [r.design.patch_width for r in parallel]
+
+
+def test_sweep_unknown_band():
+    with pytest.raises(ValueError):
+        pa.sweep('NOT_A_BAND')
+
+
+def test_sweep_function_and_module_imports():
+    import types
+
+    import patch_antenna.sweeps as sweeps
+    from patch_antenna import sweep
+
+    assert isinstance(sweeps, types.ModuleType)
+    assert sweep is sweeps.sweep and pa.sweep is sweeps.sweep
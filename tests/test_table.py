@@ -0,0 +1,35 @@
+import patch_antenna as pa
+from patch_antenna.table import DesignTable
+import numpy as np
+import pytest
+
+
+def test_slots():
+    design = pa.design(2.4e9, 4.4, 1.6e-3)
+    assert not hasattr(design, '__dict__')
+    assert design.material is None
+    assert not hasattr(pa.design_result(2.4e9, 4.4, 1.6e-3), '__dict__')
+
+
+def test_table_round_trip():
+    designs = [pa.design(f, 4.4, 1.6e-3, engine='fast') for f in (1e9, 2e9, 3e9)]
+    table = DesignTable.from_designs(designs)
+    assert len(table) == 3
+    assert table.nbytes == 3 * 112
+    assert table['patch_width'][1] == designs[1].patch_width
+    assert table[2].input_impedance == designs[2].input_impedance
+    rebuilt = table.to_design(0)
+    assert rebuilt.patch_lengthl_eff == pytest.approx(designs[0].patch_lengthl_eff)
+    assert rebuilt.get_result().as_dict() == designs[0].get_result().as_dict()
+
+
+def test_table_from_batch_slicing_filtering():
+    batch = pa.design_batch(np.linspace(1e9, 10e9, 10), [[2.1], [4.4]], 1.6e-3)
+    table = DesignTable.from_batch(batch, dtype=np.float32)
+    assert len(table) == 20
+    assert table.nbytes == 20 * 60
+    assert len(table[5:8]) == 3
+    wide = table.filter(table['patch_width'] > 0.03)
+    assert len(wide) > 0
+    assert (wide['patch_width'] > 0.03).all()
+    assert wide.column('wavelength')[0] == pytest.approx(299792458 / wide['freq'][0])
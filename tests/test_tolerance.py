@@ -0,0 +1,43 @@
+import patch_antenna as pa
+from patch_antenna.tolerance import tolerance_analysis
+import pytest
+
+
+def test_zero_tolerance_reproduces_design():
+    design = pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')
+    report = tolerance_analysis(design, samples=10, patch_tolerance=0, inset_tolerance=0,
+                                er_tolerance=0, h_tolerance=0)
+    assert report.resonant_frequency == pytest.approx(2.4e9, rel=1e-12)
+    assert report.input_impedance == pytest.approx(50, rel=1e-9)
+    assert report.yield_fraction == 1.0
+
+
+def test_yield_is_reproducible_and_tightens_with_bandwidth():
+    design = pa.design(2.4e9, 4.4, 1.6e-3)
+    wide = tolerance_analysis(design, samples=5000, bandwidth=200e6, engine='fast', seed=7)
+    narrow = tolerance_analysis(design, samples=5000, bandwidth=5e6, engine='fast', seed=7)
+    assert wide.summary() == tolerance_analysis(design, samples=5000, bandwidth=200e6, engine='fast',
+                                                seed=7).summary()
+    assert narrow.yield_fraction < wide.yield_fraction
+    assert 0 <= narrow.match_yield <= 1
+
+
+def test_engine_defaults_to_global_engine():
+    design = pa.design(2.4e9, 4.4, 1.6e-3)
+    default = tolerance_analysis(design, samples=20, seed=3)
+    quad = tolerance_analysis(design, samples=20, engine='quad', seed=3)
+    assert default.edge_impedance.tolist() == quad.edge_impedance.tolist()
+    pa.set_default_engine('fast')
+    try:
+        fast = tolerance_analysis(design, samples=20, seed=3)
+    finally:
+        pa.set_default_engine('quad')
+    assert fast.edge_impedance.tolist() == tolerance_analysis(design, samples=20, engine='fast',
+                                                              seed=3).edge_impedance.tolist()
+
+
+def test_unknown_distribution():
+    design = pa.design(2.4e9, 4.4, 1.6e-3)
+    with pytest.raises(ValueError) as execinfo:
+        tolerance_analysis(design, distribution='dummy')
+    assert execinfo.value.args[0] == 'Distribution should be : normal, uniform'
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+import patch_antenna as pa
+from patch_antenna import validation
+from patch_antenna.validation import ValidationRules, rule_names
+
+
+def test_validate_design_messages_unchanged():
+    design = SimpleNamespace(patch_width=5e-3, patch_length=2e-3, wavelength=0.1, e_eff=4.0, h=6e-3,
+                             feeder_width=0.05e-3, input_impedance=73.25)
+    assert pa.validate_design(design) == [
+        "Warning: Patch width/length ratio > 2.0 may reduce efficiency",
+        "Warning: Substrate thickness > λ/10 may cause surface waves",
+        "Warning: Feeder width < 0.1mm may be difficult to manufacture",
+        "Warning: Input impedance (73.2Ohm) deviates significantly from 50Ohm",
+    ]
+    assert ValidationRules().check(design) == validation.ALL_RULES
+    thick = pa.design(10e9, 2.2, 3e-3, engine='fast')
+    assert rule_names(ValidationRules().check(thick)) == ['thick_substrate', 'impedance_mismatch']
+
+
+def test_evaluate_matches_single_design_checks():
+    freqs = np.linspace(1e9, 40e9, 25)[:, None, None]
+    ers = np.array([2.2, 4.4, 9.8])[None, :, None]
+    hs = np.array([0.2e-3, 1.6e-3, 6e-3])[None, None, :]
+    batch = pa.design_batch(freqs, ers, hs, engine='fast')
+    table = pa.DesignTable.from_batch(batch)
+    rules = ValidationRules(min_feature_size=0.5e-3, target_impedance=200, impedance_tolerance=50)
+
+    codes = rules.evaluate(table)
+    assert codes.dtype == np.uint32
+    assert list(codes) == [rules.check(row) for row in table]
+    assert len(set(codes.tolist())) > 3
+    assert list(rules.evaluate(batch)[batch.valid.ravel()]) == list(codes)
+
+    counts = rules.counts(codes)
+    assert counts['narrow_feeder'] == int(np.count_nonzero(table['feeder_width'] < 0.5e-3))
+    assert list(validation.validate_designs(table)) == [ValidationRules().check(row) for row in table]
+
+
+def test_rules_configuration_and_rendering():
+    design = pa.design(2.4e9, 4.4, 1.6e-3, engine='fast')
+    default_code = ValidationRules().check(design)
+    assert default_code & validation.IMPEDANCE_MISMATCH
+    matched = ValidationRules(target_impedance=round(design.input_impedance), impedance_tolerance=5)
+    assert not matched.check(design) & validation.IMPEDANCE_MISMATCH
+
+    fab = ValidationRules(min_feature_size=10e-3, enabled=validation.NARROW_FEEDER)
+    assert fab.check(design) == validation.NARROW_FEEDER
+    assert pa.validate_design(design, fab) == ["Warning: Feeder width < 10mm may be difficult to manufacture"]
+    assert rule_names(validation.ALL_RULES) == [name for _, name in validation.RULES]
+
+
+def test_failed_rows_are_invalid():
+    batch = pa.design_batch([2.4e9, 1e3], 4.4, 1.6e-3, engine='fast')
+    codes = ValidationRules().evaluate(batch)
+    assert not codes[0] & validation.INVALID
+    assert codes[1] == validation.INVALID
+    assert ValidationRules(enabled=validation.NARROW_FEEDER).evaluate(batch)[1] == validation.INVALID
+    assert rule_names(codes[1]) == ['invalid']
+    assert ValidationRules().counts(codes)['invalid'] == 1
+
+    failed = SimpleNamespace(patch_width=float('nan'), patch_length=2e-3, wavelength=0.1, e_eff=4.0, h=1e-3,
+                             feeder_width=1e-3, input_impedance=50.0)
+    assert pa.validate_design(failed) == ["Warning: Design has undefined (NaN) values and could not be validated"]